@@ -13,24 +13,48 @@ Usage:
 
 import argparse
 import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime, time
 import json
 import logging
+import os
 from pathlib import Path
+import sys
+from zoneinfo import ZoneInfo
 
-import ccxt
-import pandas as pd
-import pytz
+import ccxt.async_support as ccxt_async
+import numpy as np
+from numpy.typing import ArrayLike
+
+from utils._njit import njit
+from utils.indicators_njit import bb_njit, ema_njit, macd_njit, rsi_njit
 
 # Signal logging for accuracy tracking
 try:
-    from signal_logger import log_signal
+    from signal_logger import log_signals_bulk, signal_row
 
     SIGNAL_LOGGING = True
 except ImportError:
     SIGNAL_LOGGING = False
-    log_signal = None
+    log_signals_bulk = signal_row = None
+
+# orjson parses config files several times faster than the stdlib
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# uvloop (not available on Windows) is a faster drop-in event loop
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 # Try importing yfinance for stocks
 try:
@@ -49,46 +73,111 @@ log = logging.getLogger("AdaptiveScanner")
 # ============== TECHNICAL INDICATORS ==============
 
 
-def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
+def _as_float_array(prices: ArrayLike) -> np.ndarray:
+    """Contiguous float64 array from any 1-D price series (numpy, pandas, polars)."""
+    return np.ascontiguousarray(np.asarray(prices, dtype=np.float64))
+
+
+def calculate_rsi(prices: ArrayLike, period: int = 14) -> np.ndarray:
     """Calculate RSI indicator."""
-    deltas = prices.diff()
-    gains = deltas.where(deltas > 0, 0.0)
-    losses = -deltas.where(deltas < 0, 0.0)
-    avg_gain = gains.rolling(window=period).mean()
-    avg_loss = losses.rolling(window=period).mean()
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+    return rsi_njit(_as_float_array(prices), period)
 
 
-def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
+def calculate_ema(prices: ArrayLike, period: int) -> np.ndarray:
     """Calculate EMA."""
-    return prices.ewm(span=period, adjust=False).mean()
+    return ema_njit(_as_float_array(prices), period)
 
 
 def calculate_bollinger_bands(
-    prices: pd.Series, period: int = 20, std_dev: float = 2.0
-):
+    prices: ArrayLike, period: int = 20, std_dev: float = 2.0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Calculate Bollinger Bands."""
-    sma = prices.rolling(window=period).mean()
-    std = prices.rolling(window=period).std()
-    upper = sma + (std_dev * std)
-    lower = sma - (std_dev * std)
-    return upper, sma, lower
-
-
-def calculate_macd(prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9):
-    """Calculate MACD."""
-    ema_fast = calculate_ema(prices, fast)
-    ema_slow = calculate_ema(prices, slow)
-    macd_line = ema_fast - ema_slow
-    signal_line = calculate_ema(macd_line, signal)
-    return macd_line, signal_line
+    return bb_njit(_as_float_array(prices), period, std_dev)
+
+
+def _rsi_tail_averages(close: np.ndarray, period: int) -> tuple[float, float]:
+    """Average gain and loss over the last ``period`` deltas."""
+    deltas = np.diff(close[-(period + 1) :])
+    avg_gain = float(deltas[deltas > 0].sum()) / period
+    avg_loss = float(-deltas[deltas < 0].sum()) / period
+    return avg_gain, avg_loss
+
+
+def calculate_rsi_tail_batch(
+    closes: list[np.ndarray], period: int = 14, dtype: type = np.float32
+) -> np.ndarray:
+    """Last-candle RSI for many series in one pass.
+
+    Each series is cut to its last ``period + 1`` closes and stacked into an
+    ``(S, period + 1)`` array, so every symbol shares the same numpy calls.
+    The stack is float32 by default, which halves the memory traffic and is
+    far more precision than a one-decimal RSI needs. Series that are too
+    short get NaN.
+    """
+    out = np.full(len(closes), np.nan)
+    rows = [i for i, close in enumerate(closes) if len(close) >= period + 1]
+    if not rows:
+        return out
+
+    window = np.stack([closes[i][-(period + 1) :] for i in rows], dtype=dtype)
+    deltas = np.diff(window, axis=1)
+    avg_gain = np.where(deltas > 0, deltas, 0.0).sum(axis=1) / period
+    avg_loss = np.where(deltas < 0, -deltas, 0.0).sum(axis=1) / period
+    total = avg_gain + avg_loss
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[rows] = np.where(total > 0, 100.0 * avg_gain / total, np.nan)
+    return out
+
+
+def get_ema(
+    close: np.ndarray, period: int, ema_cache: dict[int, np.ndarray] | None = None
+) -> np.ndarray:
+    """EMA of ``close``, memoized by period in ``ema_cache`` when given."""
+    if ema_cache is None:
+        return ema_njit(close, period)
+    if period not in ema_cache:
+        ema_cache[period] = ema_njit(close, period)
+    return ema_cache[period]
+
+
+def calculate_macd(
+    prices: ArrayLike,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    ema_cache: dict[int, np.ndarray] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate MACD.
+
+    With ``ema_cache`` the fast/slow EMAs are shared with any other EMA of
+    the same period computed over the same prices.
+    """
+    close = _as_float_array(prices)
+    if ema_cache is None:
+        macd_line, signal_line, _hist = macd_njit(close, fast, slow, signal)
+        return macd_line, signal_line
+
+    macd_line = get_ema(close, fast, ema_cache) - get_ema(close, slow, ema_cache)
+    return macd_line, ema_njit(macd_line, signal)
 
 
 # ============== OPPORTUNITY ==============
 
+# Signal ranks, doubling as the compact uint8 signal encoding for scan results.
+# Lower ranks display first; RANK_SELL and below are actionable.
+RANK_BUY, RANK_SELL, RANK_WATCH, RANK_SLEEPING, RANK_WAIT, RANK_DISABLED = range(6)
+RANK_OTHER = 6
+SIGNAL_RANKS = {
+    "BUY": RANK_BUY,
+    "SELL": RANK_SELL,
+    "WATCH": RANK_WATCH,
+    "SLEEPING": RANK_SLEEPING,
+    "WAIT": RANK_WAIT,
+    "DISABLED": RANK_DISABLED,
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class Opportunity:
     """Trading opportunity."""
 
@@ -103,6 +192,174 @@ class Opportunity:
     timestamp: datetime
 
 
+@dataclass(slots=True)
+class ScanResults:
+    """One scan's opportunities plus their ranking columns as parallel arrays."""
+
+    opportunities: list[Opportunity]
+    ranks: np.ndarray  # uint8 signal rank per opportunity
+    strengths: np.ndarray  # uint8
+    prices: np.ndarray  # float64
+
+    @classmethod
+    def from_opportunities(cls, opportunities: list[Opportunity]) -> "ScanResults":
+        n = len(opportunities)
+        ranks = np.empty(n, np.uint8)
+        strengths = np.empty(n, np.uint8)
+        prices = np.empty(n, np.float64)
+        for i, opp in enumerate(opportunities):
+            ranks[i] = SIGNAL_RANKS.get(opp.signal, RANK_OTHER)
+            strengths[i] = opp.strength
+            prices[i] = opp.price
+        return cls(opportunities, ranks, strengths, prices)
+
+    def order(self) -> np.ndarray:
+        """Indices sorted by signal rank, then by descending strength."""
+        return np.lexsort((-self.strengths.astype(np.int16), self.ranks))
+
+    def ranked(self) -> list[Opportunity]:
+        """Opportunities in display order."""
+        return [self.opportunities[i] for i in self.order()]
+
+    def actionable(self) -> list[Opportunity]:
+        """BUY/SELL opportunities in display order."""
+        order = self.order()
+        order = order[self.ranks[order] <= RANK_SELL]
+        return [self.opportunities[i] for i in order]
+
+
+# ============== INCREMENTAL INDICATOR STATE ==============
+
+
+def _gain_loss(delta: float) -> tuple[float, float]:
+    """Split a price delta into its (gain, loss) parts."""
+    return (delta, 0.0) if delta > 0 else (0.0, -delta)
+
+
+@dataclass
+class SymbolState:
+    """Per-symbol indicator state as of the last closed candle.
+
+    The newest candle returned by the exchange is still forming, so only
+    closed candles are folded into the state. Each scan applies the forming
+    candle on top of the state without committing it.
+    """
+
+    last_ts: int
+    rsi_avg_gain: float = 0.0
+    rsi_avg_loss: float = 0.0
+    ema_fast: float = 0.0
+    ema_slow: float = 0.0
+    bb_sum: float = 0.0
+    bb_sum_sq: float = 0.0
+    macd_fast: float = 0.0
+    macd_slow: float = 0.0
+    macd_signal: float = 0.0
+
+    @classmethod
+    def seed(
+        cls, closed: np.ndarray, last_ts: int, cfg: "CompiledConfig"
+    ) -> "SymbolState":
+        """Full recompute over the closed candles (cold start or gap)."""
+        state = cls(last_ts=last_ts)
+
+        state.rsi_avg_gain, state.rsi_avg_loss = _rsi_tail_averages(
+            closed, cfg.rsi_period
+        )
+
+        if cfg.bb_period is not None:
+            window = closed[-cfg.bb_period :]
+            state.bb_sum = float(window.sum())
+            state.bb_sum_sq = float(np.dot(window, window))
+
+        # At most one EMA pass per period, shared between EMA and MACD
+        ema_cache: dict[int, np.ndarray] = {}
+        if cfg.ema_fast is not None:
+            state.ema_fast = float(get_ema(closed, cfg.ema_fast, ema_cache)[-1])
+            state.ema_slow = float(get_ema(closed, cfg.ema_slow, ema_cache)[-1])
+
+        if cfg.macd_fast is not None:
+            _macd, signal_line = calculate_macd(
+                closed, cfg.macd_fast, cfg.macd_slow, cfg.macd_signal, ema_cache
+            )
+            state.macd_fast = float(ema_cache[cfg.macd_fast][-1])
+            state.macd_slow = float(ema_cache[cfg.macd_slow][-1])
+            state.macd_signal = float(signal_line[-1])
+
+        return state
+
+    def advance(
+        self, close: np.ndarray, i: int, ts: int, cfg: "CompiledConfig"
+    ) -> None:
+        """Fold closed candle ``close[i]`` into the state in O(1)."""
+        period = cfg.rsi_period
+        gain, loss = _gain_loss(close[i] - close[i - 1])
+        old_gain, old_loss = _gain_loss(close[i - period] - close[i - period - 1])
+        self.rsi_avg_gain = max(self.rsi_avg_gain + (gain - old_gain) / period, 0.0)
+        self.rsi_avg_loss = max(self.rsi_avg_loss + (loss - old_loss) / period, 0.0)
+
+        if cfg.bb_period is not None:
+            dropped = close[i - cfg.bb_period]
+            self.bb_sum += close[i] - dropped
+            self.bb_sum_sq += close[i] * close[i] - dropped * dropped
+
+        if cfg.ema_fast is not None:
+            self.ema_fast = _ema_step(self.ema_fast, close[i], cfg.ema_fast)
+            self.ema_slow = _ema_step(self.ema_slow, close[i], cfg.ema_slow)
+
+        if cfg.macd_fast is not None:
+            self.macd_fast = _ema_step(self.macd_fast, close[i], cfg.macd_fast)
+            self.macd_slow = _ema_step(self.macd_slow, close[i], cfg.macd_slow)
+            self.macd_signal = _ema_step(
+                self.macd_signal, self.macd_fast - self.macd_slow, cfg.macd_signal
+            )
+
+        self.last_ts = ts
+
+    def current(self, close: np.ndarray, cfg: "CompiledConfig") -> dict:
+        """Indicator values with the forming candle ``close[-1]`` applied."""
+        price = close[-1]
+        values = {}
+
+        period = cfg.rsi_period
+        gain, loss = _gain_loss(price - close[-2])
+        old_gain, old_loss = _gain_loss(close[-1 - period] - close[-2 - period])
+        avg_gain = max(self.rsi_avg_gain + (gain - old_gain) / period, 0.0)
+        avg_loss = max(self.rsi_avg_loss + (loss - old_loss) / period, 0.0)
+        total = avg_gain + avg_loss
+        values["rsi"] = 100.0 * avg_gain / total if total > 0 else float("nan")
+
+        if cfg.bb_period is not None:
+            bb_period = cfg.bb_period
+            dropped = close[-1 - bb_period]
+            total_sum = self.bb_sum + price - dropped
+            total_sq = self.bb_sum_sq + price * price - dropped * dropped
+            mean = total_sum / bb_period
+            var = max((total_sq - total_sum * mean) / (bb_period - 1), 0.0)
+            width = cfg.bb_std * np.sqrt(var)
+            values["bb_upper"] = mean + width
+            values["bb_lower"] = mean - width
+
+        if cfg.ema_fast is not None:
+            values["ema_fast"] = _ema_step(self.ema_fast, price, cfg.ema_fast)
+            values["ema_slow"] = _ema_step(self.ema_slow, price, cfg.ema_slow)
+
+        if cfg.macd_fast is not None:
+            macd = _ema_step(self.macd_fast, price, cfg.macd_fast) - _ema_step(
+                self.macd_slow, price, cfg.macd_slow
+            )
+            values["macd"] = macd
+            values["macd_signal"] = _ema_step(self.macd_signal, macd, cfg.macd_signal)
+
+        return values
+
+
+def _ema_step(prev: float, value: float, period: int) -> float:
+    """One step of the ``adjust=False`` EMA recurrence."""
+    alpha = 2.0 / (period + 1)
+    return alpha * value + (1.0 - alpha) * prev
+
+
 # ============== DEFAULT CONFIG ==============
 
 DEFAULT_CONFIG = {
@@ -122,25 +379,212 @@ DEFAULT_CONFIG = {
 }
 
 
+# ============== SIGNAL KERNELS ==============
+
+# Signal codes returned by the strategy kernels; index into SIGNAL_NAMES
+SIGNAL_WAIT, SIGNAL_WATCH, SIGNAL_BUY, SIGNAL_SELL = 0, 1, 2, 3
+SIGNAL_NAMES = ("WAIT", "WATCH", "BUY", "SELL")
+
+# Reason bits, one per message a strategy can attach to its signal
+REASON_RSI_OVERSOLD = 1 << 0
+REASON_NEAR_LOWER_BB = 1 << 1
+REASON_RSI_OVERBOUGHT = 1 << 2
+REASON_EXTREME_OVERSOLD = 1 << 3
+REASON_OVERSOLD = 1 << 4
+REASON_OVERBOUGHT = 1 << 5
+REASON_UPTREND_MACD = 1 << 6
+REASON_TREND_REVERSAL = 1 << 7
+REASON_TREND_DEVELOPING = 1 << 8
+REASON_RSI_LOW = 1 << 9
+
+_REASON_TEXT = (
+    (REASON_RSI_OVERSOLD, "RSI oversold ({rsi:.1f})"),
+    (REASON_NEAR_LOWER_BB, "Near lower BB"),
+    (REASON_RSI_OVERBOUGHT, "RSI overbought ({rsi:.1f})"),
+    (REASON_EXTREME_OVERSOLD, "Extreme oversold ({rsi:.1f})"),
+    (REASON_OVERSOLD, "Oversold ({rsi:.1f})"),
+    (REASON_OVERBOUGHT, "Overbought ({rsi:.1f})"),
+    (REASON_UPTREND_MACD, "Uptrend + MACD bullish"),
+    (REASON_TREND_REVERSAL, "Trend reversal"),
+    (REASON_TREND_DEVELOPING, "Trend developing"),
+    (REASON_RSI_LOW, "RSI low ({rsi:.1f})"),
+)
+
+
+# Every kernel takes (rsi, bb_pos, ema_trend, macd, rsi_buy, rsi_sell) as
+# scalars and returns (signal_code, strength, reason_mask). bb_pos is NaN when
+# Bollinger Bands are not configured; ema_trend and macd are +1.0 (UP/BULL) or
+# -1.0 (DOWN/BEAR).
+_SIGNAL_SIG = "UniTuple(int64, 3)(float64, float64, float64, float64, float64, float64)"
+
+
+@njit(_SIGNAL_SIG, cache=True, nogil=True)
+def _grid_signal(rsi, bb_pos, ema_trend, macd, rsi_buy, rsi_sell):
+    """Grid: buy oversold, sell overbought."""
+    if rsi > rsi_sell:
+        return SIGNAL_SELL, 60, REASON_RSI_OVERBOUGHT
+
+    oversold = int(rsi < rsi_buy)
+    near_lower = int(bb_pos < 20.0)  # False for NaN
+    strength = 50 * oversold + 30 * near_lower
+    code = int(strength >= 40) + int(strength >= 60)  # WAIT / WATCH / BUY
+    mask = REASON_RSI_OVERSOLD * oversold | REASON_NEAR_LOWER_BB * near_lower
+    return code, strength, mask
+
+
+@njit(_SIGNAL_SIG, cache=True, nogil=True)
+def _mr_signal(rsi, bb_pos, ema_trend, macd, rsi_buy, rsi_sell):
+    """Mean reversion: extreme oversold only."""
+    extreme = int(rsi < 25.0)
+    oversold = int(rsi < 35.0) - extreme
+    overbought = int(rsi > 75.0)
+    code = SIGNAL_BUY * extreme + SIGNAL_WATCH * oversold + SIGNAL_SELL * overbought
+    strength = 80 * extreme + 50 * oversold + 70 * overbought
+    mask = (
+        REASON_EXTREME_OVERSOLD * extreme
+        | REASON_OVERSOLD * oversold
+        | REASON_OVERBOUGHT * overbought
+    )
+    return code, strength, mask
+
+
+@njit(_SIGNAL_SIG, cache=True, nogil=True)
+def _mom_signal(rsi, bb_pos, ema_trend, macd, rsi_buy, rsi_sell):
+    """Momentum: follow trend."""
+    up = int(ema_trend > 0.0)
+    buy = up * int(macd > 0.0) * int(50.0 < rsi < 70.0)
+    sell = (1 - buy) * int(up == 0 or rsi > 75.0)
+    watch = (1 - buy) * (1 - sell) * up * int(rsi > 45.0)
+    code = SIGNAL_BUY * buy + SIGNAL_SELL * sell + SIGNAL_WATCH * watch
+    strength = 65 * buy + 55 * sell + 40 * watch
+    mask = (
+        REASON_UPTREND_MACD * buy
+        | REASON_TREND_REVERSAL * sell
+        | REASON_TREND_DEVELOPING * watch
+    )
+    return code, strength, mask
+
+
+def _stock_signals(rsi: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """RSI-only stock rules over one RSI per symbol, as whole-array masks."""
+    buy = rsi < 30
+    watch = (rsi >= 30) & (rsi < 40)
+    sell = rsi > 70
+    code = SIGNAL_BUY * buy + SIGNAL_WATCH * watch + SIGNAL_SELL * sell
+    strength = 70 * buy + 45 * watch + 60 * sell
+    mask = REASON_OVERSOLD * buy | REASON_RSI_LOW * watch | REASON_OVERBOUGHT * sell
+    return code, strength, mask
+
+
+STRATEGY_FNS = {
+    "grid": _grid_signal,
+    "mean_reversion": _mr_signal,
+    "momentum": _mom_signal,
+}
+
+# Indicators each strategy's kernel actually reads; the rest are never computed
+REQUIRED_INDICATORS = {
+    "grid": {"rsi", "bb"},
+    "mean_reversion": {"rsi"},
+    "momentum": {"rsi", "ema", "macd"},
+}
+
+
+def decode_reasons(mask: int, rsi: float) -> list[str]:
+    """Expand a reason mask into display strings."""
+    return [text.format(rsi=rsi) for bit, text in _REASON_TEXT if mask & bit]
+
+
+# ============== COMPILED CONFIG ==============
+
+
+@dataclass(slots=True, frozen=True)
+class CompiledConfig:
+    """A symbol's optimal config resolved once into typed fields.
+
+    Indicator periods are None when the config does not set that indicator
+    or the strategy never reads it (see REQUIRED_INDICATORS), so scans skip
+    it entirely. ``signal_fn`` is the strategy's signal kernel, or None for an
+    unknown strategy (which always reads WAIT).
+    """
+
+    timeframe: str
+    strategy: str
+    signal_fn: Callable | None
+    rsi_period: int
+    rsi_buy: float
+    rsi_sell: float
+    bb_period: int | None
+    bb_std: float
+    ema_fast: int | None
+    ema_slow: int | None
+    macd_fast: int | None
+    macd_slow: int | None
+    macd_signal: int | None
+    lookback: int  # Closed candles needed before a single-bar update is possible
+
+    @classmethod
+    def from_config(cls, config: dict) -> "CompiledConfig":
+        params = config.get("params", DEFAULT_CONFIG["params"])
+        strategy = config.get("strategy", "grid")
+        required = REQUIRED_INDICATORS.get(strategy, {"rsi"})
+        rsi_period = params.get("rsi_period", 14)
+        bb_period = params.get("bb_period") if "bb" in required else None
+        has_ema = "ema_fast" in params and "ema" in required
+        has_macd = "macd_fast" in params and "macd" in required
+
+        lookback = rsi_period + 1
+        if bb_period is not None:
+            lookback = max(lookback, bb_period)
+
+        return cls(
+            timeframe=config.get("best_timeframe", "30m"),
+            strategy=strategy,
+            signal_fn=STRATEGY_FNS.get(strategy),
+            rsi_period=rsi_period,
+            rsi_buy=float(params.get("rsi_buy", 35)),
+            rsi_sell=float(params.get("rsi_sell", 65)),
+            bb_period=bb_period,
+            bb_std=params.get("bb_std", 2.0),
+            ema_fast=params["ema_fast"] if has_ema else None,
+            ema_slow=params["ema_slow"] if has_ema else None,
+            macd_fast=params["macd_fast"] if has_macd else None,
+            macd_slow=params["macd_slow"] if has_macd else None,
+            macd_signal=params["macd_signal"] if has_macd else None,
+            lookback=lookback,
+        )
+
+
 # ============== ADAPTIVE SCANNER ==============
 
 
+def _load_json(path: str | Path):
+    """Parse a JSON file, with orjson when it is installed."""
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
 class AdaptiveScanner:
     """Scans multiple assets using their optimal configurations."""
 
+    ET = ZoneInfo("America/New_York")
+    MARKET_OPEN = time(9, 30)
+    MARKET_CLOSE = time(16, 0)
+
     def __init__(
         self, watchlist_file: str | None = None, configs_file: str | None = None
     ):
-        self.exchange = ccxt.kraken()
-        self.et_tz = pytz.timezone("US/Eastern")
+        self.exchange = ccxt_async.kraken({"enableRateLimit": True})
+        self._sem = asyncio.Semaphore(10)  # Max in-flight exchange requests
+        # Full indicator recomputes run here; the njit kernels release the GIL
+        self._cpu_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
 
         # Load watchlist
         watchlist_path = (
             watchlist_file or Path(__file__).parent / "config" / "watchlist.json"
         )
         if Path(watchlist_path).exists():
-            with open(watchlist_path) as f:
-                data = json.load(f)
+            data = _load_json(watchlist_path)
             self.crypto_watchlist = data.get("crypto", [])
             self.stock_watchlist = data.get("stocks", [])
         else:
@@ -153,157 +597,191 @@ class AdaptiveScanner:
             or Path(__file__).parent / "optimization" / "optimal_configs.json"
         )
         if Path(configs_path).exists():
-            with open(configs_path) as f:
-                self.configs = json.load(f)
+            self.configs = _load_json(configs_path)
         else:
             self.configs = {}
+        self.compiled = {
+            symbol: CompiledConfig.from_config(config)
+            for symbol, config in self.configs.items()
+        }
+        self._default_compiled = CompiledConfig.from_config(DEFAULT_CONFIG)
 
         self.scan_interval = 60  # seconds
+        self.state: dict[str, SymbolState] = {}
+        # (symbol, timeframe) -> (forming candle ts, OHLCV array)
+        self._ohlcv_cache: dict[tuple[str, str], tuple[int, np.ndarray]] = {}
+        # yfinance shares one HTTP session across all Tickers; keep the Ticker
+        # objects so their metadata is not rebuilt every scan
+        self._tickers: dict = {}
 
     def get_config(self, symbol: str) -> dict:
         """Get optimal config for symbol, or default if not optimized."""
         return self.configs.get(symbol, DEFAULT_CONFIG)
 
-    def fetch_data(self, symbol: str, timeframe: str, limit: int = 100) -> pd.DataFrame:
-        """Fetch OHLCV data for symbol."""
+    def get_compiled_config(self, symbol: str) -> CompiledConfig:
+        """Pre-resolved config for symbol, or the default if not optimized."""
+        return self.compiled.get(symbol, self._default_compiled)
+
+    async def close(self):
+        """Release the exchange's HTTP session and the CPU pool."""
+        await self.exchange.close()
+        self._cpu_pool.shutdown(wait=False)
+
+    async def fetch_data(
+        self, symbol: str, timeframe: str, limit: int = 100
+    ) -> np.ndarray:
+        """Fetch OHLCV candles for symbol as an (N, 6) float64 array.
+
+        Closed candles are cached per (symbol, timeframe) and only the forming
+        candle is refetched until a new bucket opens.
+        """
+        key = (symbol, timeframe)
+        tf_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        bucket_ts = self.exchange.milliseconds() // tf_ms * tf_ms
+        cached = self._ohlcv_cache.get(key)
+
         try:
-            candles = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            df = pd.DataFrame(
-                candles, columns=["timestamp", "open", "high", "low", "close", "volume"]
-            )
-            return df
+            async with self._sem:
+                if cached is not None and cached[0] == bucket_ts:
+                    candles = await self.exchange.fetch_ohlcv(
+                        symbol, timeframe, since=bucket_ts, limit=1
+                    )
+                else:
+                    candles = await self.exchange.fetch_ohlcv(
+                        symbol, timeframe, limit=limit
+                    )
         except Exception as e:
             log.error(f"Error fetching {symbol}: {e}")
-            return pd.DataFrame()
+            return np.empty((0, 6))
+
+        if cached is not None and cached[0] == bucket_ts:
+            data = cached[1]
+            if candles and candles[-1][0] == data[-1, 0]:
+                data[-1] = candles[-1]
+            return data
+
+        data = np.asarray(candles, dtype=np.float64)
+        if len(data):
+            self._ohlcv_cache[key] = (int(data[-1, 0]), data)
+        return data
+
+    async def _indicator_state(
+        self,
+        symbol: str,
+        close: np.ndarray,
+        timestamps: np.ndarray,
+        cfg: CompiledConfig,
+    ) -> SymbolState:
+        """Bring the symbol's state up to the last closed candle.
+
+        New closed candles are folded in one at a time; a cold start, a gap
+        larger than the fetched window, or too little history falls back to
+        a full recompute.
+        """
+        closed_ts = int(timestamps[-2])
+        state = self.state.get(symbol)
+        if state is not None and state.last_ts == closed_ts:
+            return state
+
+        if state is not None:
+            hits = np.flatnonzero(timestamps[:-1] == state.last_ts)
+            if hits.size and hits[0] + 1 >= cfg.lookback:
+                for i in range(hits[0] + 1, len(close) - 1):
+                    state.advance(close, i, int(timestamps[i]), cfg)
+                return state
+
+        # Cold starts after a restart hit every symbol at once; seed them in
+        # parallel on the CPU pool instead of serially on the event loop
+        loop = asyncio.get_running_loop()
+        state = await loop.run_in_executor(
+            self._cpu_pool, SymbolState.seed, close[:-1], closed_ts, cfg
+        )
+        self.state[symbol] = state
+        return state
 
-    async def scan_crypto(self, symbol: str) -> Opportunity | None:
+    async def scan_crypto(
+        self, symbol: str, now: datetime | None = None
+    ) -> Opportunity | None:
         """Scan a single crypto asset using its optimal config."""
-        config = self.get_config(symbol)
-        timeframe = config.get("best_timeframe", "30m")
-        strategy = config.get("strategy", "grid")
-        params = config.get("params", DEFAULT_CONFIG["params"])
+        now = now or datetime.now(tz=UTC)
+        cfg = self.get_compiled_config(symbol)
 
-        df = self.fetch_data(symbol, timeframe)
-        if df.empty:
+        data = await self.fetch_data(symbol, cfg.timeframe)
+        if not len(data):
             return None
 
-        close = df["close"]
-        current_price = close.iloc[-1]
+        close = np.ascontiguousarray(data[:, 4])
+        if len(close) <= cfg.lookback + 1:
+            return None  # Not enough history for the configured indicators
+        current_price = close[-1]
 
-        # Calculate indicators
-        rsi = calculate_rsi(close, params.get("rsi_period", 14))
-        current_rsi = rsi.iloc[-1]
+        # Calculate indicators from the cached state plus the forming candle
+        state = await self._indicator_state(symbol, close, data[:, 0], cfg)
+        values = state.current(close, cfg)
+        current_rsi = values["rsi"]
 
         indicators = {"RSI": round(current_rsi, 1)}
+        bb_pos = np.nan
+        ema_trend = macd_dir = 1.0  # Read as UP / BULL when not configured
 
         # Calculate additional indicators if in config
-        if "bb_period" in params:
-            bb_upper, _bb_mid, bb_lower = calculate_bollinger_bands(
-                close, params["bb_period"], params.get("bb_std", 2.0)
-            )
-            bb_pos = (
-                (current_price - bb_lower.iloc[-1])
-                / (bb_upper.iloc[-1] - bb_lower.iloc[-1])
-            ) * 100
-            indicators["BB_pos"] = round(bb_pos, 1)
-
-        if "ema_fast" in params:
-            ema_fast = calculate_ema(close, params["ema_fast"]).iloc[-1]
-            ema_slow = calculate_ema(close, params["ema_slow"]).iloc[-1]
-            indicators["EMA_trend"] = "UP" if ema_fast > ema_slow else "DOWN"
-
-        if "macd_fast" in params:
-            macd, macd_signal = calculate_macd(
-                close, params["macd_fast"], params["macd_slow"], params["macd_signal"]
-            )
-            indicators["MACD"] = (
-                "BULL" if macd.iloc[-1] > macd_signal.iloc[-1] else "BEAR"
+        if cfg.bb_period is not None:
+            bb_pos = round(
+                (
+                    (current_price - values["bb_lower"])
+                    / (values["bb_upper"] - values["bb_lower"])
+                )
+                * 100,
+                1,
             )
+            indicators["BB_pos"] = bb_pos
+
+        if cfg.ema_fast is not None:
+            ema_trend = 1.0 if values["ema_fast"] > values["ema_slow"] else -1.0
+            indicators["EMA_trend"] = "UP" if ema_trend > 0 else "DOWN"
+
+        if cfg.macd_fast is not None:
+            macd_dir = 1.0 if values["macd"] > values["macd_signal"] else -1.0
+            indicators["MACD"] = "BULL" if macd_dir > 0 else "BEAR"
 
         # Generate signal based on strategy
         signal, strength, reasons = self._generate_signal(
-            strategy, params, indicators, current_rsi
+            cfg, current_rsi, bb_pos, ema_trend, macd_dir
         )
 
         return Opportunity(
             symbol=symbol,
-            timeframe=timeframe,
-            strategy=strategy,
+            timeframe=cfg.timeframe,
+            strategy=cfg.strategy,
             signal=signal,
             strength=strength,
             price=current_price,
             reason=" | ".join(reasons) if reasons else "Neutral",
             indicators=indicators,
-            timestamp=datetime.now(tz=UTC),
+            timestamp=now,
         )
 
     def _generate_signal(
-        self, strategy: str, params: dict, indicators: dict, rsi: float
+        self,
+        cfg: CompiledConfig,
+        rsi: float,
+        bb_pos: float,
+        ema_trend: float,
+        macd: float,
     ) -> tuple:
         """Generate trading signal based on strategy and indicators."""
-        signal = "WAIT"
-        strength = 0
-        reasons = []
-
-        rsi_buy = params.get("rsi_buy", 35)
-        rsi_sell = params.get("rsi_sell", 65)
-
-        if strategy == "grid":
-            # Grid: buy oversold, sell overbought
-            if rsi < rsi_buy:
-                strength += 50
-                reasons.append(f"RSI oversold ({rsi:.1f})")
-
-            if "BB_pos" in indicators and indicators["BB_pos"] < 20:
-                strength += 30
-                reasons.append("Near lower BB")
-
-            if rsi > rsi_sell:
-                signal = "SELL"
-                strength = 60
-                reasons = [f"RSI overbought ({rsi:.1f})"]
-            elif strength >= 60:
-                signal = "BUY"
-            elif strength >= 40:
-                signal = "WATCH"
-
-        elif strategy == "mean_reversion":
-            # Mean reversion: extreme oversold only
-            if rsi < 25:
-                signal = "BUY"
-                strength = 80
-                reasons.append(f"Extreme oversold ({rsi:.1f})")
-            elif rsi < 35:
-                signal = "WATCH"
-                strength = 50
-                reasons.append(f"Oversold ({rsi:.1f})")
-            elif rsi > 75:
-                signal = "SELL"
-                strength = 70
-                reasons.append(f"Overbought ({rsi:.1f})")
-
-        elif strategy == "momentum":
-            # Momentum: follow trend
-            trend = indicators.get("EMA_trend", "UP")
-            macd = indicators.get("MACD", "BULL")
-
-            if trend == "UP" and macd == "BULL" and rsi > 50 and rsi < 70:
-                signal = "BUY"
-                strength = 65
-                reasons.append("Uptrend + MACD bullish")
-            elif trend == "DOWN" or rsi > 75:
-                signal = "SELL"
-                strength = 55
-                reasons.append("Trend reversal")
-            elif trend == "UP" and rsi > 45:
-                signal = "WATCH"
-                strength = 40
-                reasons.append("Trend developing")
-
-        return signal, min(strength, 100), reasons
-
-    async def scan_stock(self, symbol: str) -> Opportunity | None:
-        """Scan a single stock."""
+        if cfg.signal_fn is None:
+            return "WAIT", 0, []
+
+        code, strength, mask = cfg.signal_fn(
+            rsi, bb_pos, ema_trend, macd, cfg.rsi_buy, cfg.rsi_sell
+        )
+        if code == SIGNAL_WAIT:
+            return "WAIT", strength, []  # Reasons are only shown when actionable
+        return SIGNAL_NAMES[code], min(strength, 100), decode_reasons(mask, rsi)
+
+    def _stock_market_closed(self, symbol: str, now: datetime) -> Opportunity | None:
+        """Placeholder opportunity when stocks cannot be scanned at ``now``."""
         if not YFINANCE_AVAILABLE:
             return Opportunity(
                 symbol=symbol,
@@ -314,12 +792,12 @@ class AdaptiveScanner:
                 price=0,
                 reason="yfinance not installed",
                 indicators={},
-                timestamp=datetime.now(tz=UTC),
+                timestamp=now,
             )
 
         # Check market hours
-        now = datetime.now(self.et_tz)
-        if now.weekday() > 4:
+        now_et = now.astimezone(self.ET)
+        if now_et.weekday() > 4:
             return Opportunity(
                 symbol=symbol,
                 timeframe="N/A",
@@ -329,12 +807,10 @@ class AdaptiveScanner:
                 price=0,
                 reason="Weekend",
                 indicators={"market": "CLOSED"},
-                timestamp=datetime.now(tz=UTC),
+                timestamp=now,
             )
 
-        market_open = time(9, 30)
-        market_close = time(16, 0)
-        if not (market_open <= now.time() <= market_close):
+        if not (self.MARKET_OPEN <= now_et.time() <= self.MARKET_CLOSE):
             return Opportunity(
                 symbol=symbol,
                 timeframe="N/A",
@@ -342,75 +818,97 @@ class AdaptiveScanner:
                 signal="SLEEPING",
                 strength=0,
                 price=0,
-                reason=f'Market closed ({now.strftime("%I:%M %p ET")})',
+                reason=f'Market closed ({now_et.strftime("%I:%M %p ET")})',
                 indicators={"market": "CLOSED"},
-                timestamp=datetime.now(tz=UTC),
+                timestamp=now,
             )
 
-        try:
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period="5d", interval="30m")
-
-            if df.empty:
-                return None
-
-            close = df["Close"]
-            current_price = close.iloc[-1]
-            rsi = calculate_rsi(close).iloc[-1]
-
-            signal = "WAIT"
-            strength = 0
-            reasons = []
-
-            if rsi < 30:
-                signal = "BUY"
-                strength = 70
-                reasons.append(f"Oversold ({rsi:.1f})")
-            elif rsi < 40:
-                signal = "WATCH"
-                strength = 45
-                reasons.append(f"RSI low ({rsi:.1f})")
-            elif rsi > 70:
-                signal = "SELL"
-                strength = 60
-                reasons.append(f"Overbought ({rsi:.1f})")
+        return None
 
-            return Opportunity(
-                symbol=symbol,
-                timeframe="30m",
-                strategy="mean_reversion",
-                signal=signal,
-                strength=strength,
-                price=current_price,
-                reason=" | ".join(reasons) if reasons else "Neutral",
-                indicators={"RSI": round(rsi, 1)},
-                timestamp=datetime.now(tz=UTC),
+    async def _fetch_stock_close(self, symbol: str) -> np.ndarray:
+        """30m closes for the last five sessions."""
+        # yfinance is blocking; run it on a worker thread
+        ticker = self._tickers.get(symbol)
+        if ticker is None:
+            ticker = self._tickers[symbol] = yf.Ticker(symbol)
+        df = await asyncio.to_thread(ticker.history, period="5d", interval="30m")
+        if df.empty:
+            return np.empty(0)
+        return df["Close"].to_numpy(dtype=np.float64)
+
+    async def scan_stocks(
+        self, symbols: list[str], now: datetime | None = None
+    ) -> list[Opportunity | None]:
+        """Scan stocks as one batch: concurrent fetches, then a single RSI pass."""
+        now = now or datetime.now(tz=UTC)
+        if not symbols:
+            return []
+
+        closed = [self._stock_market_closed(symbol, now) for symbol in symbols]
+        if closed[0] is not None:
+            return closed  # Market hours are the same for every stock
+
+        fetched = await asyncio.gather(
+            *(self._fetch_stock_close(symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+        closes = []
+        for symbol, close in zip(symbols, fetched, strict=True):
+            if isinstance(close, Exception):
+                log.error(f"Error scanning {symbol}: {close}")
+                close = np.empty(0)
+            closes.append(close)
+
+        rsi = calculate_rsi_tail_batch(closes)
+        codes, strengths, masks = _stock_signals(rsi)
+
+        results = []
+        for i, symbol in enumerate(symbols):
+            if not len(closes[i]):
+                results.append(None)
+                continue
+
+            code, symbol_rsi = int(codes[i]), float(rsi[i])
+            reasons = (
+                decode_reasons(masks[i], symbol_rsi) if code != SIGNAL_WAIT else []
+            )
+            results.append(
+                Opportunity(
+                    symbol=symbol,
+                    timeframe="30m",
+                    strategy="mean_reversion",
+                    signal=SIGNAL_NAMES[code],
+                    strength=int(strengths[i]),
+                    price=closes[i][-1],
+                    reason=" | ".join(reasons) if reasons else "Neutral",
+                    indicators={"RSI": round(symbol_rsi, 1)},
+                    timestamp=now,
+                )
             )
 
-        except Exception as e:
-            log.error(f"Error scanning {symbol}: {e}")
-            return None
+        return results
+
+    async def scan_stock(
+        self, symbol: str, now: datetime | None = None
+    ) -> Opportunity | None:
+        """Scan a single stock."""
+        return (await self.scan_stocks([symbol], now))[0]
 
     async def scan_all(self) -> list[Opportunity]:
         """Scan all assets in watchlist."""
-        tasks = []
-
-        # Crypto
-        for symbol in self.crypto_watchlist:
-            tasks.append(self.scan_crypto(symbol))
-
-        # Stocks
-        for symbol in self.stock_watchlist:
-            tasks.append(self.scan_stock(symbol))
+        now = datetime.now(tz=UTC)  # One clock read stamps the whole scan
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        opportunities = []
-        for r in results:
-            if isinstance(r, Opportunity):
-                opportunities.append(r)
+        # Crypto symbols scan individually; stocks share one batch
+        results = await asyncio.gather(
+            *(self.scan_crypto(symbol, now) for symbol in self.crypto_watchlist),
+            self.scan_stocks(self.stock_watchlist, now),
+            return_exceptions=True,
+        )
+        stock_results = results.pop()
+        if isinstance(stock_results, list):
+            results.extend(stock_results)
 
-        return opportunities
+        return [r for r in results if isinstance(r, Opportunity)]
 
     def print_header(self):
         """Print scanner header."""
@@ -451,8 +949,8 @@ class AdaptiveScanner:
 
         print("=" * 80)
 
-    def print_opportunity(self, opp: Opportunity):
-        """Print a single opportunity."""
+    def format_opportunity(self, opp: Opportunity) -> str:
+        """Format a single opportunity as report lines."""
         if opp.signal == "BUY":
             signal_str = ">>> BUY <<<"
         elif opp.signal == "SELL":
@@ -474,16 +972,21 @@ class AdaptiveScanner:
 
         config_str = f"{opp.timeframe}/{opp.strategy}"
 
-        print(
+        lines = [
             f"{opp.symbol:<12} | {config_str:<20} | {signal_str:<14} | {opp.strength:>3}% | {price_str:>12}"
-        )
+        ]
 
         if opp.reason and opp.signal in ["BUY", "SELL", "WATCH"]:
-            print(f"{'':12} | Reason: {opp.reason}")
+            lines.append(f"{'':12} | Reason: {opp.reason}")
             ind_str = " | ".join([f"{k}:{v}" for k, v in opp.indicators.items()])
-            print(f"{'':12} | {ind_str}")
+            lines.append(f"{'':12} | {ind_str}")
 
-        print("-" * 80)
+        lines.append("-" * 80)
+        return "\n".join(lines)
+
+    def print_opportunity(self, opp: Opportunity):
+        """Print a single opportunity."""
+        print(self.format_opportunity(opp))
 
     async def run(self):
         """Main scanning loop."""
@@ -494,51 +997,47 @@ class AdaptiveScanner:
             try:
                 scan_count += 1
                 now = datetime.now(tz=UTC).strftime("%Y-%m-%d %H:%M:%S")
-                print(f"\n[Scan #{scan_count}] {now}")
-                print("-" * 80)
-
-                opportunities = await self.scan_all()
-
-                # Sort by signal priority then strength
-                priority = {
-                    "BUY": 0,
-                    "SELL": 1,
-                    "WATCH": 2,
-                    "SLEEPING": 3,
-                    "WAIT": 4,
-                    "DISABLED": 5,
-                }
-                opportunities.sort(
-                    key=lambda x: (priority.get(x.signal, 6), -x.strength)
-                )
+                sys.stdout.write(f"\n[Scan #{scan_count}] {now}\n{'-' * 80}\n")
+                sys.stdout.flush()
 
-                for opp in opportunities:
-                    self.print_opportunity(opp)
+                results = ScanResults.from_opportunities(await self.scan_all())
+
+                # Build the whole report, sorted by signal rank then strength,
+                # and write it in one go
+                buf = [self.format_opportunity(opp) for opp in results.ranked()]
 
                 # Alert on actionable signals
-                actionable = [o for o in opportunities if o.signal in ["BUY", "SELL"]]
+                actionable = results.actionable()
                 if actionable:
-                    print("\n" + "!" * 80)
-                    print("  OPPORTUNITIES DETECTED!")
+                    buf.append("\n" + "!" * 80)
+                    buf.append("  OPPORTUNITIES DETECTED!")
                     for opp in actionable:
-                        print(
+                        buf.append(
                             f"  -> {opp.symbol}: {opp.signal} @ {opp.price:.4f} (Strength: {opp.strength}%)"
                         )
-                        # Log signal for accuracy tracking
-                        if SIGNAL_LOGGING:
-                            log_signal(
-                                symbol=opp.symbol,
-                                signal=opp.signal,
-                                strength=opp.strength,
-                                price=opp.price,
-                                rsi=opp.indicators.get("RSI"),
-                                indicators=opp.indicators,
-                                timeframe=opp.timeframe,
-                                strategy=opp.strategy,
-                            )
-                    print("!" * 80)
-
-                print(f"\nNext scan in {self.scan_interval}s... (Ctrl+C to stop)")
+                    buf.append("!" * 80)
+
+                    # Log this cycle's signals for accuracy tracking in one transaction
+                    if SIGNAL_LOGGING:
+                        log_signals_bulk(
+                            [
+                                signal_row(
+                                    symbol=opp.symbol,
+                                    signal=opp.signal,
+                                    strength=opp.strength,
+                                    price=opp.price,
+                                    rsi=opp.indicators.get("RSI"),
+                                    indicators=opp.indicators,
+                                    timeframe=opp.timeframe,
+                                    strategy=opp.strategy,
+                                )
+                                for opp in actionable
+                            ]
+                        )
+
+                buf.append(f"\nNext scan in {self.scan_interval}s... (Ctrl+C to stop)")
+                sys.stdout.write("\n".join(buf) + "\n")
+                sys.stdout.flush()
                 await asyncio.sleep(self.scan_interval)
 
             except KeyboardInterrupt:
@@ -569,6 +1068,7 @@ async def main():
 
     if args.show_configs:
         scanner.print_configs()
+        await scanner.close()
         return
 
     if args.optimize:
@@ -577,12 +1077,18 @@ async def main():
 
         optimize_all(scanner.crypto_watchlist)
         # Reload configs
+        await scanner.close()
         scanner = AdaptiveScanner(
             watchlist_file=args.watchlist, configs_file=args.configs
         )
 
-    await scanner.run()
+    try:
+        await scanner.run()
+    finally:
+        await scanner.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    loop_factory = uvloop.new_event_loop if UVLOOP_AVAILABLE else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())
@@ -4,24 +4,26 @@ Pull data and calculate what indicators would have caught it.
 """
 
 import ccxt
+import numpy as np
 import pandas as pd
 
+from utils._njit import NUMBA_AVAILABLE
+from utils.indicators_njit import rolling_mean, rsi_njit, rsi_vectorized
+
 
 def calculate_rsi(data, period=14):
     """Calculate RSI."""
-    delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    close = np.ascontiguousarray(data.to_numpy(dtype=np.float64))
+    rsi = rsi_njit if NUMBA_AVAILABLE else rsi_vectorized
+    return pd.Series(rsi(close, period), index=data.index)
 
 
 def calculate_volume_ratio(data, period=20):
     """Calculate current volume vs average volume."""
-    avg_volume = data.rolling(window=period).mean()
-    ratio = data / avg_volume
-    return ratio
+    volume = data.to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = volume / rolling_mean(volume, period)
+    return pd.Series(ratio, index=data.index)
 
 
 def analyze_btc_drop():
@@ -48,31 +50,10 @@ def analyze_btc_drop():
     df["volume_ratio"] = calculate_volume_ratio(df["volume"], 20)
     df["price_change_pct"] = df["close"].pct_change() * 100
 
-    # Show what data we got
-
-    # Find the biggest drop in the entire dataset
-    df["drop_from_prev"] = df["low"].diff()
-    df["drop_pct"] = (df["low"] - df["low"].shift(1)) / df["low"].shift(1) * 100
-
     # Find the lowest point overall
     lowest_idx = df["low"].idxmin()
     opportunity_candle = df.loc[lowest_idx]
 
-    # Check a few candles before
-    if lowest_idx > 0:
-        df.loc[lowest_idx - 1]
-
-    # Check a few candles after (recovery)
-    if lowest_idx < len(df) - 3:
-        recovery_candles = df.loc[lowest_idx : lowest_idx + 3]
-        for i, (idx, candle) in enumerate(recovery_candles.iterrows()):
-            if i > 0:  # Skip the bottom candle itself
-                (
-                    (candle["close"] - opportunity_candle["close"])
-                    / opportunity_candle["close"]
-                    * 100
-                )
-
     # What would have caught this?
     triggers = []
 
@@ -96,18 +77,9 @@ def analyze_btc_drop():
             f"[YES] Large Red Candle < -2%: {opportunity_candle['price_change_pct']:.2f}%"
         )
 
-    if triggers:
-        pass
-    else:
-        pass
-
-    # Print full dataframe around the opportunity
-
-    context_start = max(0, lowest_idx - 3)
-    context_end = min(len(df), lowest_idx + 4)
-
-    for idx in range(context_start, context_end):
-        df.loc[idx]
+    print(f"Lowest candle: {opportunity_candle['datetime']} at ${opportunity_candle['low']:,.2f}")
+    for trigger in triggers or ["[NO] No indicator fired on the lowest candle"]:
+        print(f"  {trigger}")
 
 
 if __name__ == "__main__":
@@ -8,19 +8,42 @@ Tests VET and PEPE with:
 - Strategies: Grid, Mean Reversion, Momentum
 """
 
+import argparse
 import asyncio
-from datetime import datetime, timedelta
 import ccxt.async_support as ccxt
+import numpy as np
 import pandas as pd
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
+from utils.backtest_njit import run_backtest
+from utils.combo_backtest import (
+    STRATEGY_IDS,
+    buy_signal_mask,
+    config_flags,
+    exit_reason_codes,
+    signal_conditions,
+    sweep_combos,
+)
+from utils.indicators_njit import indicator_suite_njit
+from utils.ohlcv_cache import PARQUET_AVAILABLE, cache_path
+from utils.ohlcv_fetch import fetch_ohlcv
+
 load_dotenv()
 
 # Configuration
 TIMEFRAMES = ["3m", "5m", "15m", "30m"]
 ASSETS = ["VET/USD", "PEPE/USD"]
 LOOKBACK_DAYS = 30  # 30 days of history
+FETCH_CONCURRENCY = 6  # OHLCV requests in flight at once
+PAGE_CONCURRENCY = 3  # Pages of one series in flight at once
+PAGE_LIMIT = 720  # Candles per OHLCV request; Kraken serves at most 720
+WILDER_RSI = True  # Wilder-smoothed RSI; False for the old rolling-mean RSI
+WARMUP_ROWS = 50  # Candles skipped while indicators stabilize
+INITIAL_BALANCE = 1000.0
+# Results file without extension: .parquet, or .csv with --csv
+RESULTS_PATH = "D:/gridbotchuck/data/backtest_optimization_results"
 
 # Indicator parameters
 INDICATOR_CONFIGS = {
@@ -64,253 +87,151 @@ INDICATOR_CONFIGS = {
 # Strategy types
 STRATEGIES = ["grid", "mean_reversion", "momentum"]
 
+# Every (indicator config, strategy) pair, in report order
+COMBOS = [
+    (config, strategy)
+    for config in INDICATOR_CONFIGS.values()
+    for strategy in STRATEGIES
+]
+
 
 def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate all technical indicators."""
-    # RSI
-    delta = df["close"].diff()
-    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df["rsi"] = 100 - (100 / (1 + rs))
-
-    # Bollinger Bands
-    df["bb_mid"] = df["close"].rolling(window=20).mean()
-    df["bb_std"] = df["close"].rolling(window=20).std()
-    df["bb_upper"] = df["bb_mid"] + (df["bb_std"] * 2)
-    df["bb_lower"] = df["bb_mid"] - (df["bb_std"] * 2)
-
-    # EMAs
-    df["ema_9"] = df["close"].ewm(span=9, adjust=False).mean()
-    df["ema_20"] = df["close"].ewm(span=20, adjust=False).mean()
-    df["ema_50"] = df["close"].ewm(span=50, adjust=False).mean()
-
-    # MACD
-    ema_12 = df["close"].ewm(span=12, adjust=False).mean()
-    ema_26 = df["close"].ewm(span=26, adjust=False).mean()
-    df["macd"] = ema_12 - ema_26
-    df["macd_signal"] = df["macd"].ewm(span=9, adjust=False).mean()
-    df["macd_hist"] = df["macd"] - df["macd_signal"]
-
-    # Volume ratio
-    df["vol_avg"] = df["volume"].rolling(window=20).mean()
-    df["vol_ratio"] = df["volume"] / df["vol_avg"]
+    """Calculate all technical indicators.
+
+    Runs once per frame and is shared by every combo. The columns are not
+    persisted: one fused pass over the cached candles costs less than
+    reading them back from disk would.
+    """
+    close = df["close"].to_numpy(dtype=np.float64)
+
+    # RSI(14), Bollinger(20, 2), EMA 9/20/50 and MACD(12, 26, 9) in one pass
+    (
+        df["rsi"],
+        df["bb_mid"],
+        df["bb_std"],
+        df["bb_upper"],
+        df["bb_lower"],
+        df["ema_9"],
+        df["ema_20"],
+        df["ema_50"],
+        df["macd"],
+        df["macd_signal"],
+        df["macd_hist"],
+    ) = indicator_suite_njit(close, 14, 20, 2.0, WILDER_RSI)
 
     return df
 
 
-def check_buy_signal(row, config: dict, strategy: str) -> bool:
-    """Check if buy conditions are met based on config and strategy."""
-    signals = []
-
-    if config["use_rsi"]:
-        if strategy == "grid":
-            signals.append(row["rsi"] < 35)  # Oversold
-        elif strategy == "mean_reversion":
-            signals.append(row["rsi"] < 30)  # More oversold
-        elif strategy == "momentum":
-            signals.append(30 < row["rsi"] < 50)  # Rising from oversold
-
-    if config["use_bb"]:
-        signals.append(row["close"] <= row["bb_lower"])  # Price at lower band
-
-    if config["use_ema"]:
-        if strategy == "momentum":
-            signals.append(row["ema_9"] > row["ema_20"])  # Bullish crossover
-        else:
-            signals.append(row["close"] < row["ema_20"])  # Below EMA (mean reversion)
-
-    if config["use_macd"]:
-        if strategy == "momentum":
-            signals.append(row["macd"] > row["macd_signal"])  # MACD bullish
-        else:
-            signals.append(row["macd_hist"] < 0)  # Negative histogram (oversold)
-
-    # Need at least one signal to trigger
-    if not signals:
-        return False
-
-    # For grid/mean_reversion: ALL signals must be true (more conservative)
-    # For momentum: ANY signal can trigger (more aggressive)
-    if strategy == "momentum":
-        return any(signals)
-    else:
-        return all(signals)
-
-
-def check_sell_signal(
-    row, entry_price: float, config: dict, strategy: str
-) -> tuple[bool, str]:
-    """Check if sell conditions are met. Returns (should_sell, reason)."""
-    pct_change = ((row["close"] - entry_price) / entry_price) * 100
-
-    # Take profit levels by strategy
-    if strategy == "grid":
-        take_profit = 3.0
-        stop_loss = -2.5
-    elif strategy == "mean_reversion":
-        take_profit = 4.0
-        stop_loss = -3.0
-    elif strategy == "momentum":
-        take_profit = 5.0
-        stop_loss = -3.5
-    else:
-        take_profit = 3.0
-        stop_loss = -2.5
-
-    # Take profit
-    if pct_change >= take_profit:
-        return True, "take_profit"
-
-    # Stop loss
-    if pct_change <= stop_loss:
-        return True, "stop_loss"
-
-    # Indicator-based exits
-    if config["use_rsi"] and row["rsi"] > 70:
-        return True, "rsi_overbought"
-
-    if config["use_bb"] and row["close"] >= row["bb_upper"]:
-        return True, "bb_upper"
-
-    if config["use_ema"] and strategy == "momentum":
-        if row["ema_9"] < row["ema_20"]:  # Bearish crossover
-            return True, "ema_bearish"
-
-    if config["use_macd"] and strategy == "momentum":
-        if row["macd"] < row["macd_signal"]:  # MACD bearish
-            return True, "macd_bearish"
-
-    return False, ""
-
-
-def backtest(df: pd.DataFrame, config: dict, strategy: str) -> dict:
-    """Run backtest on data with given config and strategy."""
-    initial_balance = 1000.0
+# Take-profit / stop-loss levels (%) by strategy
+EXIT_LEVELS = {
+    "grid": (3.0, -2.5),
+    "mean_reversion": (4.0, -3.0),
+    "momentum": (5.0, -3.5),
+}
+DEFAULT_EXIT_LEVELS = (3.0, -2.5)
+
+# Exit reasons by code. 1-2 are decided by the backtest kernel; the
+# indicator exits (3-6) are listed in priority order.
+EXIT_REASONS = (
+    "",
+    "take_profit",
+    "stop_loss",
+    "rsi_overbought",
+    "bb_upper",
+    "ema_bearish",
+    "macd_bearish",
+    "end_of_test",
+)
+EXIT_END_OF_TEST = 7
+
+
+def backtest(
+    df: pd.DataFrame, config: dict, strategy: str, conds: dict | None = None
+) -> dict:
+    """Run backtest on data with given config and strategy.
+
+    ``trades`` is a struct of arrays with one entry per round trip: entry and
+    exit time and price, percent change, and exit reason code (index into
+    EXIT_REASONS).
+    """
+    initial_balance = INITIAL_BALANCE
     balance = initial_balance
-    position = 0.0
-    entry_price = 0.0
-    trades = []
-
-    # Skip first 50 rows to let indicators stabilize
-    for i in range(50, len(df)):
-        row = df.iloc[i]
-
-        # Skip if indicators not ready
-        if pd.isna(row["rsi"]) or pd.isna(row["bb_lower"]):
-            continue
-
-        # Not in position - check for buy
-        if position == 0:
-            if check_buy_signal(row, config, strategy):
-                # Buy with full balance
-                position = balance / row["close"]
-                entry_price = row["close"]
-                balance = 0
-                trades.append(
-                    {
-                        "type": "BUY",
-                        "time": row["timestamp"],
-                        "price": row["close"],
-                        "amount": position,
-                    }
-                )
 
-        # In position - check for sell
-        else:
-            should_sell, reason = check_sell_signal(row, entry_price, config, strategy)
-            if should_sell:
-                # Sell all
-                balance = position * row["close"]
-                pct_change = ((row["close"] - entry_price) / entry_price) * 100
-                trades.append(
-                    {
-                        "type": "SELL",
-                        "time": row["timestamp"],
-                        "price": row["close"],
-                        "amount": position,
-                        "pct_change": pct_change,
-                        "reason": reason,
-                    }
-                )
-                position = 0
-                entry_price = 0
+    if conds is None:
+        conds = signal_conditions(df)
+    close = df["close"].to_numpy(dtype=np.float64)
+
+    # Everything that does not depend on the entry price is decided up front;
+    # the compiled kernel only walks the position state machine
+    ready = conds["ready"]
+    sid = STRATEGY_IDS.get(strategy, -1)
+    flags = config_flags(config)
+    buy = buy_signal_mask(conds, flags, sid)
+    exits = exit_reason_codes(conds, flags, sid)
+    take_profit, stop_loss = EXIT_LEVELS.get(strategy, DEFAULT_EXIT_LEVELS)
+
+    # Skip first 50 rows to let indicators stabilize, and start no earlier
+    # than the first row with both RSI and the bands defined
+    start = max(WARMUP_ROWS, int(np.argmax(ready)))
+    entries, exit_rows, reasons, open_entry = run_backtest(
+        close, ready, buy, exits, take_profit, stop_loss, start
+    )
 
     # Close any open position at end
-    if position > 0:
-        final_price = df.iloc[-1]["close"]
-        balance = position * final_price
-        pct_change = ((final_price - entry_price) / entry_price) * 100
-        trades.append(
-            {
-                "type": "SELL",
-                "time": df.iloc[-1]["timestamp"],
-                "price": final_price,
-                "amount": position,
-                "pct_change": pct_change,
-                "reason": "end_of_test",
-            }
-        )
+    if open_entry >= 0:
+        entries = np.append(entries, open_entry)
+        exit_rows = np.append(exit_rows, len(close) - 1)
+        reasons = np.append(reasons, np.int8(EXIT_END_OF_TEST))
+
+    entry_prices = close[entries]
+    exit_prices = close[exit_rows]
+    pct_change = ((exit_prices - entry_prices) / entry_prices) * 100
+
+    # Each trade buys with the full balance and sells all of it
+    for entry_price, exit_price in zip(entry_prices.tolist(), exit_prices.tolist()):
+        balance = balance / entry_price * exit_price
 
     # Calculate results
-    final_balance = balance if balance > 0 else position * df.iloc[-1]["close"]
+    final_balance = balance
     total_return = ((final_balance - initial_balance) / initial_balance) * 100
 
-    sell_trades = [t for t in trades if t["type"] == "SELL"]
-    wins = len([t for t in sell_trades if t.get("pct_change", 0) > 0])
-    losses = len([t for t in sell_trades if t.get("pct_change", 0) <= 0])
-    win_rate = (wins / len(sell_trades) * 100) if sell_trades else 0
+    num_trades = len(pct_change)
+    wins = int(np.count_nonzero(pct_change > 0))
+    losses = num_trades - wins
+    win_rate = (wins / num_trades * 100) if num_trades else 0
 
+    times = df["timestamp"].to_numpy()
     return {
         "total_return": total_return,
         "final_balance": final_balance,
-        "num_trades": len(sell_trades),
+        "num_trades": num_trades,
         "wins": wins,
         "losses": losses,
         "win_rate": win_rate,
-        "trades": trades,
+        "trades": {
+            "entry_time": times[entries],
+            "exit_time": times[exit_rows],
+            "entry_price": entry_prices,
+            "exit_price": exit_prices,
+            "pct_change": pct_change,
+            "reason": reasons,
+        },
     }
 
 
-async def fetch_ohlcv(exchange, symbol: str, timeframe: str, days: int) -> pd.DataFrame:
-    """Fetch OHLCV data from exchange."""
-    since = exchange.parse8601((datetime.utcnow() - timedelta(days=days)).isoformat())
-
-    all_data = []
-    while True:
-        try:
-            data = await exchange.fetch_ohlcv(
-                symbol, timeframe, since=since, limit=1000
-            )
-            if not data:
-                break
-            all_data.extend(data)
-            since = data[-1][0] + 1  # Next millisecond after last candle
-            if len(data) < 1000:
-                break
-            await asyncio.sleep(0.5)  # Rate limit
-        except Exception as e:
-            print(f"Error fetching {symbol} {timeframe}: {e}")
-            break
-
-    if not all_data:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(
-        all_data, columns=["timestamp", "open", "high", "low", "close", "volume"]
-    )
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-    df = (
-        df.drop_duplicates(subset=["timestamp"])
-        .sort_values("timestamp")
-        .reset_index(drop=True)
-    )
-
-    return df
+def save_results(results_df: pd.DataFrame, csv: bool = False) -> str:
+    """Write results as Parquet, or CSV if asked or pyarrow is missing."""
+    if csv or not PARQUET_AVAILABLE:
+        path = f"{RESULTS_PATH}.csv"
+        results_df.to_csv(path, index=False)
+    else:
+        path = f"{RESULTS_PATH}.parquet"
+        results_df.to_parquet(path, compression="snappy", index=False)
+    return path
 
 
-async def run_all_backtests():
-    """Run backtests for all combinations."""
+async def run_all_backtests(csv: bool = False):
+    """Run backtests for all combinations. Results go to Parquet unless ``csv``."""
     exchange = ccxt.kraken(
         {
             "apiKey": os.getenv("EXCHANGE_API_KEY"),
@@ -322,6 +243,27 @@ async def run_all_backtests():
     results = []
 
     try:
+        # Fetch every (asset, timeframe) up front; ccxt's rate limiter spaces
+        # the requests and the semaphore bounds how many are in flight
+        sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+        async def fetch_one(asset, timeframe):
+            async with sem:
+                cache_file = cache_path(exchange.id, asset, timeframe)
+                return await fetch_ohlcv(
+                    exchange,
+                    asset,
+                    timeframe,
+                    LOOKBACK_DAYS,
+                    cache_file,
+                    page_limit=PAGE_LIMIT,
+                    page_concurrency=PAGE_CONCURRENCY,
+                )
+
+        pairs = [(asset, timeframe) for asset in ASSETS for timeframe in TIMEFRAMES]
+        frames = await asyncio.gather(*(fetch_one(a, tf) for a, tf in pairs))
+        data = dict(zip(pairs, frames))
+
         for asset in ASSETS:
             print(f"\n{'='*60}")
             print(f"BACKTESTING: {asset}")
@@ -330,8 +272,7 @@ async def run_all_backtests():
             for timeframe in TIMEFRAMES:
                 print(f"\n--- Timeframe: {timeframe} ---")
 
-                # Fetch data
-                df = await fetch_ohlcv(exchange, asset, timeframe, LOOKBACK_DAYS)
+                df = data[(asset, timeframe)]
                 if df.empty:
                     print(f"  No data for {asset} {timeframe}")
                     continue
@@ -341,31 +282,41 @@ async def run_all_backtests():
                 # Calculate indicators
                 df = calculate_indicators(df)
 
-                # Test each indicator combo
-                for ind_key, ind_config in INDICATOR_CONFIGS.items():
-                    for strategy in STRATEGIES:
-                        result = backtest(df, ind_config, strategy)
-
-                        results.append(
-                            {
-                                "asset": asset,
-                                "timeframe": timeframe,
-                                "indicators": ind_config["name"],
-                                "strategy": strategy,
-                                "return_pct": result["total_return"],
-                                "num_trades": result["num_trades"],
-                                "win_rate": result["win_rate"],
-                                "wins": result["wins"],
-                                "losses": result["losses"],
-                            }
-                        )
-
-                        # Print result
-                        ret = result["total_return"]
-                        emoji = "+" if ret > 0 else ""
-                        print(
-                            f"  {ind_config['name']:12} + {strategy:15} = {emoji}{ret:6.2f}% ({result['num_trades']} trades, {result['win_rate']:.0f}% win)"
-                        )
+                # Signal conditions are shared by every combo on this data
+                conds = signal_conditions(df)
+
+                # Test every indicator combo in one parallel kernel call
+                outcomes = sweep_combos(
+                    df,
+                    conds,
+                    COMBOS,
+                    EXIT_LEVELS,
+                    default_exit_levels=DEFAULT_EXIT_LEVELS,
+                    warmup_rows=WARMUP_ROWS,
+                    initial_balance=INITIAL_BALANCE,
+                    close_open=True,
+                )
+                for (ind_config, strategy), result in zip(COMBOS, outcomes):
+                    results.append(
+                        {
+                            "asset": asset,
+                            "timeframe": timeframe,
+                            "indicators": ind_config["name"],
+                            "strategy": strategy,
+                            "return_pct": result["total_return"],
+                            "num_trades": result["num_trades"],
+                            "win_rate": result["win_rate"],
+                            "wins": result["wins"],
+                            "losses": result["losses"],
+                        }
+                    )
+
+                    # Print result
+                    ret = result["total_return"]
+                    emoji = "+" if ret > 0 else ""
+                    print(
+                        f"  {ind_config['name']:12} + {strategy:15} = {emoji}{ret:6.2f}% ({result['num_trades']} trades, {result['win_rate']:.0f}% win)"
+                    )
 
     finally:
         await exchange.close()
@@ -410,15 +361,21 @@ async def run_all_backtests():
         )
 
     # Save results to file
-    results_df.to_csv(
-        "D:/gridbotchuck/data/backtest_optimization_results.csv", index=False
-    )
-    print("\nResults saved to data/backtest_optimization_results.csv")
+    path = save_results(results_df, csv)
+    print(f"\nResults saved to data/{Path(path).name}")
 
     return results_df
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Backtest every indicator/strategy combo"
+    )
+    parser.add_argument(
+        "--csv", action="store_true", help="Save results as CSV instead of Parquet"
+    )
+    args = parser.parse_args()
+
     print("Starting comprehensive backtest...")
     print(f"Testing: {ASSETS}")
     print(f"Timeframes: {TIMEFRAMES}")
@@ -426,4 +383,4 @@ if __name__ == "__main__":
     print(f"Strategies: {STRATEGIES}")
     print(f"Lookback: {LOOKBACK_DAYS} days")
 
-    asyncio.run(run_all_backtests())
+    asyncio.run(run_all_backtests(csv=args.csv))
@@ -5,13 +5,20 @@ Backtest CrossKiller coins on 5m timeframe
 Tests Coinbase assets with different indicator combinations.
 """
 
+import argparse
 import asyncio
-from datetime import datetime, timedelta
 import ccxt.async_support as ccxt
+import numpy as np
 import pandas as pd
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
+from utils.combo_backtest import signal_conditions, sweep_combos
+from utils.indicators_njit import indicator_suite_njit
+from utils.ohlcv_cache import PARQUET_AVAILABLE, cache_path
+from utils.ohlcv_fetch import fetch_ohlcv
+
 load_dotenv()
 
 # Coinbase assets to test
@@ -27,6 +34,14 @@ ASSETS = [
 ]
 TIMEFRAME = "5m"
 LOOKBACK_DAYS = 14  # 2 weeks of 5m data
+FETCH_CONCURRENCY = 6  # OHLCV requests in flight at once
+PAGE_CONCURRENCY = 3  # Pages of one series in flight at once
+PAGE_LIMIT = 300  # Candles per OHLCV request
+WILDER_RSI = True  # Wilder-smoothed RSI; False for the old rolling-mean RSI
+WARMUP_ROWS = 50  # Candles skipped while indicators stabilize
+INITIAL_BALANCE = 1000.0
+# Results file without extension: .parquet, or .csv with --csv
+RESULTS_PATH = "D:/gridbotchuck/data/backtest_coinbase_5m"
 
 # Indicator configs
 INDICATOR_CONFIGS = {
@@ -76,199 +91,63 @@ INDICATOR_CONFIGS = {
 
 STRATEGIES = ["grid", "mean_reversion", "momentum"]
 
+# Every (indicator config, strategy) pair, in report order
+COMBOS = [
+    (config, strategy)
+    for config in INDICATOR_CONFIGS.values()
+    for strategy in STRATEGIES
+]
+
 
 def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate all technical indicators."""
-    # RSI
-    delta = df["close"].diff()
-    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df["rsi"] = 100 - (100 / (1 + rs))
-
-    # Bollinger Bands
-    df["bb_mid"] = df["close"].rolling(window=20).mean()
-    df["bb_std"] = df["close"].rolling(window=20).std()
-    df["bb_upper"] = df["bb_mid"] + (df["bb_std"] * 2)
-    df["bb_lower"] = df["bb_mid"] - (df["bb_std"] * 2)
-
-    # EMAs
-    df["ema_9"] = df["close"].ewm(span=9, adjust=False).mean()
-    df["ema_20"] = df["close"].ewm(span=20, adjust=False).mean()
-    df["ema_50"] = df["close"].ewm(span=50, adjust=False).mean()
-
-    # MACD
-    ema_12 = df["close"].ewm(span=12, adjust=False).mean()
-    ema_26 = df["close"].ewm(span=26, adjust=False).mean()
-    df["macd"] = ema_12 - ema_26
-    df["macd_signal"] = df["macd"].ewm(span=9, adjust=False).mean()
-    df["macd_hist"] = df["macd"] - df["macd_signal"]
+    """Calculate all technical indicators.
+
+    Runs once per frame and is shared by every combo. The columns are not
+    persisted: one fused pass over the cached candles costs less than
+    reading them back from disk would.
+    """
+    close = df["close"].to_numpy(dtype=np.float64)
+
+    # RSI(14), Bollinger(20, 2), EMA 9/20/50 and MACD(12, 26, 9) in one pass
+    (
+        df["rsi"],
+        df["bb_mid"],
+        df["bb_std"],
+        df["bb_upper"],
+        df["bb_lower"],
+        df["ema_9"],
+        df["ema_20"],
+        df["ema_50"],
+        df["macd"],
+        df["macd_signal"],
+        df["macd_hist"],
+    ) = indicator_suite_njit(close, 14, 20, 2.0, WILDER_RSI)
 
     return df
 
 
-def check_buy_signal(row, config: dict, strategy: str) -> bool:
-    """Check if buy conditions are met."""
-    signals = []
-
-    if config["use_rsi"]:
-        if strategy == "grid":
-            signals.append(row["rsi"] < 35)
-        elif strategy == "mean_reversion":
-            signals.append(row["rsi"] < 30)
-        elif strategy == "momentum":
-            signals.append(30 < row["rsi"] < 50)
-
-    if config["use_bb"]:
-        signals.append(row["close"] <= row["bb_lower"])
-
-    if config["use_ema"]:
-        if strategy == "momentum":
-            signals.append(row["ema_9"] > row["ema_20"])
-        else:
-            signals.append(row["close"] < row["ema_20"])
-
-    if config["use_macd"]:
-        if strategy == "momentum":
-            signals.append(row["macd"] > row["macd_signal"])
-        else:
-            signals.append(row["macd_hist"] < 0)
+# Day trading take-profit / stop-loss levels (%) - quick in/out
+EXIT_LEVELS = {
+    "grid": (1.5, -1.0),
+    "mean_reversion": (2.0, -1.5),
+    "momentum": (2.5, -1.5),
+}
+DEFAULT_EXIT_LEVELS = (1.5, -1.0)
 
-    if not signals:
-        return False
 
-    if strategy == "momentum":
-        return any(signals)
-    else:
-        return all(signals)
-
-
-def check_sell_signal(
-    row, entry_price: float, config: dict, strategy: str
-) -> tuple[bool, str]:
-    """Check if sell conditions are met."""
-    pct_change = ((row["close"] - entry_price) / entry_price) * 100
-
-    # Day trading targets - quick in/out
-    if strategy == "grid":
-        take_profit, stop_loss = 1.5, -1.0
-    elif strategy == "mean_reversion":
-        take_profit, stop_loss = 2.0, -1.5
-    elif strategy == "momentum":
-        take_profit, stop_loss = 2.5, -1.5
+def save_results(results_df: pd.DataFrame, csv: bool = False) -> str:
+    """Write results as Parquet, or CSV if asked or pyarrow is missing."""
+    if csv or not PARQUET_AVAILABLE:
+        path = f"{RESULTS_PATH}.csv"
+        results_df.to_csv(path, index=False)
     else:
-        take_profit, stop_loss = 1.5, -1.0
-
-    if pct_change >= take_profit:
-        return True, "take_profit"
-    if pct_change <= stop_loss:
-        return True, "stop_loss"
-
-    if config["use_rsi"] and row["rsi"] > 70:
-        return True, "rsi_overbought"
-    if config["use_bb"] and row["close"] >= row["bb_upper"]:
-        return True, "bb_upper"
-    if config["use_ema"] and strategy == "momentum" and row["ema_9"] < row["ema_20"]:
-        return True, "ema_bearish"
-    if (
-        config["use_macd"]
-        and strategy == "momentum"
-        and row["macd"] < row["macd_signal"]
-    ):
-        return True, "macd_bearish"
-
-    return False, ""
-
-
-def backtest(df: pd.DataFrame, config: dict, strategy: str) -> dict:
-    """Run backtest."""
-    initial_balance = 1000.0
-    balance = initial_balance
-    position = 0.0
-    entry_price = 0.0
-    trades = []
-
-    for i in range(50, len(df)):
-        row = df.iloc[i]
-        if pd.isna(row["rsi"]) or pd.isna(row["bb_lower"]):
-            continue
-
-        if position == 0:
-            if check_buy_signal(row, config, strategy):
-                position = balance / row["close"]
-                entry_price = row["close"]
-                balance = 0
-                trades.append({"type": "BUY", "price": row["close"]})
-        else:
-            should_sell, reason = check_sell_signal(row, entry_price, config, strategy)
-            if should_sell:
-                balance = position * row["close"]
-                pct = ((row["close"] - entry_price) / entry_price) * 100
-                trades.append(
-                    {
-                        "type": "SELL",
-                        "price": row["close"],
-                        "pct": pct,
-                        "reason": reason,
-                    }
-                )
-                position = 0
-                entry_price = 0
-
-    # Close open position
-    if position > 0:
-        balance = position * df.iloc[-1]["close"]
-
-    total_return = ((balance - initial_balance) / initial_balance) * 100
-    sell_trades = [t for t in trades if t["type"] == "SELL"]
-    wins = len([t for t in sell_trades if t.get("pct", 0) > 0])
-    losses = len(sell_trades) - wins
-    win_rate = (wins / len(sell_trades) * 100) if sell_trades else 0
-
-    return {
-        "total_return": total_return,
-        "num_trades": len(sell_trades),
-        "wins": wins,
-        "losses": losses,
-        "win_rate": win_rate,
-    }
-
-
-async def fetch_ohlcv(exchange, symbol: str, timeframe: str, days: int) -> pd.DataFrame:
-    """Fetch OHLCV data."""
-    since = exchange.parse8601((datetime.utcnow() - timedelta(days=days)).isoformat())
-    all_data = []
-
-    while True:
-        try:
-            data = await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=300)
-            if not data:
-                break
-            all_data.extend(data)
-            since = data[-1][0] + 1
-            if len(data) < 300:
-                break
-            await asyncio.sleep(0.3)
-        except Exception as e:
-            print(f"Error fetching {symbol}: {e}")
-            break
-
-    if not all_data:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(
-        all_data, columns=["timestamp", "open", "high", "low", "close", "volume"]
-    )
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-    return (
-        df.drop_duplicates(subset=["timestamp"])
-        .sort_values("timestamp")
-        .reset_index(drop=True)
-    )
+        path = f"{RESULTS_PATH}.parquet"
+        results_df.to_parquet(path, compression="snappy", index=False)
+    return path
 
 
-async def run_backtests():
-    """Run all backtests."""
+async def run_backtests(csv: bool = False):
+    """Run all backtests. Results go to Parquet unless ``csv``."""
     exchange = ccxt.coinbase(
         {
             "apiKey": os.getenv("COINBASE_API_KEY"),
@@ -280,12 +159,30 @@ async def run_backtests():
     results = []
 
     try:
-        for asset in ASSETS:
+        # Fetch every asset up front; ccxt's rate limiter spaces the requests
+        # and the semaphore bounds how many are in flight
+        sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+        async def fetch_one(asset):
+            async with sem:
+                cache_file = cache_path(exchange.id, asset, TIMEFRAME)
+                return await fetch_ohlcv(
+                    exchange,
+                    asset,
+                    TIMEFRAME,
+                    LOOKBACK_DAYS,
+                    cache_file,
+                    page_limit=PAGE_LIMIT,
+                    page_concurrency=PAGE_CONCURRENCY,
+                )
+
+        frames = await asyncio.gather(*(fetch_one(asset) for asset in ASSETS))
+
+        for asset, df in zip(ASSETS, frames):
             print(f"\n{'='*50}")
             print(f"BACKTESTING: {asset} @ 5m")
             print(f"{'='*50}")
 
-            df = await fetch_ohlcv(exchange, asset, TIMEFRAME, LOOKBACK_DAYS)
             if df.empty:
                 print(f"  No data for {asset}")
                 continue
@@ -293,27 +190,37 @@ async def run_backtests():
             print(f"  Loaded {len(df)} candles")
             df = calculate_indicators(df)
 
-            for ind_key, ind_config in INDICATOR_CONFIGS.items():
-                for strategy in STRATEGIES:
-                    result = backtest(df, ind_config, strategy)
-                    results.append(
-                        {
-                            "asset": asset,
-                            "indicators": ind_config["name"],
-                            "strategy": strategy,
-                            "return_pct": result["total_return"],
-                            "num_trades": result["num_trades"],
-                            "win_rate": result["win_rate"],
-                            "wins": result["wins"],
-                            "losses": result["losses"],
-                        }
-                    )
-
-                    ret = result["total_return"]
-                    sign = "+" if ret > 0 else ""
-                    print(
-                        f"  {ind_config['name']:12} + {strategy:15} = {sign}{ret:6.2f}% ({result['num_trades']} trades, {result['win_rate']:.0f}% win)"
-                    )
+            conds = signal_conditions(df)
+
+            outcomes = sweep_combos(
+                df,
+                conds,
+                COMBOS,
+                EXIT_LEVELS,
+                default_exit_levels=DEFAULT_EXIT_LEVELS,
+                warmup_rows=WARMUP_ROWS,
+                initial_balance=INITIAL_BALANCE,
+                close_open=False,
+            )
+            for (ind_config, strategy), result in zip(COMBOS, outcomes):
+                results.append(
+                    {
+                        "asset": asset,
+                        "indicators": ind_config["name"],
+                        "strategy": strategy,
+                        "return_pct": result["total_return"],
+                        "num_trades": result["num_trades"],
+                        "win_rate": result["win_rate"],
+                        "wins": result["wins"],
+                        "losses": result["losses"],
+                    }
+                )
+
+                ret = result["total_return"]
+                sign = "+" if ret > 0 else ""
+                print(
+                    f"  {ind_config['name']:12} + {strategy:15} = {sign}{ret:6.2f}% ({result['num_trades']} trades, {result['win_rate']:.0f}% win)"
+                )
 
     finally:
         await exchange.close()
@@ -348,14 +255,21 @@ async def run_backtests():
                 f"{row['asset']:10} | {row['indicators']:12} | {row['strategy']:15} | {row['return_pct']:+7.2f}%"
             )
 
-    results_df.to_csv("D:/gridbotchuck/data/backtest_coinbase_5m.csv", index=False)
-    print("\nResults saved to data/backtest_coinbase_5m.csv")
+    path = save_results(results_df, csv)
+    print(f"\nResults saved to data/{Path(path).name}")
 
     return results_df
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest CrossKiller coins on 5m")
+    parser.add_argument(
+        "--csv", action="store_true", help="Save results as CSV instead of Parquet"
+    )
+    args = parser.parse_args()
+
     print("Backtesting CrossKiller coins on 5m timeframe...")
     print(f"Assets: {ASSETS}")
     print(f"Lookback: {LOOKBACK_DAYS} days")
-    asyncio.run(run_backtests())
+
+    asyncio.run(run_backtests(csv=args.csv))
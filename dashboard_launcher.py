@@ -12,6 +12,7 @@ import webbrowser
 
 import requests
 from requests import RequestException
+from requests.adapters import HTTPAdapter
 
 LOGGER = logging.getLogger(__name__)
 
@@ -42,8 +43,11 @@ class DashboardLauncher:
         self.config_path = config_path
         self.logger = logging.getLogger(self.__class__.__name__)
         self.dashboard_url = f"http://localhost:{port}"
-        self.bot_process: subprocess.Popen[str] | None = None
+        self.bot_process: subprocess.Popen[bytes] | None = None
         self._opener_thread: threading.Thread | None = None
+        # Health checks all go to the one local API; keep that connection alive
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
 
     def _build_bot_command(self) -> list[str] | None:
         """Construct a sanitized command to launch the bot process."""
@@ -119,13 +123,31 @@ class DashboardLauncher:
                 stdin=subprocess.DEVNULL,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
             )
             self.logger.info("Bot process started (PID: %s)", self.bot_process.pid)
+            # Keep both pipes drained, otherwise the bot blocks on its next
+            # write once the OS pipe buffer (~64 KB) fills up
+            for stream in (self.bot_process.stdout, self.bot_process.stderr):
+                threading.Thread(
+                    target=self._drain_output, args=(stream,), daemon=True
+                ).start()
         except Exception:
             self.logger.exception("Failed to start bot process.")
             self.bot_process = None
 
+    def _drain_output(self, stream) -> None:
+        """Read a bot output pipe until EOF, forwarding lines to the debug log.
+
+        The bot writes its own log files, so lines are only decoded when
+        debug logging is enabled here.
+        """
+        with stream:
+            for line in stream:
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "[bot] %s", line.decode(errors="replace").rstrip()
+                    )
+
     def stop_bot(self) -> None:
         """Terminate the trading bot process if it is running."""
         if not self.bot_process:
@@ -169,7 +191,7 @@ class DashboardLauncher:
     def check_api_running(self) -> bool:
         """Return True if the dashboard API responds to a health check."""
         try:
-            response = requests.get(f"{self.dashboard_url}/api/health", timeout=2)
+            response = self._session.get(f"{self.dashboard_url}/api/health", timeout=2)
             return response.ok
         except RequestException as exc:
             self.logger.debug("Bot API health check failed: %s", exc)
@@ -179,11 +201,15 @@ class DashboardLauncher:
         """Poll until the API is available or the timeout is reached."""
         self.logger.info("Waiting for bot API server to start on port %s...", self.port)
         deadline = time.time() + timeout
+        # Start polling fast so an API that is already up is seen at once,
+        # then back off to one check per second for slow starts
+        interval = 0.1
         while time.time() < deadline:
             if self.check_api_running():
                 self.logger.info("Bot API server is running.")
                 return True
-            time.sleep(1)
+            time.sleep(interval)
+            interval = min(interval * 1.5, 1.0)
 
         self.logger.error("Timeout waiting for API server after %s seconds.", timeout)
         return False
@@ -24,6 +24,8 @@ from pathlib import Path
 import requests
 from dotenv import load_dotenv
 
+from signal_logger import init_db
+
 load_dotenv()
 
 WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
@@ -64,12 +66,15 @@ def post_signals():
 
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    # Bring a database the scanner hasn't opened since an upgrade up to date,
+    # so the ts_epoch ordering below exists
+    init_db(conn)
 
     # Get latest signals (last scan)
     signals = conn.execute("""
-        SELECT * FROM signals
+        SELECT symbol, signal, price, rsi FROM signals
         WHERE signal IN ('BUY', 'SELL')
-        ORDER BY timestamp DESC
+        ORDER BY ts_epoch DESC, id DESC
         LIMIT 15
     """).fetchall()
     conn.close()
@@ -159,15 +164,14 @@ def post_stats():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
 
-    total = conn.execute(
-        "SELECT COUNT(*) as cnt FROM signals WHERE signal IN ('BUY', 'SELL')"
-    ).fetchone()["cnt"]
-    validated = conn.execute(
-        "SELECT COUNT(*) as cnt FROM signals WHERE outcome_checked = 1"
-    ).fetchone()["cnt"]
-    correct = conn.execute(
-        "SELECT COUNT(*) as cnt FROM signals WHERE outcome = 'CORRECT'"
-    ).fetchone()["cnt"]
+    # All three counters in one pass over the table
+    row = conn.execute("""
+        SELECT COUNT(*) FILTER (WHERE signal IN ('BUY', 'SELL')) as total,
+               COUNT(*) FILTER (WHERE outcome_checked = 1) as validated,
+               COUNT(*) FILTER (WHERE outcome = 'CORRECT') as correct
+        FROM signals
+    """).fetchone()
+    total, validated, correct = row["total"], row["validated"], row["correct"]
 
     conn.close()
 
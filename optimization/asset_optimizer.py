@@ -15,12 +15,17 @@ from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 import json
 from pathlib import Path
+import sys
 
 import ccxt
 from indicator_combos import DEFAULT_CONFIG, INDICATOR_COMBOS, STRATEGIES, TIMEFRAMES
 import numpy as np
 import pandas as pd
 
+# Repo root, so the shared utils package resolves when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.indicators_njit import ema_njit
+
 # ============== TECHNICAL INDICATORS ==============
 
 
@@ -36,8 +41,9 @@ def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
 
 
 def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
-    """Calculate EMA."""
-    return prices.ewm(span=period, adjust=False).mean()
+    """Calculate EMA (``adjust=False`` recurrence, no pandas ewm pass)."""
+    values = np.ascontiguousarray(prices.to_numpy(dtype=np.float64))
+    return pd.Series(ema_njit(values, period), index=prices.index)
 
 
 def calculate_bollinger_bands(
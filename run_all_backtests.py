@@ -16,21 +16,40 @@ from datetime import datetime, timedelta
 import json
 from pathlib import Path
 
-import ccxt
+import ccxt.async_support as ccxt
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 
+from utils.indicators_njit import bb_njit, macd_njit, rsi_wilder_njit
+from utils.ohlcv_cache import cache_path, is_fresh, load_cached, merge_candles, save_cached
+from utils.simulation_njit import (
+    TRADE_SELL,
+    mark_to_market_njit,
+    replay_grid_njit,
+    run_bearish_njit,
+    run_filtered_grid_njit,
+)
+
+# orjson writes the results file faster and serializes numpy scalars natively
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+FETCH_CONCURRENCY = 4  # OHLCV series fetched at once
+# Coarser bars the bearish strategy takes its RSI/EMA signals from, by timeframe
+SIGNAL_TIMEFRAMES = {"5m": "15m"}
+RESAMPLE_BEARISH_SIGNALS = False  # True to decide 5m bearish entries on 15m bars
+
 
 # Technical indicators
 def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
-    """Calculate RSI indicator."""
-    deltas = prices.diff()
-    gains = deltas.where(deltas > 0, 0.0)
-    losses = -deltas.where(deltas < 0, 0.0)
-    avg_gain = gains.rolling(window=period).mean()
-    avg_loss = losses.rolling(window=period).mean()
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+    """Calculate Wilder's RSI (TA-Lib compatible) in one recursive pass."""
+    close = prices.to_numpy(dtype=np.float64)
+    return pd.Series(rsi_wilder_njit(close, period), index=prices.index)
 
 
 def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
@@ -41,33 +60,38 @@ def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
 def calculate_bollinger_bands(
     prices: pd.Series, period: int = 20, std_dev: float = 2.0
 ):
-    """Calculate Bollinger Bands."""
-    sma = prices.rolling(window=period).mean()
-    std = prices.rolling(window=period).std()
-    upper = sma + (std_dev * std)
-    lower = sma - (std_dev * std)
-    return upper, sma, lower
+    """Calculate Bollinger Bands from running window sums in one pass."""
+    upper, sma, lower = bb_njit(prices.to_numpy(dtype=np.float64), period, std_dev)
+    return (
+        pd.Series(upper, index=prices.index),
+        pd.Series(sma, index=prices.index),
+        pd.Series(lower, index=prices.index),
+    )
 
 
 def calculate_macd(prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9):
-    """Calculate MACD."""
-    ema_fast = calculate_ema(prices, fast)
-    ema_slow = calculate_ema(prices, slow)
-    macd_line = ema_fast - ema_slow
-    signal_line = calculate_ema(macd_line, signal)
-    histogram = macd_line - signal_line
-    return macd_line, signal_line, histogram
+    """Calculate MACD line, signal line and histogram in one fused pass."""
+    macd_line, signal_line, histogram = macd_njit(prices.to_numpy(dtype=np.float64), fast, slow, signal)
+    return (
+        pd.Series(macd_line, index=prices.index),
+        pd.Series(signal_line, index=prices.index),
+        pd.Series(histogram, index=prices.index),
+    )
 
 
 def calculate_atr(
     high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14
 ) -> pd.Series:
     """Calculate Average True Range."""
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    return tr.rolling(window=period).mean()
+    high_a = high.to_numpy(dtype=np.float64)
+    low_a = low.to_numpy(dtype=np.float64)
+    prev_close = np.concatenate(([np.nan], close.to_numpy(dtype=np.float64)[:-1]))
+    # fmax skips the missing previous close on the first bar, like pandas' max
+    tr = np.fmax(np.fmax(high_a - low_a, np.abs(high_a - prev_close)), np.abs(low_a - prev_close))
+    atr = np.full_like(tr, np.nan)
+    if len(tr) >= period:
+        atr[period - 1 :] = sliding_window_view(tr, period).mean(axis=-1)
+    return pd.Series(atr, index=close.index)
 
 
 @dataclass
@@ -97,22 +121,53 @@ class BacktestResult:
 class GridBacktester:
     """Backtest grid trading strategy."""
 
+    # One Kraken client for every backtester: a single HTTP session whose
+    # connections are reused across fetches, and one rate limiter
+    _exchange = None
+
     def __init__(self, pair: str, timeframe: str, initial_balance: float = 100.0):
         self.pair = pair
         self.timeframe = timeframe
         self.initial_balance = initial_balance
-        self.exchange = ccxt.kraken()
-
-    def fetch_historical_data(self, days: int = 30) -> pd.DataFrame:
-        """Fetch historical OHLCV data."""
+        self.exchange = GridBacktester.shared_exchange()
+
+    @staticmethod
+    def shared_exchange():
+        """The shared Kraken client, created on first use."""
+        if GridBacktester._exchange is None:
+            GridBacktester._exchange = ccxt.kraken({"enableRateLimit": True})
+        return GridBacktester._exchange
+
+    @staticmethod
+    async def close_exchange() -> None:
+        """Close the shared client's HTTP session."""
+        if GridBacktester._exchange is not None:
+            await GridBacktester._exchange.close()
+            GridBacktester._exchange = None
+
+    async def fetch_historical_data(self, days: int = 30) -> pd.DataFrame:
+        """Fetch historical OHLCV data, topping up the on-disk candle cache.
+
+        A cache written within the last candle period is used as-is; otherwise
+        only candles newer than its last timestamp are requested.
+        """
         print(f"  Fetching {self.pair} {self.timeframe} data...")
 
         since = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
+        start = pd.Timestamp(since, unit="ms")
+
+        cache_file = cache_path(self.exchange.id, self.pair, self.timeframe)
+        cached = load_cached(cache_file)
+        if cached is not None and not cached.empty:
+            if is_fresh(cache_file, self.exchange.parse_timeframe(self.timeframe)):
+                return cached[cached["timestamp"] >= start].set_index("timestamp")
+            last = int(cached["timestamp"].iloc[-1].timestamp() * 1000)
+            since = max(since, last + 1)
 
         all_candles = []
         while True:
             try:
-                candles = self.exchange.fetch_ohlcv(
+                candles = await self.exchange.fetch_ohlcv(
                     self.pair, self.timeframe, since=since, limit=500
                 )
                 if not candles:
@@ -125,25 +180,61 @@ class GridBacktester:
                 print(f"  Error fetching data: {e}")
                 break
 
-        if not all_candles:
+        if all_candles:
+            fresh = pd.DataFrame(
+                all_candles, columns=["timestamp", "open", "high", "low", "close", "volume"]
+            )
+            fresh["timestamp"] = pd.to_datetime(fresh["timestamp"], unit="ms")
+            df = merge_candles(cached, fresh)
+            save_cached(df, cache_file)
+        elif cached is not None:
+            df = cached
+        else:
             return pd.DataFrame()
 
-        df = pd.DataFrame(
-            all_candles, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df.set_index("timestamp", inplace=True)
-        return df
+        return df[df["timestamp"] >= start].set_index("timestamp")
+
+    @staticmethod
+    def prepare_indicators(df: pd.DataFrame) -> dict[str, np.ndarray]:
+        """Compute every indicator the simulations use, once per candle set.
+
+        Returns float64 arrays aligned with ``df``, so several strategies can
+        run over the same candles without recomputing them.
+        """
+        # Candles stay float64: the kernels are compiled for float64, so float32
+        # columns would only add casts, and rounding prices to float32 moves
+        # them across grid levels and band edges
+        close = df["close"]
+        bb_upper, bb_mid, bb_lower = calculate_bollinger_bands(close)
+        macd, macd_signal, macd_hist = calculate_macd(close)
+        series = {
+            "close": close,
+            "rsi_14": calculate_rsi(close),
+            "ema_20": calculate_ema(close, 20),
+            "ema_50": calculate_ema(close, 50),
+            "atr_14": calculate_atr(df["high"], df["low"], close),
+            "bb_upper": bb_upper,
+            "bb_mid": bb_mid,
+            "bb_lower": bb_lower,
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_hist": macd_hist,
+        }
+        return {name: values.to_numpy(dtype=np.float64) for name, values in series.items()}
 
     def simulate_grid(
-        self, df: pd.DataFrame, num_grids: int = 6, grid_range_pct: float = 10.0
+        self,
+        df: pd.DataFrame,
+        num_grids: int = 6,
+        grid_range_pct: float = 10.0,
+        indicators: dict[str, np.ndarray] | None = None,
     ) -> BacktestResult:
         """Simulate grid trading on historical data."""
         if df.empty:
             return self._empty_result("hedged_grid")
 
-        close_prices = df["close"]
-        mid_price = close_prices.iloc[0]
+        closes = indicators["close"] if indicators is not None else df["close"].to_numpy(dtype=np.float64)
+        mid_price = closes[0]
 
         # Set grid range
         grid_top = mid_price * (1 + grid_range_pct / 100)
@@ -153,99 +244,63 @@ class GridBacktester:
         # Grid levels
         grid_levels = [grid_bottom + i * grid_step for i in range(num_grids + 1)]
 
-        # Simulation state
-        balance = self.initial_balance
-        crypto_balance = 0.0
-        trades = []
-        balance_history = [balance]
-
-        # Track active orders at each grid level
-        active_buys = dict.fromkeys(grid_levels[: num_grids // 2], True)
-        active_sells = dict.fromkeys(grid_levels[num_grids // 2 :], False)
-
-        position_size = balance / (num_grids // 2) * 0.9  # 90% of balance per grid
-
-        for i in range(1, len(close_prices)):
-            price = close_prices.iloc[i]
-            prev_price = close_prices.iloc[i - 1]
-
-            # Check for buy triggers (price crosses below grid level)
-            for level in list(active_buys.keys()):
-                if active_buys[level] and prev_price > level and price <= level:
-                    # Buy
-                    if balance >= position_size:
-                        crypto_amount = position_size / price
-                        balance -= position_size
-                        crypto_balance += crypto_amount
-                        trades.append(
-                            {
-                                "type": "buy",
-                                "price": price,
-                                "amount": crypto_amount,
-                                "value": position_size,
-                            }
-                        )
-                        active_buys[level] = False
-                        # Set corresponding sell
-                        sell_level = level + grid_step
-                        if sell_level in active_sells:
-                            active_sells[sell_level] = True
-
-            # Check for sell triggers (price crosses above grid level)
-            for level in list(active_sells.keys()):
-                if (
-                    active_sells.get(level, False)
-                    and prev_price < level
-                    and price >= level
-                ):
-                    # Sell
-                    if crypto_balance > 0:
-                        sell_amount = min(crypto_balance, position_size / level)
-                        sell_value = sell_amount * price
-                        crypto_balance -= sell_amount
-                        balance += sell_value
-                        trades.append(
-                            {
-                                "type": "sell",
-                                "price": price,
-                                "amount": sell_amount,
-                                "value": sell_value,
-                            }
-                        )
-                        active_sells[level] = False
-                        # Reset corresponding buy
-                        buy_level = level - grid_step
-                        if buy_level in active_buys:
-                            active_buys[buy_level] = True
-
-            # Track balance
-            total_value = balance + (crypto_balance * price)
-            balance_history.append(total_value)
+        # Orders at each grid level; a filled level re-arms its neighbour only
+        # when that neighbour is exactly level +/- grid_step
+        buy_levels = np.array(grid_levels[: num_grids // 2])
+        sell_levels = np.array(grid_levels[num_grids // 2 :])
+        sell_index = {level: j for j, level in enumerate(sell_levels.tolist())}
+        buy_index = {level: k for k, level in enumerate(buy_levels.tolist())}
+        sell_after_buy = np.array(
+            [sell_index.get(level + grid_step, -1) for level in buy_levels.tolist()], dtype=np.int64
+        )
+        buy_after_sell = np.array(
+            [buy_index.get(level - grid_step, -1) for level in sell_levels.tolist()], dtype=np.int64
+        )
+
+        position_size = self.initial_balance / (num_grids // 2) * 0.9  # 90% of balance per grid
+
+        # Every (bar, level) crossing at once: price leaves the side above a buy
+        # level or below a sell level between consecutive closes. Boolean sides
+        # rather than np.sign, so a close landing exactly on a level still counts.
+        above = closes[:, None] > buy_levels
+        below = closes[:, None] < sell_levels
+        buy_bars, buy_lvls = np.nonzero(above[:-1] & ~above[1:])
+        sell_bars, sell_lvls = np.nonzero(below[:-1] & ~below[1:])
+
+        # Replay them bar by bar: buys in level order, then sells
+        bars = np.concatenate([buy_bars, sell_bars]).astype(np.int64) + 1
+        is_sell = np.concatenate([np.zeros(len(buy_bars), np.bool_), np.ones(len(sell_bars), np.bool_)])
+        lvls = np.concatenate([buy_lvls, sell_lvls]).astype(np.int64)
+        order = np.lexsort((lvls, is_sell, bars))
+        fill_bars, fill_is_sell, fill_balance, fill_crypto = replay_grid_njit(
+            closes,
+            bars[order],
+            is_sell[order],
+            lvls[order],
+            sell_levels,
+            sell_after_buy,
+            buy_after_sell,
+            self.initial_balance,
+            position_size,
+        )
+
+        # Track balance: cash and holdings after the latest fill, at each close
+        balance_history, max_drawdown = mark_to_market_njit(
+            closes, fill_bars, fill_balance, fill_crypto, self.initial_balance
+        )
 
         # Final valuation
-        final_price = close_prices.iloc[-1]
+        balance = fill_balance[-1] if len(fill_bars) else self.initial_balance
+        crypto_balance = fill_crypto[-1] if len(fill_bars) else 0.0
+        final_price = closes[-1]
         final_balance = balance + (crypto_balance * final_price)
+        n_trades = len(fill_bars)
+        n_sells = int(np.count_nonzero(fill_is_sell))
 
         # Calculate metrics
         profit_loss = final_balance - self.initial_balance
         profit_loss_pct = (profit_loss / self.initial_balance) * 100
 
-        # Drawdown
-        peak = self.initial_balance
-        max_drawdown = 0
-        for val in balance_history:
-            if val > peak:
-                peak = val
-            drawdown = (peak - val) / peak * 100
-            max_drawdown = max(max_drawdown, drawdown)
-
-        # Trade stats
-        [
-            t
-            for t in trades
-            if t["type"] == "sell" and t["value"] > t.get("cost", t["value"] * 0.99)
-        ]
-
         return BacktestResult(
             bot_name="GridBot Chuck",
             pair=self.pair,
@@ -255,15 +310,15 @@ class GridBacktester:
             end_date=str(df.index[-1]),
             initial_balance=self.initial_balance,
             final_balance=round(final_balance, 2),
-            total_trades=len(trades),
-            winning_trades=len([t for t in trades if t["type"] == "sell"]),
+            total_trades=n_trades,
+            winning_trades=n_sells,
             losing_trades=0,
             profit_loss=round(profit_loss, 2),
             profit_loss_pct=round(profit_loss_pct, 2),
             max_drawdown=round(max_drawdown, 2),
             sharpe_ratio=round(self._calculate_sharpe(balance_history), 2),
-            win_rate=100.0 if trades else 0.0,
-            avg_trade_profit=round(profit_loss / max(len(trades), 1), 4),
+            win_rate=100.0 if n_trades else 0.0,
+            avg_trade_profit=round(profit_loss / max(n_trades, 1), 4),
             indicators_used=["Price Grid", "Range Detection"],
         )
 
@@ -273,70 +328,43 @@ class GridBacktester:
         use_rsi: bool = True,
         use_bb: bool = True,
         use_macd: bool = False,
+        indicators: dict[str, np.ndarray] | None = None,
     ) -> BacktestResult:
         """Simulate grid with additional indicator filters."""
         if df.empty:
             return self._empty_result("indicator_enhanced")
 
-        close = df["close"]
+        if indicators is None:
+            indicators = self.prepare_indicators(df)
 
-        # Calculate indicators
         indicators_used = []
-
         if use_rsi:
-            df["rsi"] = calculate_rsi(close)
             indicators_used.append("RSI(14)")
-
         if use_bb:
-            df["bb_upper"], df["bb_mid"], df["bb_lower"] = calculate_bollinger_bands(
-                close
-            )
             indicators_used.append("Bollinger(20,2)")
-
         if use_macd:
-            df["macd"], df["macd_signal"], df["macd_hist"] = calculate_macd(close)
             indicators_used.append("MACD(12,26,9)")
 
-        # Enhanced grid simulation with indicator filters
-        balance = self.initial_balance
-        crypto_balance = 0.0
-        trades = []
-        balance_history = [balance]
-        position_size = balance * 0.2  # 20% per trade
-
-        for i in range(20, len(df)):  # Start after indicator warmup
-            price = close.iloc[i]
-
-            # Buy conditions
-            buy_signal = True
-            if use_rsi and df["rsi"].iloc[i] > 40:  # Only buy when oversold
-                buy_signal = False
-            if use_bb and price > df["bb_lower"].iloc[i]:  # Only buy near lower band
-                buy_signal = False
-
-            # Sell conditions
-            sell_signal = True
-            if use_rsi and df["rsi"].iloc[i] < 60:  # Only sell when overbought
-                sell_signal = False
-            if use_bb and price < df["bb_upper"].iloc[i]:  # Only sell near upper band
-                sell_signal = False
-
-            if buy_signal and balance >= position_size:
-                crypto_amount = position_size / price
-                balance -= position_size
-                crypto_balance += crypto_amount
-                trades.append({"type": "buy", "price": price})
-
-            elif sell_signal and crypto_balance > 0:
-                sell_value = crypto_balance * price
-                balance += sell_value
-                trades.append({"type": "sell", "price": price, "value": sell_value})
-                crypto_balance = 0
-
-            total_value = balance + (crypto_balance * price)
-            balance_history.append(total_value)
-
-        final_balance = balance + (crypto_balance * close.iloc[-1])
+        # Entry/exit filters for every bar at once: buy when oversold near the
+        # lower band, sell when overbought near the upper band
+        close = indicators["close"]
+        buy = np.ones(len(close), np.bool_)
+        sell = np.ones(len(close), np.bool_)
+        if use_rsi:
+            buy &= ~(indicators["rsi_14"] > 40)
+            sell &= ~(indicators["rsi_14"] < 60)
+        if use_bb:
+            buy &= ~(close > indicators["bb_lower"])
+            sell &= ~(close < indicators["bb_upper"])
+
+        # Enhanced grid simulation, starting after indicator warmup
+        position_size = self.initial_balance * 0.2  # 20% per trade
+        trade_kind, balance_history, balance, crypto_balance = run_filtered_grid_njit(
+            close, buy, sell, 20, self.initial_balance, position_size
+        )
+        n_trades = len(trade_kind)
+
+        final_balance = balance + (crypto_balance * close[-1])
         profit_loss = final_balance - self.initial_balance
 
         return BacktestResult(
@@ -348,40 +376,40 @@ class GridBacktester:
             end_date=str(df.index[-1]),
             initial_balance=self.initial_balance,
             final_balance=round(final_balance, 2),
-            total_trades=len(trades),
-            winning_trades=len([t for t in trades if t["type"] == "sell"]),
+            total_trades=n_trades,
+            winning_trades=int(np.count_nonzero(trade_kind == TRADE_SELL)),
             losing_trades=0,
             profit_loss=round(profit_loss, 2),
             profit_loss_pct=round((profit_loss / self.initial_balance) * 100, 2),
             max_drawdown=round(self._calculate_max_drawdown(balance_history), 2),
             sharpe_ratio=round(self._calculate_sharpe(balance_history), 2),
             win_rate=100.0,
-            avg_trade_profit=round(profit_loss / max(len(trades), 1), 4),
+            avg_trade_profit=round(profit_loss / max(n_trades, 1), 4),
             indicators_used=indicators_used,
         )
 
     def _calculate_sharpe(
-        self, balance_history: list, risk_free_rate: float = 0.02
+        self, balance_history: list | np.ndarray, risk_free_rate: float = 0.02
     ) -> float:
         """Calculate Sharpe ratio."""
-        if len(balance_history) < 2:
+        balances = np.asarray(balance_history, dtype=np.float64)
+        if len(balances) < 2:
+            return 0.0
+        returns = balances[1:] / balances[:-1] - 1
+        returns = returns[~np.isnan(returns)]
+        if len(returns) < 2:
             return 0.0
-        returns = pd.Series(balance_history).pct_change().dropna()
-        if returns.std() == 0:
+        std = returns.std(ddof=1)
+        if std == 0:
             return 0.0
         excess_returns = returns.mean() - (risk_free_rate / 252)
-        return (excess_returns / returns.std()) * np.sqrt(252)
+        return (excess_returns / std) * np.sqrt(252)
 
-    def _calculate_max_drawdown(self, balance_history: list) -> float:
+    def _calculate_max_drawdown(self, balance_history: list | np.ndarray) -> float:
         """Calculate maximum drawdown percentage."""
-        peak = balance_history[0]
-        max_dd = 0
-        for val in balance_history:
-            if val > peak:
-                peak = val
-            dd = (peak - val) / peak * 100
-            max_dd = max(max_dd, dd)
-        return max_dd
+        balances = np.asarray(balance_history, dtype=np.float64)
+        peak = np.maximum.accumulate(balances)
+        return float(((peak - balances) / peak * 100).max())
 
     def _empty_result(self, strategy: str) -> BacktestResult:
         """Return empty result when no data available."""
@@ -410,88 +438,67 @@ class GridBacktester:
 class BearishBacktester(GridBacktester):
     """Backtest bearish/Growler strategy."""
 
-    def simulate_bearish(self, df: pd.DataFrame) -> BacktestResult:
-        """Simulate bearish strategy with stop losses."""
+    def resample_signals(self, df: pd.DataFrame, timeframe: str) -> dict[str, np.ndarray]:
+        """RSI(14) and EMA 20/50 on ``timeframe`` bars, aligned back to ``df``.
+
+        A coarse bar's values only apply from the last ``df`` bar inside it
+        onwards, i.e. once that bar has closed, so there is no lookahead.
+        """
+        fine = pd.Timedelta(seconds=ccxt.Exchange.parse_timeframe(self.timeframe))
+        coarse = pd.Timedelta(seconds=ccxt.Exchange.parse_timeframe(timeframe))
+        close = df["close"].resample(coarse).last().dropna()
+        signals = pd.DataFrame(
+            {
+                "rsi_14": calculate_rsi(close),
+                "ema_20": calculate_ema(close, 20),
+                "ema_50": calculate_ema(close, 50),
+            }
+        )
+        signals.index += coarse - fine
+        signals = signals.reindex(df.index, method="ffill")
+        return {name: signals[name].to_numpy(dtype=np.float64) for name in signals}
+
+    def simulate_bearish(
+        self,
+        df: pd.DataFrame,
+        indicators: dict[str, np.ndarray] | None = None,
+        resample_for_signals: bool = False,
+    ) -> BacktestResult:
+        """Simulate bearish strategy with stop losses.
+
+        With ``resample_for_signals``, entries and exits are decided on the
+        coarser ``SIGNAL_TIMEFRAMES`` bars while fills and the stop loss still
+        use every candle.
+        """
         if df.empty:
             return self._empty_result("bearish_grid")
 
-        close = df["close"]
-        high = df["high"]
-        low = df["low"]
-
-        # Calculate indicators
-        df["rsi"] = calculate_rsi(close)
-        df["ema_20"] = calculate_ema(close, 20)
-        df["ema_50"] = calculate_ema(close, 50)
-        df["atr"] = calculate_atr(high, low, close)
-
-        balance = self.initial_balance
-        crypto_balance = 0.0
-        trades = []
-        balance_history = [balance]
-        position_size = balance * 0.15  # 15% per trade (conservative)
+        if indicators is None:
+            indicators = self.prepare_indicators(df)
+        close = indicators["close"]
+
+        signal_timeframe = SIGNAL_TIMEFRAMES.get(self.timeframe) if resample_for_signals else None
+        signals = self.resample_signals(df, signal_timeframe) if signal_timeframe else indicators
+
+        position_size = self.initial_balance * 0.15  # 15% per trade (conservative)
         stop_loss_pct = 0.03  # 3% stop loss
 
-        entry_price = None
-
-        for i in range(50, len(df)):
-            price = close.iloc[i]
-            rsi = df["rsi"].iloc[i]
-            ema_20 = df["ema_20"].iloc[i]
-            ema_50 = df["ema_50"].iloc[i]
-
-            # Bearish bias: only trade when EMA20 < EMA50 (downtrend)
-            is_bearish = ema_20 < ema_50
-
-            # Check stop loss
-            if (
-                entry_price
-                and crypto_balance > 0
-                and price <= entry_price * (1 - stop_loss_pct)
-            ):
-                # Stop loss hit
-                sell_value = crypto_balance * price
-                balance += sell_value
-                trades.append(
-                    {
-                        "type": "stop_loss",
-                        "price": price,
-                        "pnl": sell_value - (crypto_balance * entry_price),
-                    }
-                )
-                crypto_balance = 0
-                entry_price = None
-
-            # Buy on oversold in downtrend (counter-trend scalp)
-            if (
-                is_bearish
-                and rsi < 30
-                and balance >= position_size
-                and crypto_balance == 0
-            ):
-                crypto_amount = position_size / price
-                balance -= position_size
-                crypto_balance += crypto_amount
-                entry_price = price
-                trades.append({"type": "buy", "price": price})
-
-            # Sell on any bounce (quick exit in bearish market)
-            elif crypto_balance > 0 and rsi > 50:
-                sell_value = crypto_balance * price
-                pnl = sell_value - (crypto_balance * entry_price) if entry_price else 0
-                balance += sell_value
-                trades.append({"type": "sell", "price": price, "pnl": pnl})
-                crypto_balance = 0
-                entry_price = None
-
-            total_value = balance + (crypto_balance * price)
-            balance_history.append(total_value)
-
-        final_balance = balance + (crypto_balance * close.iloc[-1])
+        trade_kind, trade_pnl, balance_history, balance, crypto_balance = run_bearish_njit(
+            close,
+            signals["rsi_14"],
+            signals["ema_20"],
+            signals["ema_50"],
+            50,
+            self.initial_balance,
+            position_size,
+            stop_loss_pct,
+        )
+
+        final_balance = balance + (crypto_balance * close[-1])
         profit_loss = final_balance - self.initial_balance
 
-        winning = len([t for t in trades if t.get("pnl", 0) > 0])
-        losing = len([t for t in trades if t.get("pnl", 0) < 0])
+        winning = int(np.count_nonzero(trade_pnl > 0))
+        losing = int(np.count_nonzero(trade_pnl < 0))
 
         return BacktestResult(
             bot_name="Growler",
@@ -502,7 +509,7 @@ class BearishBacktester(GridBacktester):
             end_date=str(df.index[-1]),
             initial_balance=self.initial_balance,
             final_balance=round(final_balance, 2),
-            total_trades=len(trades),
+            total_trades=len(trade_kind),
             winning_trades=winning,
             losing_trades=losing,
             profit_loss=round(profit_loss, 2),
@@ -510,13 +517,14 @@ class BearishBacktester(GridBacktester):
             max_drawdown=round(self._calculate_max_drawdown(balance_history), 2),
             sharpe_ratio=round(self._calculate_sharpe(balance_history), 2),
             win_rate=round((winning / max(winning + losing, 1)) * 100, 1),
-            avg_trade_profit=round(profit_loss / max(len(trades), 1), 4),
+            avg_trade_profit=round(profit_loss / max(len(trade_kind), 1), 4),
             indicators_used=[
                 "RSI(14)",
                 "EMA(20)",
                 "EMA(50)",
                 "ATR(14)",
                 "Stop Loss 3%",
+                *([f"Signals on {signal_timeframe}"] if signal_timeframe else []),
             ],
         )
 
@@ -534,43 +542,27 @@ class MeanReversionBacktester:
         # For stocks, we'll simulate based on typical patterns
         # In reality, would use yfinance data
 
-        balance = self.initial_balance
-        trades = []
-        balance_history = [balance]
-
-        # Simulate 30 days of trading
-        np.random.seed(42)  # Reproducible results
-
-        for _day in range(30):
-            # Simulate finding 2-3 opportunities per day
-            opportunities = np.random.randint(1, 4)
-
-            for _ in range(opportunities):
-                # Mean reversion: buy oversold, target 4%, stop 3%
-                entry = balance * 0.02  # 2% of balance per trade
+        # Simulate win rate based on timeframe
+        # Shorter timeframes = more noise = lower win rate
+        timeframe_win_rates = {"5m": 0.45, "15m": 0.52, "30m": 0.55, "1h": 0.58}
+        win_rate = timeframe_win_rates.get(self.timeframe, 0.50)
 
-                # Simulate win rate based on timeframe
-                # Shorter timeframes = more noise = lower win rate
-                timeframe_win_rates = {"5m": 0.45, "15m": 0.52, "30m": 0.55, "1h": 0.58}
-                win_rate = timeframe_win_rates.get(self.timeframe, 0.50)
+        # Simulate 30 days of trading, finding 1-3 opportunities per day
+        rng = np.random.default_rng(42)  # Reproducible results
+        n_trades = int(rng.integers(1, 4, size=30).sum())
+        wins = rng.random(n_trades) < win_rate
 
-                if np.random.random() < win_rate:
-                    # Winner: +4%
-                    profit = entry * 0.04
-                    trades.append({"type": "win", "pnl": profit})
-                    balance += profit
-                else:
-                    # Loser: -3%
-                    loss = entry * 0.03
-                    trades.append({"type": "loss", "pnl": -loss})
-                    balance -= loss
+        # Mean reversion: buy oversold with 2% of the balance, target 4%,
+        # stop 3%, so each trade scales the balance by a fixed factor
+        growth = np.where(wins, 1 + 0.02 * 0.04, 1 - 0.02 * 0.03)
+        balance_history = self.initial_balance * np.concatenate(([1.0], np.cumprod(growth)))
+        pnl = np.diff(balance_history)
 
-                balance_history.append(balance)
-
-        final_balance = balance
+        final_balance = balance_history[-1]
         profit_loss = final_balance - self.initial_balance
-        winning = len([t for t in trades if t["pnl"] > 0])
-        losing = len([t for t in trades if t["pnl"] < 0])
+        winning = int(np.count_nonzero(wins))
+        losing = n_trades - winning
+        peak = balance_history.max()
 
         return BacktestResult(
             bot_name="Sleeping Marketbot",
@@ -581,27 +573,15 @@ class MeanReversionBacktester:
             end_date="Simulated",
             initial_balance=self.initial_balance,
             final_balance=round(final_balance, 2),
-            total_trades=len(trades),
+            total_trades=n_trades,
             winning_trades=winning,
             losing_trades=losing,
             profit_loss=round(profit_loss, 2),
             profit_loss_pct=round((profit_loss / self.initial_balance) * 100, 2),
-            max_drawdown=round(
-                max(
-                    (max(balance_history) - min(balance_history))
-                    / max(balance_history)
-                    * 100,
-                    0,
-                ),
-                2,
-            ),
-            sharpe_ratio=round(
-                np.mean([t["pnl"] for t in trades])
-                / max(np.std([t["pnl"] for t in trades]), 0.01),
-                2,
-            ),
-            win_rate=round((winning / max(len(trades), 1)) * 100, 1),
-            avg_trade_profit=round(profit_loss / max(len(trades), 1), 2),
+            max_drawdown=round(max((peak - balance_history.min()) / peak * 100, 0), 2),
+            sharpe_ratio=round(pnl.mean() / max(pnl.std(), 0.01), 2),
+            win_rate=round((winning / max(n_trades, 1)) * 100, 1),
+            avg_trade_profit=round(profit_loss / max(n_trades, 1), 2),
             indicators_used=["RSI(14)", "Bollinger(20,2)", "Volume Ratio"],
         )
 
@@ -675,34 +655,51 @@ async def main():
     timeframes = ["5m", "15m", "30m", "1h"]
     all_results = []
 
+    # Fetch every (pair, timeframe) up front; ccxt's rate limiter spaces the
+    # requests and the semaphore bounds how many series are in flight
+    grid_bts = [GridBacktester("BTC/USD", tf, initial_balance=100.0) for tf in timeframes]
+    bearish_bts = [BearishBacktester("ADA/USD", tf, initial_balance=20.0) for tf in timeframes]
+    backtesters = grid_bts + bearish_bts
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch(bt):
+        async with sem:
+            return await bt.fetch_historical_data(days=30)
+
+    try:
+        frames = await asyncio.gather(*(fetch(bt) for bt in backtesters))
+    finally:
+        await GridBacktester.close_exchange()
+    grid_dfs, bearish_dfs = frames[: len(grid_bts)], frames[len(grid_bts) :]
+
     # GridBot Chuck - BTC/USD
     print("\n[1/3] GRIDBOT CHUCK - BTC/USD")
     print("-" * 40)
-    for tf in timeframes:
-        print(f"\nTesting {tf}...")
-        bt = GridBacktester("BTC/USD", tf, initial_balance=100.0)
-        df = bt.fetch_historical_data(days=30)
+    for bt, df in zip(grid_bts, grid_dfs, strict=True):
+        print(f"\nTesting {bt.timeframe}...")
 
         if not df.empty:
+            indicators = bt.prepare_indicators(df)
+
             # Test basic grid
-            result = bt.simulate_grid(df)
+            result = bt.simulate_grid(df, indicators=indicators)
             all_results.append(result)
             print_result(result)
 
             # Test with indicators
-            result_ind = bt.simulate_with_indicators(df, use_rsi=True, use_bb=True)
+            result_ind = bt.simulate_with_indicators(df, use_rsi=True, use_bb=True, indicators=indicators)
             all_results.append(result_ind)
 
     # Growler - ADA/USD
     print("\n[2/3] GROWLER - ADA/USD (Bearish)")
     print("-" * 40)
-    for tf in timeframes:
-        print(f"\nTesting {tf}...")
-        bt = BearishBacktester("ADA/USD", tf, initial_balance=20.0)
-        df = bt.fetch_historical_data(days=30)
+    for bt, df in zip(bearish_bts, bearish_dfs, strict=True):
+        print(f"\nTesting {bt.timeframe}...")
 
         if not df.empty:
-            result = bt.simulate_bearish(df)
+            result = bt.simulate_bearish(
+                df, indicators=bt.prepare_indicators(df), resample_for_signals=RESAMPLE_BEARISH_SIGNALS
+            )
             all_results.append(result)
             print_result(result)
 
@@ -738,8 +735,13 @@ async def main():
         for r in all_results
     ]
 
-    with open(results_file, "w") as f:
-        json.dump(results_data, f, indent=2)
+    if ORJSON_AVAILABLE:
+        results_file.write_bytes(
+            orjson.dumps(results_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
+    else:
+        with open(results_file, "w") as f:
+            json.dump(results_data, f, indent=2)
 
     print(f"\n\nResults saved to: {results_file}")
     print("\nBacktest complete!")
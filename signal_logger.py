@@ -12,20 +12,136 @@ Usage:
 """
 
 import argparse
+import asyncio
+import atexit
 import json
 import sqlite3
-from datetime import UTC, datetime, timedelta
+import sys
+import threading
+import time
+from datetime import UTC, datetime
 from pathlib import Path
 
-import ccxt
+import ccxt.async_support as ccxt_async
+
+# orjson serializes the indicator dicts several times faster than the stdlib
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 DB_PATH = Path(__file__).parent / "data" / "signals.db"
 
+# log_signal buffers rows and writes them in one transaction once this many
+# are pending or this many seconds have passed since the last write
+FLUSH_EVERY = 50
+FLUSH_INTERVAL = 5.0
 
-def init_db():
-    """Initialize the signals database."""
+# Concurrent ticker requests while validating
+FETCH_CONCURRENCY = 8
+
+INSERT_SIGNAL = """
+    INSERT INTO signals (timestamp, symbol, signal, strength, price, rsi, indicators, timeframe, strategy, ts_epoch)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Running per-(symbol, signal, state) row counts kept by triggers, so the
+# accuracy summary reads a few dozen rows instead of scanning signals.
+# outcome_checked/outcome are COALESCEd because NULLs never conflict in a key.
+SIGNAL_STATS_SCHEMA = (
+    """
+    CREATE TABLE signal_stats (
+        symbol TEXT NOT NULL,
+        signal TEXT NOT NULL,
+        outcome_checked INTEGER NOT NULL,
+        outcome TEXT NOT NULL,
+        cnt INTEGER NOT NULL,
+        PRIMARY KEY (symbol, signal, outcome_checked, outcome)
+    )
+    """,
+    """
+    INSERT INTO signal_stats
+        SELECT symbol, signal, COALESCE(outcome_checked, 0), COALESCE(outcome, ''), COUNT(*)
+        FROM signals
+        GROUP BY 1, 2, 3, 4
+    """,
+    """
+    CREATE TRIGGER signal_stats_insert AFTER INSERT ON signals
+    BEGIN
+        INSERT INTO signal_stats
+        VALUES (NEW.symbol, NEW.signal, COALESCE(NEW.outcome_checked, 0), COALESCE(NEW.outcome, ''), 1)
+        ON CONFLICT DO UPDATE SET cnt = cnt + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER signal_stats_delete AFTER DELETE ON signals
+    BEGIN
+        UPDATE signal_stats SET cnt = cnt - 1
+        WHERE symbol = OLD.symbol AND signal = OLD.signal
+          AND outcome_checked = COALESCE(OLD.outcome_checked, 0)
+          AND outcome = COALESCE(OLD.outcome, '');
+    END
+    """,
+    """
+    CREATE TRIGGER signal_stats_update
+    AFTER UPDATE OF symbol, signal, outcome_checked, outcome ON signals
+    BEGIN
+        UPDATE signal_stats SET cnt = cnt - 1
+        WHERE symbol = OLD.symbol AND signal = OLD.signal
+          AND outcome_checked = COALESCE(OLD.outcome_checked, 0)
+          AND outcome = COALESCE(OLD.outcome, '');
+        INSERT INTO signal_stats
+        VALUES (NEW.symbol, NEW.signal, COALESCE(NEW.outcome_checked, 0), COALESCE(NEW.outcome, ''), 1)
+        ON CONFLICT DO UPDATE SET cnt = cnt + 1;
+    END
+    """,
+)
+
+# Stored in PRAGMA user_version once init_db has brought a database up to
+# date; bump it whenever the schema below changes
+SCHEMA_VERSION = 7
+
+_conn: sqlite3.Connection | None = None
+_pending: list[tuple] = []
+_last_flush = time.monotonic()
+# Serializes opening the shared connection and writes through it, so
+# scanners may log from worker threads
+_lock = threading.RLock()
+# Guards only the log_signal buffer, so other threads can keep buffering
+# while a batch is being written under _lock
+_pending_lock = threading.Lock()
+# ((data_version, total_changes), stats) from the last get_accuracy_stats
+_stats_cache: tuple[tuple[int, int], dict] | None = None
+
+
+def init_db(conn: sqlite3.Connection | None = None):
+    """Initialize the signals database.
+
+    A no-op beyond one ``PRAGMA user_version`` read once the database is at
+    ``SCHEMA_VERSION``.
+    """
     DB_PATH.parent.mkdir(exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(DB_PATH)
+
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        # Take the write lock first and re-check, in case another process is
+        # migrating the same database
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            create_schema(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+
+    if own_conn:
+        conn.close()
+
+
+def create_schema(conn: sqlite3.Connection):
+    """Create or upgrade every table, index and trigger, inside the caller's transaction."""
     conn.execute("""
         CREATE TABLE IF NOT EXISTS signals (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -46,12 +162,11 @@ def init_db():
             outcome_1h TEXT,
             outcome_4h TEXT,
             outcome TEXT,
-            profit_pct REAL
+            profit_pct REAL,
+            -- Unix seconds of timestamp, for integer range scans
+            ts_epoch INTEGER
         )
     """)
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON signals(timestamp)")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_symbol ON signals(symbol)")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_signal ON signals(signal)")
 
     # Add new columns if they don't exist (for existing databases)
     try:
@@ -62,9 +177,145 @@ def init_db():
         conn.execute("ALTER TABLE signals ADD COLUMN outcome_4h TEXT")
     except sqlite3.OperationalError:
         pass  # Column already exists
+    try:
+        conn.execute("ALTER TABLE signals ADD COLUMN ts_epoch INTEGER")
+    except sqlite3.OperationalError:
+        pass  # Column already exists
+    conn.execute("""
+        UPDATE signals SET ts_epoch = CAST(strftime('%s', timestamp) AS INTEGER)
+        WHERE ts_epoch IS NULL
+    """)
 
-    conn.commit()
-    conn.close()
+    # Newest-first listings order by the integer ts_epoch, whose index keys
+    # are a fraction the size of the ISO text ones
+    conn.execute("DROP INDEX IF EXISTS idx_timestamp")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ts_epoch ON signals(ts_epoch)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_symbol ON signals(symbol)")
+    # Not selective enough to help, and the planner would pick it for the
+    # recent-signals query and sort its result rather than walk idx_ts_epoch
+    conn.execute("DROP INDEX IF EXISTS idx_signal")
+    # Only the BUY/SELL signals still waiting for their 24h, 1h or 4h outcome.
+    # Each covers the columns validation reads plus the one it filters on, so
+    # the lookups never touch the table rows and their indicators JSON.
+    # Dropped first because earlier versions keyed them on fewer columns.
+    for name, pending_col, condition in (
+        ("idx_pending", "outcome_checked", "outcome_checked = 0"),
+        ("idx_pending_1h", "price_1h", "price_1h IS NULL"),
+        ("idx_pending_4h", "price_4h", "price_4h IS NULL"),
+    ):
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+        conn.execute(f"""
+            CREATE INDEX {name} ON signals(ts_epoch, symbol, signal, price, {pending_col})
+            WHERE {condition} AND signal IN ('BUY', 'SELL')
+        """)
+    # The accuracy stats read signal_stats now, so nothing queries this one
+    # and every validation update had to maintain it
+    conn.execute("DROP INDEX IF EXISTS idx_sym_outcome")
+
+    # Create and backfill the counters, unless an earlier version already did
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'signal_stats'"
+    ).fetchone()
+    if not has_stats:
+        for statement in SIGNAL_STATS_SCHEMA:
+            conn.execute(statement)
+
+
+def get_connection() -> sqlite3.Connection:
+    """Shared connection for every query here, opened and initialized once.
+
+    WAL lets readers (--summary, the Discord poster) run alongside the
+    scanner's writes, and synchronous=NORMAL drops the per-commit fsync.
+    Memory-mapping the file lets reads use the OS page cache directly
+    instead of copying every page through read() calls. Reusing the
+    connection also keeps its page cache and compiled statement cache warm
+    between calls.
+    """
+    global _conn
+    if _conn is None:
+        with _lock:
+            if _conn is None:
+                DB_PATH.parent.mkdir(exist_ok=True)
+                conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA cache_size=-8192")  # 8 MiB
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+                init_db(conn)
+                _conn = conn
+    return _conn
+
+
+def close_db():
+    """Flush buffered signals and close the shared connection."""
+    global _conn, _stats_cache
+    with _lock:
+        flush_signals()
+        # The next connection restarts both counters the cache is keyed on
+        _stats_cache = None
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
+def dump_indicators(indicators: dict) -> str:
+    """Compact JSON for the indicators column, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(indicators, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(indicators, separators=(",", ":"))
+
+
+def signal_row(
+    symbol: str,
+    signal: str,
+    strength: int,
+    price: float,
+    rsi: float | None = None,
+    indicators: dict | None = None,
+    timeframe: str | None = None,
+    strategy: str | None = None,
+) -> tuple:
+    """Build the INSERT parameters for one signal, timestamped now."""
+    now = datetime.now(tz=UTC)
+    return (
+        now.isoformat(),
+        symbol,
+        signal,
+        strength,
+        price,
+        rsi,
+        dump_indicators(indicators) if indicators else None,
+        timeframe,
+        strategy,
+        int(now.timestamp()),
+    )
+
+
+def log_signals_bulk(rows: list[tuple]):
+    """Insert many ``signal_row`` tuples in a single transaction."""
+    if not rows:
+        return
+    conn = get_connection()
+    with _lock, conn:
+        conn.executemany(INSERT_SIGNAL, rows)
+
+
+def flush_signals():
+    """Write any signals buffered by ``log_signal``."""
+    global _last_flush
+    # Held across the write so that once this returns, every row buffered
+    # before the call is in the database, even if another thread took it
+    with _lock:
+        with _pending_lock:
+            rows = _pending[:]
+            _pending.clear()
+            _last_flush = time.monotonic()
+        log_signals_bulk(rows)
+
+
+atexit.register(close_db)
 
 
 def log_signal(
@@ -77,67 +328,105 @@ def log_signal(
     timeframe: str | None = None,
     strategy: str | None = None,
 ):
-    """Log a new signal to the database."""
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute(
-        """
-        INSERT INTO signals (timestamp, symbol, signal, strength, price, rsi, indicators, timeframe, strategy)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            datetime.now(tz=UTC).isoformat(),
-            symbol,
-            signal,
-            strength,
-            price,
-            rsi,
-            json.dumps(indicators) if indicators else None,
-            timeframe,
-            strategy,
-        ),
-    )
-    conn.commit()
-    conn.close()
+    """Log a new signal to the database.
 
+    The row is buffered and written with the next batch; call
+    ``flush_signals`` to write it immediately.
+    """
+    row = signal_row(symbol, signal, strength, price, rsi, indicators, timeframe, strategy)
+    with _pending_lock:
+        _pending.append(row)
+        due = (
+            len(_pending) >= FLUSH_EVERY
+            or time.monotonic() - _last_flush >= FLUSH_INTERVAL
+        )
+    if due:
+        flush_signals()
 
-def validate_signals(exchange: ccxt.Exchange | None = None, hours: int = 24):
+
+async def fetch_prices(
+    exchange: ccxt_async.Exchange, symbols: list[str]
+) -> list[float | Exception]:
+    """Last price for each symbol.
+
+    One ``fetch_tickers`` request covers every symbol when the exchange
+    supports it; otherwise the tickers are fetched one by one, concurrently.
+    A failed fetch yields its exception in place of the price.
+    """
+    if not symbols:
+        return []
+
+    if exchange.has.get("fetchTickers"):
+        try:
+            tickers = await exchange.fetch_tickers(symbols)
+        except ccxt_async.BaseError:
+            # Unsupported here, or one bad symbol failing the whole batch:
+            # fall back to per-symbol requests so each fails on its own
+            pass
+        else:
+            return [
+                tickers[s]["last"] if s in tickers else ccxt_async.BadSymbol(f"No ticker for {s}")
+                for s in symbols
+            ]
+
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch(symbol):
+        async with semaphore:
+            ticker = await exchange.fetch_ticker(symbol)
+            return ticker["last"]
+
+    return await asyncio.gather(*(fetch(s) for s in symbols), return_exceptions=True)
+
+
+async def validate_signals_async(
+    exchange: ccxt_async.Exchange | None = None,
+    hours: int = 24,
+    prices: dict[str, float | Exception] | None = None,
+):
     """Check outcomes for signals that are old enough.
 
     Args:
-        exchange: CCXT exchange instance
+        exchange: Async CCXT exchange instance (a Kraken client is opened
+            and closed here if not given)
         hours: Minimum age of signals to validate (1, 4, or 24)
+        prices: Already fetched last prices by symbol; only symbols missing
+            from it are fetched
     """
     if exchange is None:
-        exchange = ccxt.kraken()
+        exchange = ccxt_async.kraken({"enableRateLimit": True})
+        try:
+            return await validate_signals_async(exchange, hours, prices)
+        finally:
+            await exchange.close()
 
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
 
     # Map hours to column names
     price_col = f"price_{hours}h" if hours in [1, 4] else "price_24h"
     outcome_col = f"outcome_{hours}h" if hours in [1, 4] else "outcome"
 
     # Get signals older than specified hours that haven't been validated for this timeframe
-    cutoff = (datetime.now(tz=UTC) - timedelta(hours=hours)).isoformat()
+    cutoff = int(time.time()) - hours * 3600
 
     # For 1h/4h, check if that specific price column is NULL
     # For 24h, check outcome_checked = 0
     if hours == 24:
         signals = conn.execute(
             """
-            SELECT * FROM signals
-            WHERE outcome_checked = 0 AND timestamp < ?
+            SELECT id, symbol, signal, price FROM signals INDEXED BY idx_pending
+            WHERE outcome_checked = 0 AND ts_epoch < ?
             AND signal IN ('BUY', 'SELL')
             """,
             (cutoff,),
         ).fetchall()
     else:
+        # Only 1h and 4h have a partial index; other windows use price_24h unhinted
+        hint = f" INDEXED BY idx_pending_{hours}h" if hours in [1, 4] else ""
         signals = conn.execute(
             f"""
-            SELECT * FROM signals
-            WHERE {price_col} IS NULL AND timestamp < ?
+            SELECT id, symbol, signal, price FROM signals{hint}
+            WHERE {price_col} IS NULL AND ts_epoch < ?
             AND signal IN ('BUY', 'SELL')
             """,
             (cutoff,),
@@ -146,16 +435,23 @@ def validate_signals(exchange: ccxt.Exchange | None = None, hours: int = 24):
     print(f"Validating {len(signals)} signals for {hours}h outcome...")
     validated = 0
     correct_count = 0
+    updates: list[tuple] = []
+    out: list[str] = []
+
+    # One ticker per symbol, however many of its signals are pending
+    prices = dict(prices or {})
+    missing = list({sig["symbol"] for sig in signals} - prices.keys())
+    prices.update(zip(missing, await fetch_prices(exchange, missing)))
 
     for sig in signals:
         symbol = sig["symbol"]
+        current_price = prices[symbol]
         signal_type = sig["signal"]
         entry_price = sig["price"]
 
         try:
-            # Fetch current price
-            ticker = exchange.fetch_ticker(symbol)
-            current_price = ticker["last"]
+            if isinstance(current_price, Exception):
+                raise current_price
 
             # Calculate price change
             price_change_pct = ((current_price - entry_price) / entry_price) * 100
@@ -171,61 +467,114 @@ def validate_signals(exchange: ccxt.Exchange | None = None, hours: int = 24):
             if outcome == "CORRECT":
                 correct_count += 1
 
-            # Update the record based on timeframe
             if hours == 24:
-                conn.execute(
-                    """
-                    UPDATE signals
-                    SET outcome_checked = 1, price_24h = ?, outcome = ?, profit_pct = ?
-                    WHERE id = ?
-                    """,
-                    (current_price, outcome, price_change_pct, sig["id"]),
-                )
+                updates.append((current_price, outcome, price_change_pct, sig["id"]))
             else:
-                conn.execute(
-                    f"""
-                    UPDATE signals
-                    SET {price_col} = ?, {outcome_col} = ?
-                    WHERE id = ?
-                    """,
-                    (current_price, outcome, sig["id"]),
-                )
+                updates.append((current_price, outcome, sig["id"]))
             validated += 1
-            print(
+            out.append(
                 f"  {symbol} {signal_type} @ ${entry_price:.4f} -> ${current_price:.4f} ({price_change_pct:+.2f}%) = {outcome}"
             )
 
         except Exception as e:
-            print(f"  {symbol}: Error - {e}")
+            out.append(f"  {symbol}: Error - {e}")
 
-    conn.commit()
-    conn.close()
+    # Update the records based on timeframe, in one transaction
+    if hours == 24:
+        update_sql = """
+            UPDATE signals
+            SET outcome_checked = 1, price_24h = ?, outcome = ?, profit_pct = ?
+            WHERE id = ?
+        """
+    else:
+        update_sql = f"""
+            UPDATE signals
+            SET {price_col} = ?, {outcome_col} = ?
+            WHERE id = ?
+        """
+    with _lock, conn:
+        conn.executemany(update_sql, updates)
 
     accuracy = (correct_count / validated * 100) if validated > 0 else 0
-    print(f"\nValidated {validated} signals for {hours}h timeframe")
-    print(f"Accuracy: {correct_count}/{validated} = {accuracy:.1f}%")
+    out.append(f"\nValidated {validated} signals for {hours}h timeframe")
+    out.append(f"Accuracy: {correct_count}/{validated} = {accuracy:.1f}%")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
-def validate_all_timeframes(exchange: ccxt.Exchange | None = None):
+def validate_signals(exchange: ccxt_async.Exchange | None = None, hours: int = 24):
+    """Synchronous entry point for ``validate_signals_async``."""
+    asyncio.run(validate_signals_async(exchange, hours))
+
+
+async def validate_all_timeframes_async(exchange: ccxt_async.Exchange | None = None):
     """Validate signals for all timeframes (1h, 4h, 24h)."""
     if exchange is None:
-        exchange = ccxt.kraken()
+        exchange = ccxt_async.kraken({"enableRateLimit": True})
+        try:
+            return await validate_all_timeframes_async(exchange)
+        finally:
+            await exchange.close()
 
     print("=" * 60)
     print("VALIDATING ALL TIMEFRAMES")
     print("=" * 60)
 
+    # Fetch every symbol any timeframe is waiting on in one concurrent batch,
+    # rather than one batch per timeframe. A UNION so each timeframe is a
+    # search on its pending index, where an OR of the three scans the table.
+    now = int(time.time())
+    symbols = [
+        row[0]
+        for row in get_connection().execute(
+            """
+            SELECT symbol FROM signals INDEXED BY idx_pending_1h
+            WHERE price_1h IS NULL AND ts_epoch < ? AND signal IN ('BUY', 'SELL')
+            UNION
+            SELECT symbol FROM signals INDEXED BY idx_pending_4h
+            WHERE price_4h IS NULL AND ts_epoch < ? AND signal IN ('BUY', 'SELL')
+            UNION
+            SELECT symbol FROM signals INDEXED BY idx_pending
+            WHERE outcome_checked = 0 AND ts_epoch < ? AND signal IN ('BUY', 'SELL')
+            """,
+            (now - 3600, now - 4 * 3600, now - 24 * 3600),
+        )
+    ]
+    prices = dict(zip(symbols, await fetch_prices(exchange, symbols)))
+
     for hours in [1, 4, 24]:
         print(f"\n--- {hours}h Validation ---")
-        validate_signals(exchange, hours=hours)
+        await validate_signals_async(exchange, hours=hours, prices=prices)
+
+
+def validate_all_timeframes(exchange: ccxt_async.Exchange | None = None):
+    """Synchronous entry point for ``validate_all_timeframes_async``."""
+    asyncio.run(validate_all_timeframes_async(exchange))
 
 
 def get_accuracy_stats() -> dict:
-    """Calculate accuracy statistics."""
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Calculate accuracy statistics.
 
+    The result is reused until the database changes: ``PRAGMA data_version``
+    moves on commits from other connections and ``total_changes`` on writes
+    through this one. Callers share the returned dict and must not modify it.
+    """
+    global _stats_cache
+    flush_signals()
+    conn = get_connection()
+
+    # Read before computing, so a write that lands meanwhile only costs a
+    # recompute next time rather than serving stale stats
+    key = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+    if _stats_cache is not None and _stats_cache[0] == key:
+        return _stats_cache[1]
+
+    stats = _compute_accuracy_stats(conn)
+    _stats_cache = (key, stats)
+    return stats
+
+
+def _compute_accuracy_stats(conn: sqlite3.Connection) -> dict:
+    """The counts behind ``get_accuracy_stats``, read from signal_stats."""
     stats = {
         "total_signals": 0,
         "validated": 0,
@@ -236,43 +585,34 @@ def get_accuracy_stats() -> dict:
         "by_symbol": {},
     }
 
-    # Overall stats
-    row = conn.execute(
-        "SELECT COUNT(*) as cnt FROM signals WHERE signal IN ('BUY', 'SELL')"
-    ).fetchone()
-    stats["total_signals"] = row["cnt"]
-
-    row = conn.execute(
-        "SELECT COUNT(*) as cnt FROM signals WHERE outcome_checked = 1"
-    ).fetchone()
-    stats["validated"] = row["cnt"]
-
-    row = conn.execute(
-        "SELECT COUNT(*) as cnt FROM signals WHERE outcome = 'CORRECT'"
-    ).fetchone()
-    stats["correct"] = row["cnt"]
-
-    row = conn.execute(
-        "SELECT COUNT(*) as cnt FROM signals WHERE outcome = 'WRONG'"
-    ).fetchone()
-    stats["wrong"] = row["cnt"]
+    # Overall and per-signal counts, pivoted from the trigger-maintained counters
+    rows = conn.execute(
+        """
+        SELECT signal,
+               SUM(cnt) as total,
+               SUM(CASE WHEN outcome_checked = 1 THEN cnt ELSE 0 END) as validated,
+               SUM(CASE WHEN outcome = 'CORRECT' THEN cnt ELSE 0 END) as correct,
+               SUM(CASE WHEN outcome = 'WRONG' THEN cnt ELSE 0 END) as wrong,
+               SUM(CASE WHEN outcome_checked = 1 AND outcome = 'CORRECT' THEN cnt ELSE 0 END)
+                   as validated_correct
+        FROM signal_stats
+        GROUP BY signal
+        """
+    ).fetchall()
+    by_signal = {r["signal"]: r for r in rows}
+    stats["total_signals"] = sum(by_signal[t]["total"] for t in ("BUY", "SELL") if t in by_signal)
+    stats["validated"] = sum(r["validated"] for r in rows)
+    stats["correct"] = sum(r["correct"] for r in rows)
+    stats["wrong"] = sum(r["wrong"] for r in rows)
 
     if stats["validated"] > 0:
         stats["accuracy_pct"] = (stats["correct"] / stats["validated"]) * 100
 
     # By signal type
     for signal_type in ["BUY", "SELL"]:
-        rows = conn.execute(
-            """
-            SELECT outcome, COUNT(*) as cnt
-            FROM signals
-            WHERE signal = ? AND outcome_checked = 1
-            GROUP BY outcome
-            """,
-            (signal_type,),
-        ).fetchall()
-        correct = sum(r["cnt"] for r in rows if r["outcome"] == "CORRECT")
-        total = sum(r["cnt"] for r in rows)
+        r = by_signal.get(signal_type)
+        correct = r["validated_correct"] if r else 0
+        total = r["validated"] if r else 0
         stats["by_signal"][signal_type] = {
             "total": total,
             "correct": correct,
@@ -283,11 +623,12 @@ def get_accuracy_stats() -> dict:
     rows = conn.execute(
         """
         SELECT symbol,
-               SUM(CASE WHEN outcome = 'CORRECT' THEN 1 ELSE 0 END) as correct,
-               COUNT(*) as total
-        FROM signals
+               SUM(CASE WHEN outcome = 'CORRECT' THEN cnt ELSE 0 END) as correct,
+               SUM(cnt) as total
+        FROM signal_stats
         WHERE outcome_checked = 1
         GROUP BY symbol
+        HAVING total > 0
         ORDER BY total DESC
         LIMIT 10
         """
@@ -299,30 +640,25 @@ def get_accuracy_stats() -> dict:
             "accuracy_pct": (r["correct"] / r["total"] * 100) if r["total"] > 0 else 0,
         }
 
-    conn.close()
     return stats
 
 
-def get_recent_signals(limit: int = 20) -> list[dict]:
-    """Get recent signals."""
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+def get_recent_signals(limit: int = 20) -> list[tuple]:
+    """Get recent signals as ``(timestamp, symbol, signal, price, rsi, outcome)``."""
+    flush_signals()
+    cursor = get_connection().cursor()
+    cursor.row_factory = None  # Plain tuples
 
-    rows = conn.execute(
+    return cursor.execute(
         """
-        SELECT * FROM signals
+        SELECT timestamp, symbol, signal, price, rsi, outcome FROM signals
         WHERE signal IN ('BUY', 'SELL')
-        ORDER BY timestamp DESC
+        ORDER BY ts_epoch DESC, id DESC
         LIMIT ?
         """,
         (limit,),
     ).fetchall()
 
-    signals = [dict(r) for r in rows]
-    conn.close()
-    return signals
-
 
 def print_summary():
     """Print accuracy summary."""
@@ -365,23 +701,24 @@ def print_recent(limit: int = 20):
     """Print recent signals."""
     signals = get_recent_signals(limit)
 
-    print("\n" + "=" * 70)
-    print(f"RECENT SIGNALS (Last {limit})")
-    print("=" * 70)
-    print(
-        f"{'Time':20} | {'Symbol':12} | {'Signal':6} | {'Price':>10} | {'RSI':>5} | {'Outcome':8}"
-    )
-    print("-" * 70)
-
-    for sig in signals:
-        ts = sig["timestamp"][:19].replace("T", " ")
-        outcome = sig["outcome"] or "pending"
-        rsi = f"{sig['rsi']:.1f}" if sig["rsi"] else "-"
-        print(
-            f"{ts:20} | {sig['symbol']:12} | {sig['signal']:6} | ${sig['price']:>9.4f} | {rsi:>5} | {outcome:8}"
+    out = [
+        "\n" + "=" * 70,
+        f"RECENT SIGNALS (Last {limit})",
+        "=" * 70,
+        f"{'Time':20} | {'Symbol':12} | {'Signal':6} | {'Price':>10} | {'RSI':>5} | {'Outcome':8}",
+        "-" * 70,
+    ]
+
+    for ts, symbol, sig_type, price, rsi, outcome in signals:
+        ts = ts[:19].replace("T", " ")
+        outcome = outcome or "pending"
+        rsi = f"{rsi:.1f}" if rsi else "-"
+        out.append(
+            f"{ts:20} | {symbol:12} | {sig_type:6} | ${price:>9.4f} | {rsi:>5} | {outcome:8}"
         )
 
-    print("=" * 70)
+    out.append("=" * 70)
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+import numpy as np
+
+from utils.backtest_njit import (
+    EXIT_NONE,
+    EXIT_STOP_LOSS,
+    EXIT_TAKE_PROFIT,
+    run_backtest_njit,
+    run_backtest_py,
+    sweep_backtests_njit,
+)
+
+
+def _run(close, buy, exits=None, ready=None, take_profit=3.0, stop_loss=-2.5, start=0):
+    n = len(close)
+    close = np.asarray(close, dtype=np.float64)
+    buy = np.asarray(buy, dtype=bool)
+    exits = np.zeros(n, np.int8) if exits is None else np.asarray(exits, np.int8)
+    ready = np.ones(n, bool) if ready is None else np.asarray(ready, bool)
+    return run_backtest_njit(close, ready, buy, exits, take_profit, stop_loss, start)
+
+
+def test_take_profit_and_stop_loss_exits():
+    close = [100, 100, 99, 103.5, 103, 100, 97, 98]
+    buy = [1, 0, 0, 0, 0, 1, 0, 0]
+
+    entries, exit_rows, reasons, open_entry = _run(close, buy)
+
+    assert entries.tolist() == [0, 5]
+    assert exit_rows.tolist() == [3, 6]
+    assert reasons.tolist() == [EXIT_TAKE_PROFIT, EXIT_STOP_LOSS]
+    assert open_entry == -1
+
+
+def test_indicator_exit_code_is_passed_through():
+    close = [100, 100.5, 101]
+    buy = [1, 0, 0]
+    exits = [EXIT_NONE, 4, 0]
+
+    _entries, exit_rows, reasons, _open = _run(close, buy, exits)
+
+    assert exit_rows.tolist() == [1]
+    assert reasons.tolist() == [4]
+
+
+def test_open_position_and_skipped_rows():
+    close = [100, 100, 100, 100]
+    buy = [1, 1, 1, 1]
+    ready = [False, False, True, True]
+
+    entries, _exit_rows, _reasons, open_entry = _run(close, buy, ready=ready, start=1)
+
+    assert entries.size == 0
+    assert open_entry == 2
+
+
+def test_python_loop_matches_kernel():
+    rng = np.random.default_rng(3)
+    n = 2000
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    ready = rng.random(n) > 0.05
+    buy = rng.random(n) > 0.9
+    exits = np.where(rng.random(n) > 0.95, 3, 0).astype(np.int8)
+
+    expected = run_backtest_njit(close, ready, buy, exits, 3.0, -2.5, 50)
+    result = run_backtest_py(close, ready, buy, exits, 3.0, -2.5, 50)
+
+    for got, want in zip(result[:3], expected[:3], strict=True):
+        assert got.dtype == want.dtype
+        np.testing.assert_array_equal(got, want)
+    assert result[3] == expected[3]
+
+
+def test_sweep_matches_single_backtests():
+    rng = np.random.default_rng(5)
+    n, n_combos = 1500, 4
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    ready = np.ones(n, bool)
+    buy = rng.random((n_combos, n)) > 0.9
+    exits = np.where(rng.random((n_combos, n)) > 0.95, 3, 0).astype(np.int8)
+    take_profit = np.array([3.0, 4.0, 5.0, 1.5])
+    stop_loss = np.array([-2.5, -3.0, -3.5, -1.0])
+
+    balances, n_trades, wins = sweep_backtests_njit(
+        close, ready, buy, exits, take_profit, stop_loss, 50, 1000.0, True
+    )
+
+    for c in range(n_combos):
+        entries, exit_rows, _reasons, open_entry = run_backtest_njit(
+            close, ready, buy[c], exits[c], take_profit[c], stop_loss[c], 50
+        )
+        if open_entry >= 0:
+            entries = np.append(entries, open_entry)
+            exit_rows = np.append(exit_rows, n - 1)
+        balance = 1000.0
+        for entry, exit_row in zip(entries, exit_rows):
+            balance = balance / close[entry] * close[exit_row]
+
+        assert balances[c] == balance
+        assert n_trades[c] == len(entries)
+        assert wins[c] == np.count_nonzero(close[exit_rows] > close[entries])
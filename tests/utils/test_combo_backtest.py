@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.combo_backtest import (
+    GRID,
+    INDICATOR_COLUMNS,
+    MOMENTUM,
+    USE_BB,
+    USE_EMA,
+    USE_MACD,
+    USE_RSI,
+    buy_signal_mask,
+    config_flags,
+    exit_reason_codes,
+    signal_conditions,
+    signal_plan,
+    sweep_combos,
+)
+
+
+def _conds(**columns):
+    n = len(next(iter(columns.values())))
+    df = pd.DataFrame({name: np.zeros(n) for name in INDICATOR_COLUMNS})
+    for name, values in columns.items():
+        df[name] = np.asarray(values, dtype=np.float64)
+    return signal_conditions(df)
+
+
+def test_config_flags_packs_toggles():
+    config = {"use_rsi": True, "use_bb": False, "use_ema": True, "use_macd": False}
+    assert config_flags(config) == USE_RSI | USE_EMA
+
+
+def test_signal_plan_momentum_adds_trend_exits():
+    flags = USE_RSI | USE_EMA | USE_MACD
+
+    assert signal_plan(flags, GRID) == (("rsi_lt35", "close_lt_ema20", "hist_neg"), ("rsi_gt70",), (3,))
+    assert signal_plan(flags, MOMENTUM) == (
+        ("rsi_30_50", "ema9_gt_ema20", "macd_bull"),
+        ("rsi_gt70", "ema9_lt_ema20", "macd_bear"),
+        (3, 5, 6),
+    )
+
+
+def test_buy_mask_needs_all_signals_except_for_momentum():
+    conds = _conds(rsi=[20, 20, 40, 60], close=[1, 3, 1, 3], bb_lower=[2, 2, 2, 2])
+    flags = USE_RSI | USE_BB
+
+    assert buy_signal_mask(conds, flags, GRID).tolist() == [True, False, False, False]
+    assert buy_signal_mask(conds, flags, MOMENTUM).tolist() == [True, False, True, False]
+    assert not buy_signal_mask(conds, 0, GRID).any()
+
+
+def test_exit_codes_follow_priority_order():
+    conds = _conds(rsi=[80, 80, 50, 50], close=[5, 1, 5, 1], bb_upper=[4, 4, 4, 4])
+
+    codes = exit_reason_codes(conds, USE_RSI | USE_BB, GRID)
+
+    assert codes.dtype == np.int8
+    assert codes.tolist() == [3, 3, 4, 0]
+
+
+def test_sweep_combos_runs_each_combo():
+    df = pd.DataFrame({name: np.zeros(6) for name in INDICATOR_COLUMNS})
+    df["close"] = [10.0, 10.0, 10.0, 11.0, 12.0, 12.0]
+    df["rsi"] = [20.0, 20.0, 20.0, 50.0, 80.0, 20.0]
+    rsi_only = {"use_rsi": True, "use_bb": False, "use_ema": False, "use_macd": False}
+    nothing = {"use_rsi": False, "use_bb": False, "use_ema": False, "use_macd": False}
+    combos = [(rsi_only, "grid"), (nothing, "grid")]
+
+    def sweep(close_open):
+        return sweep_combos(
+            df,
+            signal_conditions(df),
+            combos,
+            {"grid": (100.0, -100.0)},
+            default_exit_levels=(3.0, -2.5),
+            warmup_rows=0,
+            initial_balance=1000.0,
+            close_open=close_open,
+        )
+
+    traded, idle = sweep(False)
+    assert traded["num_trades"] == 1
+    assert traded["wins"] == 1
+    assert traded["total_return"] == pytest.approx(20.0)
+    assert idle == {"total_return": 0.0, "num_trades": 0, "wins": 0, "losses": 0, "win_rate": 0}
+
+    # The position reopened on the last row is counted as a trade too
+    assert sweep(True)[0]["num_trades"] == 2
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils._njit import NUMBA_AVAILABLE
+from utils.indicators_njit import (
+    bb_njit,
+    ema_njit,
+    indicator_suite_njit,
+    macd_njit,
+    rolling_mean,
+    rolling_std,
+    rsi_njit,
+    rsi_vectorized,
+    rsi_wilder_njit,
+    sma_njit,
+)
+
+
+@pytest.fixture
+def close():
+    rng = np.random.default_rng(7)
+    return 100 + np.cumsum(rng.normal(0, 1, 300))
+
+
+def _pandas_rsi(prices: pd.Series, period: int) -> pd.Series:
+    deltas = prices.diff()
+    gains = deltas.where(deltas > 0, 0.0)
+    losses = -deltas.where(deltas < 0, 0.0)
+    rs = gains.rolling(window=period).mean() / losses.rolling(window=period).mean()
+    return 100 - (100 / (1 + rs))
+
+
+@pytest.mark.parametrize("period", [7, 14])
+def test_rsi_matches_rolling_mean_rsi(close, period):
+    expected = _pandas_rsi(pd.Series(close), period).to_numpy()
+
+    result = rsi_njit(close, period)
+
+    np.testing.assert_allclose(result, expected, rtol=1e-9, equal_nan=True)
+
+
+def _wilder_rsi(prices: np.ndarray, period: int) -> np.ndarray:
+    deltas = np.diff(prices)
+    gains = np.clip(deltas, 0, None)
+    losses = np.clip(-deltas, 0, None)
+    out = np.full(len(prices), np.nan)
+    avg_gain = gains[:period].mean()
+    avg_loss = losses[:period].mean()
+    out[period] = 100 - 100 / (1 + avg_gain / avg_loss)
+    for k in range(period, len(deltas)):
+        avg_gain = (avg_gain * (period - 1) + gains[k]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[k]) / period
+        out[k + 1] = 100 - 100 / (1 + avg_gain / avg_loss)
+    return out
+
+
+@pytest.mark.parametrize("period", [7, 14])
+def test_rsi_wilder_matches_reference(close, period):
+    np.testing.assert_allclose(
+        rsi_wilder_njit(close, period), _wilder_rsi(close, period), rtol=1e-9, equal_nan=True
+    )
+
+
+def test_rsi_flat_prices_are_undefined():
+    result = rsi_njit(np.full(20, 5.0), 14)
+
+    assert np.isnan(result).all()
+
+
+def test_ema_matches_pandas_ewm(close):
+    expected = pd.Series(close).ewm(span=20, adjust=False).mean().to_numpy()
+
+    np.testing.assert_allclose(ema_njit(close, 20), expected, rtol=1e-12)
+
+
+def test_bollinger_bands_match_pandas_rolling(close):
+    series = pd.Series(close)
+    sma = series.rolling(window=20).mean()
+    std = series.rolling(window=20).std()
+
+    upper, mid, lower = bb_njit(close, 20, 2.0)
+
+    np.testing.assert_allclose(mid, sma.to_numpy(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(upper, (sma + 2 * std).to_numpy(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(lower, (sma - 2 * std).to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_bollinger_bands_short_series_is_all_nan():
+    upper, mid, lower = bb_njit(np.arange(5, dtype=np.float64), 20, 2.0)
+
+    assert np.isnan(upper).all() and np.isnan(mid).all() and np.isnan(lower).all()
+
+
+def test_macd_matches_pandas_ewm(close):
+    series = pd.Series(close)
+    macd_line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+    signal_line = macd_line.ewm(span=9, adjust=False).mean()
+
+    macd, signal, hist = macd_njit(close, 12, 26, 9)
+
+    np.testing.assert_allclose(macd, macd_line.to_numpy(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(signal, signal_line.to_numpy(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(hist, (macd_line - signal_line).to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+def test_rolling_mean_matches_pandas(close):
+    expected = pd.Series(close).rolling(window=20).mean().to_numpy()
+
+    np.testing.assert_allclose(rolling_mean(close, 20), expected, rtol=1e-9, equal_nan=True)
+
+
+def test_sma_matches_pandas(close):
+    expected = pd.Series(close).rolling(window=20).mean().to_numpy()
+
+    np.testing.assert_allclose(sma_njit(close, 20), expected, rtol=1e-9, equal_nan=True)
+
+
+def test_rolling_mean_shorter_than_window_is_all_nan():
+    assert np.isnan(rolling_mean(np.ones(3), 5)).all()
+
+
+@pytest.mark.parametrize("period", [7, 14])
+def test_rsi_vectorized_matches_kernel(close, period):
+    np.testing.assert_allclose(rsi_vectorized(close, period), rsi_njit(close, period), rtol=1e-8, equal_nan=True)
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+@pytest.mark.parametrize(
+    "kernel", [rsi_njit, rsi_wilder_njit, ema_njit, bb_njit, macd_njit]
+)
+def test_kernels_compiled_at_import(kernel):
+    assert len(kernel.signatures) == 1
+
+
+def test_rolling_std_matches_pandas(close):
+    expected = pd.Series(close).rolling(window=20).std().to_numpy()
+
+    np.testing.assert_allclose(rolling_std(close, 20), expected, rtol=1e-9, equal_nan=True)
+
+
+def test_rolling_std_shorter_than_window_is_all_nan():
+    assert np.isnan(rolling_std(np.ones(3), 5)).all()
+
+
+def test_indicator_suite_matches_single_kernels(close):
+    (rsi, mid, std, upper, lower, ema_9, ema_20, ema_50, macd, signal, hist) = indicator_suite_njit(
+        close, 14, 20, 2.0, False
+    )
+    bb_upper, bb_mid, bb_lower = bb_njit(close, 20, 2.0)
+    macd_line, signal_line, macd_hist = macd_njit(close, 12, 26, 9)
+
+    np.testing.assert_allclose(rsi, rsi_njit(close, 14), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(mid, bb_mid, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(upper, bb_upper, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(lower, bb_lower, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(std, (bb_upper - bb_mid) / 2.0, rtol=1e-9, equal_nan=True)
+    for period, ema in ((9, ema_9), (20, ema_20), (50, ema_50)):
+        np.testing.assert_allclose(ema, ema_njit(close, period), rtol=1e-12)
+    np.testing.assert_allclose(macd, macd_line, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(signal, signal_line, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(hist, macd_hist, rtol=1e-12, atol=1e-12)
+
+
+def test_indicator_suite_wilder_rsi(close):
+    rsi = indicator_suite_njit(close, 14, 20, 2.0, True)[0]
+
+    np.testing.assert_allclose(rsi, rsi_wilder_njit(close, 14), rtol=1e-12, equal_nan=True)
@@ -0,0 +1,24 @@
+from unittest.mock import patch
+
+from utils import _njit
+
+
+def test_njit_bare_decorator_is_noop_without_numba():
+    with patch.object(_njit, "NUMBA_AVAILABLE", False):
+
+        @_njit.njit
+        def add(a, b):
+            return a + b
+
+    assert add(2, 3) == 5
+    assert add.__name__ == "add"
+
+
+def test_njit_with_options_is_noop_without_numba():
+    def double(x):
+        return 2 * x
+
+    with patch.object(_njit, "NUMBA_AVAILABLE", False):
+        decorated = _njit.njit(cache=True)(double)
+
+    assert decorated is double
@@ -0,0 +1,61 @@
+import os
+import time
+
+import pandas as pd
+
+from utils.ohlcv_cache import cache_path, is_fresh, load_cached, merge_candles, save_cached
+
+
+def _candles(start, periods, close=1.0):
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(start, periods=periods, freq="h"),
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 1.0,
+        }
+    )
+
+
+def test_cache_path_is_per_series(tmp_path):
+    path = cache_path("kraken", "BTC/USD", "1h", tmp_path)
+    assert path.parent == tmp_path
+    assert path.stem == "kraken_BTC-USD_1h"
+    assert cache_path("kraken", "BTC/USD", "5m", tmp_path) != path
+
+
+def test_save_and_load_round_trip(tmp_path):
+    df = _candles("2024-01-01", 5)
+    path = cache_path("kraken", "ETH/USD", "1h", tmp_path / "nested")
+    save_cached(df, path)
+    pd.testing.assert_frame_equal(load_cached(path), df)
+
+
+def test_load_cached_missing_or_corrupt(tmp_path):
+    path = tmp_path / "missing.pkl"
+    assert load_cached(path) is None
+    path.write_bytes(b"not a dataframe")
+    assert load_cached(path) is None
+
+
+def test_is_fresh(tmp_path):
+    path = tmp_path / "series.pkl"
+    assert not is_fresh(path, 60)
+    save_cached(_candles("2024-01-01", 1), path)
+    assert is_fresh(path, 60)
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    assert not is_fresh(path, 60)
+
+
+def test_merge_candles_dedupes_and_sorts():
+    cached = _candles("2024-01-01", 3, close=1.0)
+    fresh = _candles("2024-01-01 02:00", 3, close=2.0)
+    merged = merge_candles(cached, fresh)
+    assert merged["timestamp"].is_monotonic_increasing
+    assert len(merged) == 5
+    # The overlapping candle takes the freshly fetched value
+    assert merged["close"].tolist() == [1.0, 1.0, 2.0, 2.0, 2.0]
+    pd.testing.assert_frame_equal(merge_candles(None, fresh), fresh)
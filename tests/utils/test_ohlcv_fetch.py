@@ -0,0 +1,109 @@
+import time
+from datetime import UTC, datetime
+
+import ccxt.async_support as ccxt
+import pytest
+
+from utils.ohlcv_cache import load_cached
+from utils.ohlcv_fetch import fetch_ohlcv, fetch_pages, fetch_pages_serial
+
+PERIOD = 60_000  # 1m candles
+NOW = int(time.time() * 1000) // PERIOD * PERIOD
+
+
+class FakeExchange:
+    """Serves 1m candles up to ``NOW``, at most ``cap`` per request."""
+
+    id = "fake"
+
+    def __init__(self, cap=10, newest_only=False, short_page_at=None, rate_limit_call=None):
+        self.cap = cap
+        self.newest_only = newest_only
+        self.short_page_at = short_page_at
+        self.rate_limit_call = rate_limit_call
+        self.calls = []
+
+    def parse_timeframe(self, timeframe):
+        return PERIOD // 1000
+
+    def parse8601(self, iso):
+        return int(datetime.fromisoformat(iso).replace(tzinfo=UTC).timestamp() * 1000)
+
+    def milliseconds(self):
+        return NOW
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append(since)
+        if len(self.calls) == self.rate_limit_call:
+            raise ccxt.RateLimitExceeded("429")
+        n = min(limit, self.cap)
+        if self.newest_only:
+            # Only the newest ``n`` candles are kept, as Kraken does
+            first = max(NOW - n * PERIOD, -(-since // PERIOD) * PERIOD)
+        else:
+            first = -(-since // PERIOD) * PERIOD
+        if since == self.short_page_at:
+            n //= 2
+            self.short_page_at = None
+        return [[t, 1.0, 1.0, 1.0, 1.0, 1.0] for t in range(first, min(first + n * PERIOD, NOW), PERIOD)]
+
+
+def _timestamps(candles):
+    return [c[0] for c in candles]
+
+
+@pytest.mark.asyncio
+async def test_full_pages_are_fetched_as_laid_out():
+    exchange = FakeExchange(cap=10)
+
+    candles = await fetch_pages(exchange, "X/USD", "1m", NOW - 100 * PERIOD, 10, 3)
+
+    assert _timestamps(candles) == list(range(NOW - 100 * PERIOD, NOW, PERIOD))
+    assert len(exchange.calls) == 10
+
+
+@pytest.mark.asyncio
+async def test_short_page_falls_back_to_serial_without_holes():
+    since = NOW - 100 * PERIOD
+    exchange = FakeExchange(cap=10, short_page_at=since + 30 * PERIOD)
+
+    candles = await fetch_pages(exchange, "X/USD", "1m", since, 10, 3)
+
+    assert sorted(set(_timestamps(candles))) == list(range(since, NOW, PERIOD))
+
+
+@pytest.mark.asyncio
+async def test_newest_only_exchange_is_not_paged_concurrently():
+    # Kraken-style: every request answers with the newest candles
+    exchange = FakeExchange(cap=10, newest_only=True)
+
+    candles = await fetch_pages(exchange, "X/USD", "1m", NOW - 100 * PERIOD, 10, 3)
+
+    assert _timestamps(candles) == list(range(NOW - 10 * PERIOD, NOW, PERIOD))
+    assert len(exchange.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_serial_stops_on_short_page():
+    exchange = FakeExchange(cap=10)
+
+    candles = await fetch_pages_serial(exchange, "X/USD", "1m", NOW - 25 * PERIOD, 10)
+
+    assert _timestamps(candles) == list(range(NOW - 25 * PERIOD, NOW, PERIOD))
+    assert len(exchange.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_ohlcv_walks_serially_when_rate_limited(tmp_path):
+    # The second page, the first of the concurrent ones, gets a 429
+    exchange = FakeExchange(cap=500, rate_limit_call=2)
+    cache_file = tmp_path / "fake_X-USD_1m.pkl"
+
+    df = await fetch_ohlcv(exchange, "X/USD", "1m", 1, cache_file, page_limit=500)
+
+    timestamps = df["timestamp"].astype("int64") // 1_000_000
+    assert timestamps.diff().iloc[1:].eq(PERIOD).all()
+    assert timestamps.iloc[-1] == NOW - PERIOD
+    # More than the one page that landed before the 429
+    assert len(df) > 2 * 500
+    assert load_cached(cache_file)["timestamp"].tolist() == df["timestamp"].tolist()
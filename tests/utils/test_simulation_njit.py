@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from utils.simulation_njit import (
+    TRADE_BUY,
+    TRADE_SELL,
+    TRADE_STOP_LOSS,
+    mark_to_market_njit,
+    replay_grid_njit,
+    run_bearish_njit,
+    run_filtered_grid_njit,
+)
+
+
+def _replay(close, events, position_size, initial_balance=100.0):
+    bars, is_sell, levels = (np.array(col) for col in zip(*events, strict=True))
+    return replay_grid_njit(
+        np.asarray(close, dtype=np.float64),
+        bars.astype(np.int64),
+        is_sell.astype(bool),
+        levels.astype(np.int64),
+        np.array([100.0, 105.0]),
+        np.array([-1, 0], dtype=np.int64),  # buying at 95 arms the sell at 100
+        np.array([1, -1], dtype=np.int64),  # selling at 100 re-arms the buy at 95
+        initial_balance,
+        position_size,
+    )
+
+
+def test_grid_fills_arm_their_neighbours():
+    close = [100, 94, 89, 101, 106]
+    # Buy levels 90/95 crossed on rows 1-2, sell levels 100/105 on rows 3-4
+    events = [(1, False, 1), (2, False, 0), (3, True, 0), (4, True, 1)]
+
+    rows, is_sell, balance, crypto = _replay(close, events, position_size=30.0)
+
+    # The sell at 105 was never armed
+    assert rows.tolist() == [1, 2, 3]
+    assert is_sell.tolist() == [False, False, True]
+    held = 30.0 / 94 + 30.0 / 89
+    assert balance.tolist() == pytest.approx([70.0, 40.0, 40.0 + 0.3 * 101])
+    assert crypto.tolist() == pytest.approx([30.0 / 94, held, held - 0.3])
+
+
+def test_grid_buy_needs_cash_for_a_full_position():
+    events = [(1, False, 1), (2, False, 0)]
+
+    rows, _is_sell, balance, _crypto = _replay([100, 94, 89], events, position_size=60.0)
+
+    assert rows.tolist() == [1]
+    assert balance.tolist() == [40.0]
+
+
+def test_mark_to_market_holds_the_latest_fill():
+    close = np.array([100.0, 50.0, 40.0, 80.0, 60.0])
+    # Buy 1 unit at row 1, sell it at row 3
+    fill_rows = np.array([1, 3], dtype=np.int64)
+
+    history, max_drawdown = mark_to_market_njit(close, fill_rows, np.array([50.0, 130.0]), np.array([1.0, 0.0]), 100.0)
+
+    assert history.tolist() == [100.0, 100.0, 90.0, 130.0, 130.0]
+    assert max_drawdown == pytest.approx(10.0)
+
+
+def test_filtered_grid_buys_until_cash_runs_out_then_sells_all():
+    close = np.array([50.0, 10.0, 20.0, 40.0, 80.0])
+    buy = np.array([True, True, True, False, False])
+    sell = np.array([True, True, True, False, True])
+
+    kinds, history, balance, crypto = run_filtered_grid_njit(close, buy, sell, 1, 100.0, 60.0)
+
+    # Row 2 allows both but there's only 40 left, so it sells
+    assert kinds.tolist() == [TRADE_BUY, TRADE_SELL]
+    assert balance == pytest.approx(40.0 + 6.0 * 20)
+    assert crypto == 0.0
+    assert history.tolist() == pytest.approx([100.0, 100.0, 160.0, 160.0, 160.0])
+
+
+def test_bearish_take_profit_and_stop_loss():
+    close = np.array([100.0, 101.0, 102.0, 100.0, 96.0])
+    rsi = np.array([25.0, 40.0, 55.0, 25.0, 40.0])
+    ema_fast = np.full(5, 1.0)
+    ema_slow = np.full(5, 2.0)
+
+    kinds, pnl, history, balance, crypto = run_bearish_njit(close, rsi, ema_fast, ema_slow, 0, 100.0, 10.0, 0.03)
+
+    assert kinds.tolist() == [TRADE_BUY, TRADE_SELL, TRADE_BUY, TRADE_STOP_LOSS]
+    assert pnl.tolist() == pytest.approx([0.0, 0.2, 0.0, -0.4])
+    assert crypto == 0.0
+    assert balance == pytest.approx(100.0 + 0.2 - 0.4)
+    assert history.shape == (6,)
+    assert history[0] == 100.0
+    assert history[-1] == balance
+
+
+def test_bearish_waits_for_downtrend_and_start():
+    close = np.full(6, 100.0)
+    rsi = np.full(6, 20.0)
+    ema_fast = np.array([1.0, 1.0, 1.0, 3.0, 3.0, 1.0])
+    ema_slow = np.full(6, 2.0)
+
+    kinds, _pnl, history, _balance, _crypto = run_bearish_njit(close, rsi, ema_fast, ema_slow, 3, 100.0, 10.0, 0.03)
+
+    # Rows before ``start`` and the uptrend rows 3-4 are skipped
+    assert kinds.tolist() == [TRADE_BUY]
+    assert history.shape == (4,)
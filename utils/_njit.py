@@ -0,0 +1,52 @@
+"""
+Optional Numba support.
+
+``njit`` compiles the decorated function with Numba when it is installed and
+otherwise hands the plain Python function back unchanged, so every kernel
+still runs (slower) on a bare numpy/pandas install. ``prange`` likewise falls
+back to ``range``.
+
+Compiled kernels are cached under ``.numba_cache/`` at the repo root so a
+restart loads machine code instead of recompiling; export ``NUMBA_CACHE_DIR``
+to put the cache elsewhere.
+"""
+
+import os
+from pathlib import Path
+
+# Numba reads this once, on import
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR", str(Path(__file__).resolve().parent.parent / ".numba_cache")
+)
+
+# Fast-math flags that are safe for the indicator kernels: FMA contraction,
+# reciprocal and approximate-function rewrites, signed zeros. Reassociation and
+# the no-NaN/no-inf assumptions stay off so running sums keep their order and
+# NaN warmup values and gaps in the price data still propagate.
+FASTMATH = {"contract", "arcp", "afn", "nsz"}
+
+try:
+    from numba import njit as _numba_njit
+    from numba import prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba_njit = None
+    # Parallel loops run serially without Numba
+    prange = range
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """Drop-in for ``numba.njit`` that degrades to a no-op without Numba."""
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+
+    # Bare ``@njit`` usage: the function itself is the only argument.
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func):
+        return func
+
+    return decorator
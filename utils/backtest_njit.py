@@ -0,0 +1,179 @@
+"""
+Compiled long-only backtest state machine.
+
+The backtest scripts precompute everything that does not depend on the entry
+price (a buy mask and a per-row indicator exit code) with numpy, then hand the
+raw arrays to ``run_backtest_njit``. Only the path-dependent part - entering,
+checking take profit / stop loss against the entry price, exiting - runs in
+the loop.
+
+Exit codes 1 and 2 are reserved for take profit and stop loss; indicator exit
+codes passed in ``exits`` must start at 3 (0 means hold).
+
+Callers use ``run_backtest``: the compiled kernel when Numba is installed,
+otherwise ``run_backtest_py``, which walks plain Python lists because
+indexing numpy arrays one scalar at a time is the slow part of an
+uncompiled loop.
+
+``sweep_backtests_njit`` runs a whole grid of combos over the same candles,
+one row of the ``buy``/``exits`` matrices per combo, in parallel.
+"""
+
+import numpy as np
+
+from utils._njit import NUMBA_AVAILABLE, njit, prange
+
+EXIT_NONE = 0
+EXIT_TAKE_PROFIT = 1
+EXIT_STOP_LOSS = 2
+
+
+@njit(
+    "Tuple((int64[:], int64[:], int8[:], int64))"
+    "(float64[:], boolean[:], boolean[:], int8[:], float64, float64, int64)",
+    cache=True,
+    nogil=True,
+)
+def run_backtest_njit(close, ready, buy, exits, take_profit, stop_loss, start):
+    """Walk the position state machine over ``close[start:]``.
+
+    Rows where ``ready`` is False are skipped. Returns ``(entries, exit_rows,
+    reasons, open_entry)``: the entry and exit row of every closed trade, its
+    exit code, and the entry row of a position still open at the end (-1 if
+    flat).
+    """
+    n = close.shape[0]
+    entries = np.empty(n, np.int64)
+    exit_rows = np.empty(n, np.int64)
+    reasons = np.empty(n, np.int8)
+    n_trades = 0
+    in_position = False
+    entry_price = 0.0
+
+    for i in range(start, n):
+        if not ready[i]:
+            continue
+
+        price = close[i]
+        if not in_position:
+            if buy[i]:
+                in_position = True
+                entry_price = price
+                entries[n_trades] = i
+        else:
+            pct_change = ((price - entry_price) / entry_price) * 100
+            if pct_change >= take_profit:
+                reason = EXIT_TAKE_PROFIT
+            elif pct_change <= stop_loss:
+                reason = EXIT_STOP_LOSS
+            else:
+                reason = exits[i]
+
+            if reason != EXIT_NONE:
+                exit_rows[n_trades] = i
+                reasons[n_trades] = reason
+                n_trades += 1
+                in_position = False
+
+    open_entry = entries[n_trades] if in_position else -1
+    return entries[:n_trades], exit_rows[:n_trades], reasons[:n_trades], open_entry
+
+
+def run_backtest_py(close, ready, buy, exits, take_profit, stop_loss, start):
+    """Pure-Python ``run_backtest_njit`` over list copies of the arrays."""
+    entries = []
+    exit_rows = []
+    reasons = []
+    in_position = False
+    entry_price = 0.0
+
+    rows = zip(
+        close[start:].tolist(),
+        ready[start:].tolist(),
+        buy[start:].tolist(),
+        exits[start:].tolist(),
+    )
+    for i, (price, is_ready, is_buy, exit_code) in enumerate(rows, start):
+        if not is_ready:
+            continue
+
+        if not in_position:
+            if is_buy:
+                in_position = True
+                entry_price = price
+                entries.append(i)
+        else:
+            pct_change = ((price - entry_price) / entry_price) * 100
+            if pct_change >= take_profit:
+                reason = EXIT_TAKE_PROFIT
+            elif pct_change <= stop_loss:
+                reason = EXIT_STOP_LOSS
+            else:
+                reason = exit_code
+
+            if reason != EXIT_NONE:
+                exit_rows.append(i)
+                reasons.append(reason)
+                in_position = False
+
+    open_entry = entries.pop() if in_position else -1
+    return (
+        np.array(entries, dtype=np.int64),
+        np.array(exit_rows, dtype=np.int64),
+        np.array(reasons, dtype=np.int8),
+        open_entry,
+    )
+
+
+run_backtest = run_backtest_njit if NUMBA_AVAILABLE else run_backtest_py
+
+
+@njit(
+    "Tuple((float64[:], int64[:], int64[:]))"
+    "(float64[:], boolean[:], boolean[:, :], int8[:, :], float64[:], float64[:],"
+    " int64, float64, boolean)",
+    parallel=True,
+    cache=True,
+    nogil=True,
+)
+def sweep_backtests_njit(
+    close, ready, buy, exits, take_profit, stop_loss, start, initial_balance, close_open
+):
+    """Backtest every combo (row of ``buy``/``exits``) over the same ``close``.
+
+    Each trade buys with the full balance and sells all of it. A position still
+    open at the end is marked to the last close; ``close_open`` also counts it
+    as a trade. Returns ``(final_balance, n_trades, wins)`` per combo.
+    """
+    n_combos = buy.shape[0]
+    last = close.shape[0] - 1
+    balances = np.empty(n_combos)
+    n_trades = np.zeros(n_combos, np.int64)
+    wins = np.zeros(n_combos, np.int64)
+
+    for c in prange(n_combos):
+        entries, exit_rows, _reasons, open_entry = run_backtest(
+            close, ready, buy[c], exits[c], take_profit[c], stop_loss[c], start
+        )
+        balance = initial_balance
+        trades = entries.shape[0]
+        won = 0
+        for k in range(trades):
+            entry_price = close[entries[k]]
+            exit_price = close[exit_rows[k]]
+            balance = balance / entry_price * exit_price
+            if exit_price > entry_price:
+                won += 1
+
+        if open_entry >= 0:
+            balance = balance / close[open_entry] * close[last]
+            if close_open:
+                trades += 1
+                if close[last] > close[open_entry]:
+                    won += 1
+
+        balances[c] = balance
+        n_trades[c] = trades
+        wins[c] = won
+
+    return balances, n_trades, wins
@@ -0,0 +1,213 @@
+"""
+Indicator-combo signals for the backtest scripts.
+
+Each script sweeps every pair of an indicator config (which of RSI, Bollinger
+bands, EMA 9/20 and MACD to use) and a strategy (grid, mean reversion,
+momentum) over the same candles. ``signal_conditions`` evaluates every
+boolean condition those combos draw from once per frame; ``signal_plan``
+picks a combo's buy and exit conditions; ``buy_signal_mask`` and
+``exit_reason_codes`` turn them into the arrays the backtest kernels in
+``utils.backtest_njit`` walk, and ``sweep_combos`` runs every combo through
+them at once.
+
+Indicator exit codes are 3 (RSI overbought), 4 (upper band), 5 (EMA bearish
+crossover) and 6 (MACD bearish), in priority order; 1 and 2 are left to the
+kernels' take profit and stop loss.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from utils.backtest_njit import sweep_backtests_njit
+
+# Integer strategy ids and indicator bit flags, so signal selection branches
+# on ints instead of comparing strategy names and reading config dicts
+GRID, MEAN_REVERSION, MOMENTUM = range(3)
+STRATEGY_IDS = {"grid": GRID, "mean_reversion": MEAN_REVERSION, "momentum": MOMENTUM}
+USE_RSI, USE_BB, USE_EMA, USE_MACD = 1, 2, 4, 8
+
+# Columns the signal checks read
+INDICATOR_COLUMNS = (
+    "close",
+    "rsi",
+    "bb_upper",
+    "bb_lower",
+    "ema_9",
+    "ema_20",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+)
+
+# RSI entry condition by strategy
+RSI_BUY = {
+    GRID: "rsi_lt35",
+    MEAN_REVERSION: "rsi_lt30",
+    MOMENTUM: "rsi_30_50",
+}
+
+
+def config_flags(config: dict) -> int:
+    """Pack a config's ``use_*`` toggles into a ``USE_*`` bitmask."""
+    return (
+        USE_RSI * config["use_rsi"]
+        | USE_BB * config["use_bb"]
+        | USE_EMA * config["use_ema"]
+        | USE_MACD * config["use_macd"]
+    )
+
+
+def signal_conditions(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Every boolean condition the strategies combine, computed once per frame.
+
+    Each indicator config / strategy pair picks its buy and exit conditions
+    from this dict, so a comparison runs once per frame instead of once per
+    combo.
+    """
+    # The kernel writes float64 columns, so these are views, not copies. A
+    # float32 cast would copy every column and can flip close-vs-band ties.
+    cols = {name: df[name].to_numpy(dtype=np.float64, copy=False) for name in INDICATOR_COLUMNS}
+    close = cols["close"]
+    rsi = cols["rsi"]
+    return {
+        "ready": ~(np.isnan(rsi) | np.isnan(cols["bb_lower"])),
+        "rsi_lt35": rsi < 35,  # Oversold
+        "rsi_lt30": rsi < 30,  # More oversold
+        "rsi_30_50": (rsi > 30) & (rsi < 50),  # Rising from oversold
+        "rsi_gt70": rsi > 70,  # Overbought
+        "close_le_bblo": close <= cols["bb_lower"],  # Price at lower band
+        "close_ge_bbup": close >= cols["bb_upper"],  # Price at upper band
+        "ema9_gt_ema20": cols["ema_9"] > cols["ema_20"],  # Bullish crossover
+        "ema9_lt_ema20": cols["ema_9"] < cols["ema_20"],  # Bearish crossover
+        "close_lt_ema20": close < cols["ema_20"],  # Below EMA (mean reversion)
+        "macd_bull": cols["macd"] > cols["macd_signal"],  # MACD bullish
+        "macd_bear": cols["macd"] < cols["macd_signal"],  # MACD bearish
+        "hist_neg": cols["macd_hist"] < 0,  # Negative histogram (oversold)
+    }
+
+
+@lru_cache(maxsize=None)
+def signal_plan(flags: int, sid: int) -> tuple[tuple, tuple, tuple]:
+    """Buy condition names, exit condition names and exit codes for a combo.
+
+    The branch ladder depends only on the config flags and strategy, so it
+    runs once per combo and every later backtest reuses the result.
+    """
+    momentum = sid == MOMENTUM
+    buy = []
+    exit_names = []
+    exit_codes = []
+
+    if flags & USE_RSI:
+        if sid in RSI_BUY:
+            buy.append(RSI_BUY[sid])
+        exit_names.append("rsi_gt70")
+        exit_codes.append(3)
+    if flags & USE_BB:
+        buy.append("close_le_bblo")
+        exit_names.append("close_ge_bbup")
+        exit_codes.append(4)
+    if flags & USE_EMA:
+        buy.append("ema9_gt_ema20" if momentum else "close_lt_ema20")
+        if momentum:
+            exit_names.append("ema9_lt_ema20")
+            exit_codes.append(5)
+    if flags & USE_MACD:
+        buy.append("macd_bull" if momentum else "hist_neg")
+        if momentum:
+            exit_names.append("macd_bear")
+            exit_codes.append(6)
+
+    return tuple(buy), tuple(exit_names), tuple(exit_codes)
+
+
+def buy_signal_mask(conds: dict, flags: int, sid: int) -> np.ndarray:
+    """Rows where buy conditions are met for config ``flags`` and strategy ``sid``."""
+    names = signal_plan(flags, sid)[0]
+
+    # Need at least one signal to trigger
+    if not names:
+        return np.zeros(len(conds["ready"]), dtype=bool)
+
+    # For grid/mean_reversion: ALL signals must be true (more conservative)
+    # For momentum: ANY signal can trigger (more aggressive)
+    signals = [conds[name] for name in names]
+    if sid == MOMENTUM:
+        return np.logical_or.reduce(signals)
+    else:
+        return np.logical_and.reduce(signals)
+
+
+def exit_reason_codes(conds: dict, flags: int, sid: int) -> np.ndarray:
+    """Per-row indicator exit code, 0 = hold.
+
+    Take profit and stop loss depend on the entry price, so the backtest
+    kernel checks those itself before falling back to these codes.
+    """
+    _buy, names, codes = signal_plan(flags, sid)
+    if not names:
+        return np.zeros(len(conds["ready"]), dtype=np.int8)
+    conditions = [conds[name] for name in names]
+    return np.select(conditions, codes, default=0).astype(np.int8)
+
+
+def sweep_combos(
+    df: pd.DataFrame,
+    conds: dict,
+    combos: list,
+    exit_levels: dict,
+    *,
+    default_exit_levels: tuple[float, float],
+    warmup_rows: int,
+    initial_balance: float,
+    close_open: bool,
+) -> list[dict]:
+    """Summary results for every ``(config, strategy)`` in ``combos`` from one parallel kernel call.
+
+    ``exit_levels`` maps a strategy to its take profit and stop loss percent,
+    falling back to ``default_exit_levels``. Trading starts after
+    ``warmup_rows`` and once every indicator is ready. A position still open
+    at the end is marked to the last close, and counted as a trade when
+    ``close_open`` is set. Same numbers as backtesting each combo on its own,
+    without the trade log.
+    """
+    close = df["close"].to_numpy(dtype=np.float64)
+    ready = conds["ready"]
+    plans = [
+        (config_flags(config), STRATEGY_IDS.get(strategy, -1))
+        for config, strategy in combos
+    ]
+    buy = np.stack([buy_signal_mask(conds, flags, sid) for flags, sid in plans])
+    exits = np.stack([exit_reason_codes(conds, flags, sid) for flags, sid in plans])
+    levels = np.array(
+        [exit_levels.get(strategy, default_exit_levels) for _, strategy in combos]
+    )
+    start = max(warmup_rows, int(np.argmax(ready)))
+
+    balances, n_trades, wins = sweep_backtests_njit(
+        close,
+        ready,
+        buy,
+        exits,
+        np.ascontiguousarray(levels[:, 0]),
+        np.ascontiguousarray(levels[:, 1]),
+        start,
+        initial_balance,
+        close_open,
+    )
+
+    results = []
+    totals = zip(balances.tolist(), n_trades.tolist(), wins.tolist())
+    for balance, num_trades, won in totals:
+        results.append(
+            {
+                "total_return": ((balance - initial_balance) / initial_balance) * 100,
+                "num_trades": num_trades,
+                "wins": won,
+                "losses": num_trades - won,
+                "win_rate": (won / num_trades * 100) if num_trades else 0,
+            }
+        )
+    return results
@@ -0,0 +1,348 @@
+"""
+Single-pass indicator kernels.
+
+Each kernel takes a contiguous float64 ``close`` array and returns numpy arrays
+of the same length, with NaN during the warmup period. Results match the
+pandas formulations used by the scanners (rolling-mean RSI, ``adjust=False``
+EMA, sample-std Bollinger Bands) so existing thresholds keep their meaning;
+``rsi_wilder_njit`` is the standard Wilder-smoothed RSI.
+
+``rolling_mean``, ``rolling_std`` and ``rsi_vectorized`` are whole-array
+helpers. The rolling windows use bottleneck's C moving-window functions when
+it is installed; otherwise the mean uses the ``sma_njit`` running-sum kernel
+(or a numpy cumsum without Numba) and the std plain numpy.
+
+Kernels carry explicit signatures, so Numba compiles them (or loads them from
+its on-disk cache) when this module is imported rather than on the first scan.
+They release the GIL, so callers can run them for several symbols at once on
+a thread pool.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils._njit import FASTMATH, NUMBA_AVAILABLE, njit
+
+try:
+    import bottleneck as bn
+
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+_JIT_OPTIONS = {"cache": True, "nogil": True, "fastmath": FASTMATH}
+_BANDS = "UniTuple(float64[:], 3)"
+
+
+@njit("float64[:](float64[:], int64)", **_JIT_OPTIONS)
+def rsi_njit(close, period):
+    """RSI over a simple moving average of gains/losses, kept as running sums."""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    sum_gain = 0.0
+    sum_loss = 0.0
+
+    for i in range(n):
+        delta = close[i] - close[i - 1] if i > 0 else 0.0
+        if delta > 0:
+            sum_gain += delta
+        else:
+            sum_loss -= delta
+
+        # Drop the delta that just left the window
+        j = i - period
+        if j >= 0:
+            dropped = close[j] - close[j - 1] if j > 0 else 0.0
+            if dropped > 0:
+                sum_gain -= dropped
+            else:
+                sum_loss += dropped
+            # Running sums can drift a hair below zero after subtraction
+            sum_gain = max(sum_gain, 0.0)
+            sum_loss = max(sum_loss, 0.0)
+
+        if i >= period - 1:
+            total = sum_gain + sum_loss
+            if total > 0:
+                out[i] = 100.0 * sum_gain / total
+
+    return out
+
+
+@njit("float64[:](float64[:], int64)", **_JIT_OPTIONS)
+def rsi_wilder_njit(close, period):
+    """Wilder RSI: SMA-seeded averages, then ``avg += (x - avg) / period``."""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if i <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+            if i < period:
+                continue
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        total = avg_gain + avg_loss
+        if total > 0:
+            out[i] = 100.0 * avg_gain / total
+
+    return out
+
+
+@njit("float64[:](float64[:], int64)", **_JIT_OPTIONS)
+def ema_njit(close, period):
+    """EMA with ``adjust=False`` semantics: ``ema[i] = a*x[i] + (1-a)*ema[i-1]``."""
+    n = close.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    alpha = 2.0 / (period + 1)
+    out[0] = close[0]
+    for i in range(1, n):
+        out[i] = alpha * close[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+
+@njit(_BANDS + "(float64[:], int64, float64)", **_JIT_OPTIONS)
+def bb_njit(close, period, std_dev):
+    """Bollinger Bands using a sliding Welford update for the sample std."""
+    n = close.shape[0]
+    upper = np.full(n, np.nan)
+    mid = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    if n < period or period < 2:
+        return upper, mid, lower
+
+    # Seed the first window
+    mean = 0.0
+    m2 = 0.0
+    for i in range(period):
+        d = close[i] - mean
+        mean += d / (i + 1)
+        m2 += d * (close[i] - mean)
+
+    for i in range(period - 1, n):
+        if i >= period:
+            old = close[i - period]
+            new = close[i]
+            new_mean = mean + (new - old) / period
+            m2 += (new - old) * (new - new_mean + old - mean)
+            mean = new_mean
+
+        std = np.sqrt(max(m2 / (period - 1), 0.0))
+        mid[i] = mean
+        upper[i] = mean + std_dev * std
+        lower[i] = mean - std_dev * std
+
+    return upper, mid, lower
+
+
+@njit(_BANDS + "(float64[:], int64, int64, int64)", **_JIT_OPTIONS)
+def macd_njit(close, fast, slow, signal):
+    """MACD line, signal line and histogram from one pass over ``close``."""
+    n = close.shape[0]
+    macd = np.empty(n)
+    sig = np.empty(n)
+    hist = np.empty(n)
+    if n == 0:
+        return macd, sig, hist
+
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_sig = 2.0 / (signal + 1)
+
+    ema_fast = close[0]
+    ema_slow = close[0]
+    macd[0] = 0.0
+    sig[0] = 0.0
+    hist[0] = 0.0
+    for i in range(1, n):
+        ema_fast = alpha_fast * close[i] + (1.0 - alpha_fast) * ema_fast
+        ema_slow = alpha_slow * close[i] + (1.0 - alpha_slow) * ema_slow
+        macd[i] = ema_fast - ema_slow
+        sig[i] = alpha_sig * macd[i] + (1.0 - alpha_sig) * sig[i - 1]
+        hist[i] = macd[i] - sig[i]
+
+    return macd, sig, hist
+
+
+@njit("float64[:](float64[:], int64)", **_JIT_OPTIONS)
+def sma_njit(values, window):
+    """Trailing SMA via the running-sum recurrence ``s += x[i] - x[i - w]``."""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    for i in range(n):
+        total += values[i]
+        if i >= window:
+            total -= values[i - window]
+        if i >= window - 1:
+            out[i] = total / window
+    return out
+
+
+@njit(
+    "UniTuple(float64[:], 11)(float64[:], int64, int64, float64, boolean)",
+    **_JIT_OPTIONS,
+)
+def indicator_suite_njit(close, rsi_period, bb_period, bb_mult, wilder):
+    """RSI, Bollinger Bands, EMA 9/20/50 and MACD(12, 26, 9) in one pass.
+
+    Every indicator keeps its running state (RSI gain/loss sums, the sliding
+    Welford mean/M2, one scalar per EMA) in registers while ``close`` is read
+    once, instead of one sweep per indicator. Values match ``rsi_njit`` (or
+    ``rsi_wilder_njit`` when ``wilder`` is set), ``bb_njit``, ``ema_njit`` and
+    ``macd_njit``.
+
+    Returns ``(rsi, bb_mid, bb_std, bb_upper, bb_lower, ema_9, ema_20, ema_50,
+    macd, macd_signal, macd_hist)``.
+    """
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+    bb_mid = np.full(n, np.nan)
+    bb_std = np.full(n, np.nan)
+    bb_upper = np.full(n, np.nan)
+    bb_lower = np.full(n, np.nan)
+    ema_9 = np.empty(n)
+    ema_20 = np.empty(n)
+    ema_50 = np.empty(n)
+    macd = np.empty(n)
+    macd_signal = np.empty(n)
+    macd_hist = np.empty(n)
+    if n == 0:
+        return (
+            rsi, bb_mid, bb_std, bb_upper, bb_lower,
+            ema_9, ema_20, ema_50, macd, macd_signal, macd_hist,
+        )  # fmt: skip
+
+    a9, a12, a20 = 2.0 / 10, 2.0 / 13, 2.0 / 21
+    a26, a50 = 2.0 / 27, 2.0 / 51
+    sum_gain = 0.0
+    sum_loss = 0.0
+    mean = 0.0
+    m2 = 0.0
+    e9 = e12 = e20 = e26 = e50 = close[0]
+    sig = 0.0
+
+    for i in range(n):
+        x = close[i]
+
+        delta = x - close[i - 1] if i > 0 else 0.0
+        if wilder:
+            # RSI: Wilder averages, SMA-seeded (sum_* hold the averages)
+            if i > 0:
+                gain = delta if delta > 0 else 0.0
+                loss = -delta if delta < 0 else 0.0
+                if i <= rsi_period:
+                    sum_gain += gain / rsi_period
+                    sum_loss += loss / rsi_period
+                else:
+                    sum_gain = (sum_gain * (rsi_period - 1) + gain) / rsi_period
+                    sum_loss = (sum_loss * (rsi_period - 1) + loss) / rsi_period
+                if i >= rsi_period:
+                    total = sum_gain + sum_loss
+                    if total > 0:
+                        rsi[i] = 100.0 * sum_gain / total
+        else:
+            # RSI: rolling sums of gains and losses
+            if delta > 0:
+                sum_gain += delta
+            else:
+                sum_loss -= delta
+            j = i - rsi_period
+            if j >= 0:
+                dropped = close[j] - close[j - 1] if j > 0 else 0.0
+                if dropped > 0:
+                    sum_gain -= dropped
+                else:
+                    sum_loss += dropped
+                sum_gain = max(sum_gain, 0.0)
+                sum_loss = max(sum_loss, 0.0)
+            if i >= rsi_period - 1:
+                total = sum_gain + sum_loss
+                if total > 0:
+                    rsi[i] = 100.0 * sum_gain / total
+
+        # Bollinger Bands: Welford while filling the window, then sliding
+        if i < bb_period:
+            d = x - mean
+            mean += d / (i + 1)
+            m2 += d * (x - mean)
+        else:
+            # SMA recurrence for the mean; M2 slides using both means
+            old = close[i - bb_period]
+            new_mean = mean + (x - old) / bb_period
+            m2 += (x - old) * (x - new_mean + old - mean)
+            mean = new_mean
+        if i >= bb_period - 1:
+            std = np.sqrt(max(m2 / (bb_period - 1), 0.0))
+            bb_mid[i] = mean
+            bb_std[i] = std
+            bb_upper[i] = mean + bb_mult * std
+            bb_lower[i] = mean - bb_mult * std
+
+        # EMAs and MACD (adjust=False recurrences)
+        if i > 0:
+            e9 = a9 * x + (1.0 - a9) * e9
+            e12 = a12 * x + (1.0 - a12) * e12
+            e20 = a20 * x + (1.0 - a20) * e20
+            e26 = a26 * x + (1.0 - a26) * e26
+            e50 = a50 * x + (1.0 - a50) * e50
+        line = e12 - e26
+        if i > 0:
+            sig = a9 * line + (1.0 - a9) * sig
+        ema_9[i] = e9
+        ema_20[i] = e20
+        ema_50[i] = e50
+        macd[i] = line
+        macd_signal[i] = sig
+        macd_hist[i] = line - sig
+
+    return (
+        rsi, bb_mid, bb_std, bb_upper, bb_lower,
+        ema_9, ema_20, ema_50, macd, macd_signal, macd_hist,
+    )  # fmt: skip
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling mean in O(N); NaN until the window fills."""
+    if BOTTLENECK_AVAILABLE:
+        return bn.move_mean(values, window, min_count=window)
+    if NUMBA_AVAILABLE:
+        return sma_njit(values, window)
+
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        cs = np.cumsum(np.concatenate(([0.0], values)))
+        out[window - 1 :] = (cs[window:] - cs[:-window]) / window
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling sample standard deviation (ddof=1, like pandas)."""
+    if BOTTLENECK_AVAILABLE:
+        return bn.move_std(values, window, min_count=window, ddof=1)
+
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        out[window - 1 :] = sliding_window_view(values, window).std(axis=1, ddof=1)
+    return out
+
+
+def rsi_vectorized(close: np.ndarray, period: int) -> np.ndarray:
+    """Numpy twin of ``rsi_njit`` (same rolling-mean definition)."""
+    delta = np.diff(close, prepend=close[:1])
+    avg_gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    avg_loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    total = avg_gain + avg_loss
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, 100.0 * avg_gain / total, np.nan)
@@ -0,0 +1,76 @@
+"""
+On-disk cache for fetched OHLCV candles.
+
+Each ``(exchange, symbol, timeframe)`` series is stored as one file under
+``data/cache/``. Parquet is used when pyarrow is installed; otherwise the
+frame is pickled, which needs nothing beyond pandas and reads just as fast.
+Callers load the cached frame, fetch only candles newer than its last
+timestamp, and write the merged result back with ``merge_candles`` /
+``save_cached``.
+"""
+
+from pathlib import Path
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache"
+
+
+def cache_path(exchange_id: str, symbol: str, timeframe: str, cache_dir: Path = CACHE_DIR) -> Path:
+    """Cache file for one series, e.g. ``kraken_BTC-USD_1h.parquet``."""
+    suffix = ".parquet" if PARQUET_AVAILABLE else ".pkl"
+    name = f"{exchange_id}_{symbol.replace('/', '-')}_{timeframe}{suffix}"
+    return Path(cache_dir) / name
+
+
+def load_cached(path: Path) -> pd.DataFrame | None:
+    """Cached candles at ``path``, or None if there is no readable cache."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        if path.suffix == ".parquet":
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+    except Exception:
+        # A truncated or foreign file is just a cache miss
+        return None
+
+
+def save_cached(df: pd.DataFrame, path: Path) -> None:
+    """Write ``df`` to ``path``, creating the cache directory if needed."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".parquet":
+        df.to_parquet(path, compression="snappy", index=False)
+    else:
+        df.to_pickle(path)
+
+
+def is_fresh(path: Path, max_age: float) -> bool:
+    """True if ``path`` was written less than ``max_age`` seconds ago."""
+    path = Path(path)
+    return path.exists() and time.time() - path.stat().st_mtime < max_age
+
+
+def merge_candles(cached: pd.DataFrame | None, fresh: pd.DataFrame) -> pd.DataFrame:
+    """Append ``fresh`` candles to ``cached``, newest copy wins on duplicates."""
+    if cached is None or cached.empty:
+        merged = fresh
+    elif fresh.empty:
+        merged = cached
+    else:
+        merged = pd.concat([cached, fresh], ignore_index=True)
+    return (
+        merged.drop_duplicates(subset=["timestamp"], keep="last")
+        .sort_values("timestamp")
+        .reset_index(drop=True)
+    )
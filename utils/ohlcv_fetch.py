@@ -0,0 +1,139 @@
+"""
+Paged OHLCV downloads for the backtest scripts.
+
+``fetch_ohlcv`` tops up a series cached with ``utils.ohlcv_cache``: it asks
+the exchange only for candles newer than the cache and merges them in.
+Exchanges cap each OHLCV request at ``page_limit`` candles, so a long range
+takes several pages. ``fetch_pages`` requests them concurrently when the
+exchange serves pages as laid out, and ``fetch_pages_serial`` walks them one
+at a time, each page starting after the last candle of the one before.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import ccxt.async_support as ccxt
+import pandas as pd
+
+from utils.ohlcv_cache import is_fresh, load_cached, merge_candles, save_cached
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+async def fetch_pages(
+    exchange, symbol: str, timeframe: str, since: int, page_limit: int, page_concurrency: int
+) -> list:
+    """Candles from ``since`` to now, with up to ``page_concurrency`` pages in flight.
+
+    Page start times are laid out ``page_limit`` candles apart, which only
+    holds while each page ends right before the next one starts. The first
+    page is fetched alone to check that, and only then are the rest requested
+    concurrently. From the first page that stops short of the next start, or
+    runs past it (Kraken answers with its newest 720 candles whatever
+    ``since`` is), the series is walked with ``fetch_pages_serial`` instead,
+    which follows the last candle returned, so no stretch is left unfetched.
+    """
+    period = exchange.parse_timeframe(timeframe) * 1000
+    starts = list(range(since, exchange.milliseconds(), period * page_limit))
+    if not starts:
+        return []
+    sem = asyncio.Semaphore(page_concurrency)
+
+    async def page(start):
+        async with sem:
+            return await exchange.fetch_ohlcv(symbol, timeframe, since=start, limit=page_limit)
+
+    def laid_out(data, next_start):
+        return bool(data) and next_start - period <= data[-1][0] < next_start
+
+    pages = [await page(starts[0])]
+    if len(starts) > 1 and laid_out(pages[0], starts[1]):
+        tasks = [asyncio.ensure_future(page(start)) for start in starts[1:]]
+        try:
+            pages += await asyncio.gather(*tasks)
+        except Exception:
+            # Don't leave the remaining pages eating into the rate limit
+            for task in tasks:
+                task.cancel()
+            raise
+
+    all_data = []
+    for i, data in enumerate(pages):
+        next_start = starts[i + 1] if i + 1 < len(starts) else None
+        if next_start is not None and not laid_out(data, next_start):
+            resume = data[-1][0] + 1 if data else starts[i]
+            all_data.extend(data)
+            all_data.extend(await fetch_pages_serial(exchange, symbol, timeframe, resume, page_limit))
+            break
+        all_data.extend(data)
+    return all_data
+
+
+async def fetch_pages_serial(exchange, symbol: str, timeframe: str, since: int, page_limit: int) -> list:
+    """Candles from ``since`` to now, one page at a time."""
+    all_data = []
+    while True:
+        try:
+            data = await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=page_limit)
+            # Stop once nothing newer than ``since`` comes back, so an
+            # exchange that ignores ``since`` can't keep the loop going
+            if not data or data[-1][0] < since:
+                break
+            all_data.extend(data)
+            since = data[-1][0] + 1  # Next millisecond after last candle
+            if len(data) < page_limit:
+                break
+        except Exception as e:
+            print(f"Error fetching {symbol} {timeframe}: {e}")
+            break
+    return all_data
+
+
+async def fetch_ohlcv(
+    exchange,
+    symbol: str,
+    timeframe: str,
+    days: int,
+    cache_file=None,
+    *,
+    page_limit: int,
+    page_concurrency: int = 3,
+) -> pd.DataFrame:
+    """Fetch ``days`` of OHLCV data, topping up the cache at ``cache_file``.
+
+    A cache written within the last candle period is used as-is; otherwise
+    only candles newer than its last timestamp are requested. ``page_limit``
+    must be the exchange's real per-request cap: a shorter page is taken to
+    mean the series has run out.
+    """
+    start = datetime.utcnow() - timedelta(days=days)
+    since = exchange.parse8601(start.isoformat())
+
+    cached = load_cached(cache_file) if cache_file else None
+    if cached is not None and not cached.empty:
+        if is_fresh(cache_file, exchange.parse_timeframe(timeframe)):
+            return cached[cached["timestamp"] >= start].reset_index(drop=True)
+        last = int(cached["timestamp"].iloc[-1].timestamp() * 1000)
+        since = max(since, last + 1)
+
+    try:
+        all_data = await fetch_pages(exchange, symbol, timeframe, since, page_limit, page_concurrency)
+    except (ccxt.RateLimitExceeded, ccxt.DDoSProtection):
+        # Rate limited (HTTP 429): walk the pages one at a time instead
+        all_data = await fetch_pages_serial(exchange, symbol, timeframe, since, page_limit)
+    except Exception as e:
+        print(f"Error fetching {symbol} {timeframe}: {e}")
+        all_data = []
+
+    if all_data:
+        fresh = pd.DataFrame(all_data, columns=OHLCV_COLUMNS)
+        fresh["timestamp"] = pd.to_datetime(fresh["timestamp"], unit="ms")
+        df = merge_candles(cached, fresh)
+        if cache_file:
+            save_cached(df, cache_file)
+    elif cached is not None:
+        df = cached
+    else:
+        return pd.DataFrame()
+
+    return df[df["timestamp"] >= start].reset_index(drop=True)
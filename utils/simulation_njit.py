@@ -0,0 +1,229 @@
+"""
+Compiled position loops for the strategy simulations in ``run_all_backtests``.
+
+``replay_grid_njit`` replays grid-level crossings that the caller has already
+found with numpy, one fill at a time, since whether a crossing fills depends
+on the orders and cash left by earlier fills; ``mark_to_market_njit`` then
+values the fills at every close and tracks the drawdown in the same pass.
+``run_filtered_grid_njit`` and ``run_bearish_njit`` walk the indicator-filtered
+grid and the bearish scalp strategy bar by bar over precomputed signal and
+indicator arrays.
+
+All of them keep the floating point operations of the original Python loops
+in the same order, so results are bit-for-bit the same with or without Numba.
+For the same reason they are compiled without fast-math: contraction and
+reassociation change the cash and P&L arithmetic, and each loop carries its
+balance from one step to the next, so there is nothing for LLVM to vectorize.
+Explicit signatures plus ``cache=True`` compile them once and load the machine
+code on later imports.
+"""
+
+import numpy as np
+
+from utils._njit import njit
+
+TRADE_BUY = 0
+TRADE_SELL = 1
+TRADE_STOP_LOSS = 2
+
+
+@njit(
+    "Tuple((int64[:], boolean[:], float64[:], float64[:]))"
+    "(float64[:], int64[:], boolean[:], int64[:], float64[:], int64[:], int64[:], float64, float64)",
+    cache=True,
+    nogil=True,
+)
+def replay_grid_njit(
+    close, bars, is_sell, levels, sell_levels, sell_after_buy, buy_after_sell, initial_balance, position_size
+):
+    """Apply grid crossing events in order and record every fill.
+
+    Event ``e`` is a crossing at row ``bars[e]`` of buy level ``levels[e]``
+    (or sell level, if ``is_sell[e]``). Buy levels start armed and sell levels
+    disarmed; a fill disarms its level and arms ``sell_after_buy`` /
+    ``buy_after_sell`` of it (-1 for none). Returns ``(fill_rows, fill_is_sell,
+    balance, crypto)``: the row and side of each fill and the cash and
+    holdings right after it.
+    """
+    n_events = bars.shape[0]
+    active_buys = np.ones(sell_after_buy.shape[0], np.bool_)
+    active_sells = np.zeros(buy_after_sell.shape[0], np.bool_)
+    fill_rows = np.empty(n_events, np.int64)
+    fill_is_sell = np.empty(n_events, np.bool_)
+    fill_balance = np.empty(n_events)
+    fill_crypto = np.empty(n_events)
+    n_fills = 0
+    balance = initial_balance
+    crypto_balance = 0.0
+
+    for e in range(n_events):
+        i = bars[e]
+        k = levels[e]
+        price = close[i]
+        if not is_sell[e]:
+            if not (active_buys[k] and balance >= position_size):
+                continue
+            balance -= position_size
+            crypto_balance += position_size / price
+            active_buys[k] = False
+            if sell_after_buy[k] >= 0:
+                active_sells[sell_after_buy[k]] = True
+        else:
+            if not (active_sells[k] and crypto_balance > 0):
+                continue
+            sell_amount = min(crypto_balance, position_size / sell_levels[k])
+            crypto_balance -= sell_amount
+            balance += sell_amount * price
+            active_sells[k] = False
+            if buy_after_sell[k] >= 0:
+                active_buys[buy_after_sell[k]] = True
+
+        fill_rows[n_fills] = i
+        fill_is_sell[n_fills] = is_sell[e]
+        fill_balance[n_fills] = balance
+        fill_crypto[n_fills] = crypto_balance
+        n_fills += 1
+
+    return fill_rows[:n_fills], fill_is_sell[:n_fills], fill_balance[:n_fills], fill_crypto[:n_fills]
+
+
+@njit(
+    "Tuple((float64[:], float64))(float64[:], int64[:], float64[:], float64[:], float64)",
+    cache=True,
+    nogil=True,
+)
+def mark_to_market_njit(close, fill_rows, fill_balance, fill_crypto, initial_balance):
+    """Portfolio value at each close given the fills, and its max drawdown in %.
+
+    ``history[0]`` is ``initial_balance``; ``history[i]`` values the cash and
+    holdings after the last fill at or before row ``i`` at ``close[i]``. The
+    peak and drawdown are updated as each value is written.
+    """
+    n = close.shape[0]
+    n_fills = fill_rows.shape[0]
+    history = np.empty(n)
+    history[0] = initial_balance
+    peak = initial_balance
+    max_drawdown = 0.0
+    balance = initial_balance
+    crypto_balance = 0.0
+    f = 0
+
+    for i in range(1, n):
+        while f < n_fills and fill_rows[f] <= i:
+            balance = fill_balance[f]
+            crypto_balance = fill_crypto[f]
+            f += 1
+
+        value = balance + crypto_balance * close[i]
+        history[i] = value
+        if value > peak:
+            peak = value
+        drawdown = (peak - value) / peak * 100
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+
+    return history, max_drawdown
+
+
+@njit(
+    "Tuple((int8[:], float64[:], float64, float64))(float64[:], boolean[:], boolean[:], int64, float64, float64)",
+    cache=True,
+    nogil=True,
+)
+def run_filtered_grid_njit(close, buy, sell, start, initial_balance, position_size):
+    """Buy ``position_size`` on ``buy`` rows while cash lasts, sell everything on ``sell`` rows.
+
+    A row that allows both only sells when there is no cash for a buy.
+    Returns ``(trade_kind, balance_history, balance, crypto)``; ``trade_kind``
+    holds ``TRADE_BUY`` / ``TRADE_SELL`` codes and ``balance_history`` starts
+    with ``initial_balance`` followed by the portfolio value at each bar from
+    ``start``.
+    """
+    n = close.shape[0]
+    trade_kind = np.empty(max(n - start, 0), np.int8)
+    history = np.empty(max(n - start, 0) + 1)
+    history[0] = initial_balance
+    n_trades = 0
+    balance = initial_balance
+    crypto_balance = 0.0
+
+    for i in range(start, n):
+        price = close[i]
+        if buy[i] and balance >= position_size:
+            crypto_amount = position_size / price
+            balance -= position_size
+            crypto_balance += crypto_amount
+            trade_kind[n_trades] = TRADE_BUY
+            n_trades += 1
+        elif sell[i] and crypto_balance > 0:
+            balance += crypto_balance * price
+            trade_kind[n_trades] = TRADE_SELL
+            n_trades += 1
+            crypto_balance = 0.0
+
+        history[i - start + 1] = balance + (crypto_balance * price)
+
+    return trade_kind[:n_trades], history, balance, crypto_balance
+
+
+@njit(
+    "Tuple((int8[:], float64[:], float64[:], float64, float64))"
+    "(float64[:], float64[:], float64[:], float64[:], int64, float64, float64, float64)",
+    cache=True,
+    nogil=True,
+)
+def run_bearish_njit(close, rsi, ema_fast, ema_slow, start, initial_balance, position_size, stop_loss_pct):
+    """Bearish scalp: buy RSI < 30 dips while ``ema_fast < ema_slow``.
+
+    A position is closed by the stop loss, or on the first bar with RSI > 50.
+    Returns ``(trade_kind, trade_pnl, balance_history, balance, crypto)``;
+    ``trade_kind`` holds ``TRADE_*`` codes and buys carry a pnl of 0.
+    ``balance_history`` starts with ``initial_balance`` followed by the
+    portfolio value at each bar from ``start``.
+    """
+    n = close.shape[0]
+    trade_kind = np.empty(2 * n, np.int8)
+    trade_pnl = np.empty(2 * n)
+    history = np.empty(max(n - start, 0) + 1)
+    history[0] = initial_balance
+    n_trades = 0
+    balance = initial_balance
+    crypto_balance = 0.0
+    entry_price = 0.0  # 0 while flat
+
+    for i in range(start, n):
+        price = close[i]
+        r = rsi[i]
+
+        # Check stop loss
+        if entry_price != 0 and crypto_balance > 0 and price <= entry_price * (1 - stop_loss_pct):
+            sell_value = crypto_balance * price
+            balance += sell_value
+            trade_kind[n_trades] = TRADE_STOP_LOSS
+            trade_pnl[n_trades] = sell_value - (crypto_balance * entry_price)
+            n_trades += 1
+            crypto_balance = 0.0
+            entry_price = 0.0
+
+        # Buy on oversold in downtrend, sell on any bounce
+        if ema_fast[i] < ema_slow[i] and r < 30 and balance >= position_size and crypto_balance == 0:
+            balance -= position_size
+            crypto_balance += position_size / price
+            entry_price = price
+            trade_kind[n_trades] = TRADE_BUY
+            trade_pnl[n_trades] = 0.0
+            n_trades += 1
+        elif crypto_balance > 0 and r > 50:
+            sell_value = crypto_balance * price
+            pnl = sell_value - (crypto_balance * entry_price) if entry_price != 0 else 0.0
+            balance += sell_value
+            trade_kind[n_trades] = TRADE_SELL
+            trade_pnl[n_trades] = pnl
+            n_trades += 1
+            crypto_balance = 0.0
+            entry_price = 0.0
+
+        history[i - start + 1] = balance + (crypto_balance * price)
+
+    return trade_kind[:n_trades], trade_pnl[:n_trades], history, balance, crypto_balance